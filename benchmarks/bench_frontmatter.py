@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Frontmatter benchmark - restricted reader vs PyYAML in quick_validate
+
+Compares the two frontmatter paths of quick_validate.py across every
+SKILL.md in the repository:
+
+- startup: wall time of a fresh interpreter validating the whole tree,
+  once with the restricted reader and once forced through PyYAML
+- throughput: frontmatter documents parsed per second in-process, for
+  the restricted reader (reads up to the closing '---') and for the
+  original read_text() + regex + yaml.safe_load() path
+
+Usage:
+    python benchmarks/bench_frontmatter.py [--root skills] [--runs 10] [--iterations 200] [--json]
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / "skills" / "utils" / "skill-creation-guide" / "scripts"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+import quick_validate  # noqa: E402
+
+STARTUP_FAST = """
+import sys
+sys.path.insert(0, {scripts!r})
+import quick_validate
+report = quick_validate.validate_all({root!r})
+assert 'yaml' not in sys.modules, 'fast path imported PyYAML'
+"""
+
+STARTUP_YAML = """
+import sys
+sys.path.insert(0, {scripts!r})
+import quick_validate
+quick_validate.parse_frontmatter_fast = lambda text: None
+report = quick_validate.validate_all({root!r})
+"""
+
+
+def time_subprocess(code, runs):
+    """Return per-run wall times (seconds) of `python -c code`."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def parse_yaml_original(skill_md):
+    """The pre-restricted-reader path: whole file, DOTALL regex, PyYAML."""
+    import yaml
+    content = skill_md.read_text()
+    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
+    return yaml.safe_load(match.group(1))
+
+
+def parse_fast(skill_md):
+    return quick_validate.parse_frontmatter(quick_validate.read_frontmatter(skill_md))
+
+
+def time_throughput(func, files, iterations):
+    """Return documents parsed per second."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for skill_md in files:
+            func(skill_md)
+    elapsed = time.perf_counter() - start
+    return iterations * len(files) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quick_validate frontmatter parsing")
+    parser.add_argument("--root", default=str(REPO_ROOT / "skills"), help="Skills root to scan")
+    parser.add_argument("--runs", type=int, default=10, help="Interpreter launches per startup path")
+    parser.add_argument("--iterations", type=int, default=200, help="Passes over the tree for throughput")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    files = [skill / "SKILL.md" for skill in quick_validate.find_skills(args.root)]
+    if not files:
+        print(f"Error: No SKILL.md found under {args.root}", file=sys.stderr)
+        sys.exit(1)
+
+    # Both paths must agree before their speed means anything
+    fallbacks = []
+    for skill_md in files:
+        text = quick_validate.read_frontmatter(skill_md)
+        fast = quick_validate.parse_frontmatter_fast(text)
+        if fast is None:
+            fallbacks.append(str(skill_md))
+        elif fast != parse_yaml_original(skill_md):
+            print(f"Error: Restricted reader disagrees with PyYAML on {skill_md}", file=sys.stderr)
+            sys.exit(1)
+
+    fmt = {"scripts": str(SCRIPTS_DIR), "root": args.root}
+    startup_fast = time_subprocess(STARTUP_FAST.format(**fmt), args.runs)
+    startup_yaml = time_subprocess(STARTUP_YAML.format(**fmt), args.runs)
+
+    results = {
+        "skills": len(files),
+        "fallbacks": fallbacks,
+        "startup_ms": {
+            "fast": round(statistics.median(startup_fast) * 1000, 2),
+            "yaml": round(statistics.median(startup_yaml) * 1000, 2),
+        },
+        "throughput_docs_per_sec": {
+            "fast": round(time_throughput(parse_fast, files, args.iterations)),
+            "yaml": round(time_throughput(parse_yaml_original, files, args.iterations)),
+        },
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    startup = results["startup_ms"]
+    throughput = results["throughput_docs_per_sec"]
+    print(f"Skills: {len(files)} ({len(fallbacks)} needed the PyYAML fallback)")
+    print()
+    print(f"{'':24}{'restricted':>14}{'PyYAML':>14}{'speedup':>10}")
+    print(f"{'startup (median ms)':24}{startup['fast']:>14}{startup['yaml']:>14}"
+          f"{startup['yaml'] / startup['fast']:>9.2f}x")
+    print(f"{'throughput (docs/s)':24}{throughput['fast']:>14}{throughput['yaml']:>14}"
+          f"{throughput['fast'] / throughput['yaml']:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
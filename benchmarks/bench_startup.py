@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - cold import cost of the skill scripts
+
+Agents run these scripts hundreds of times per session, mostly for a
+single quick command, so the cost of importing them is paid on every
+call. For each script this launches fresh interpreters with
+`-X importtime` and reports the median cumulative import time of the
+script module, then checks it against a budget:
+
+- time: median import time must stay under the script's budget (ms)
+- deferred: modules only some commands need (requests, PyYAML, thread
+  pools, zipfile, ...) must not be imported at load
+
+Interpreters run with -S so site-packages hooks do not add noise, and
+with bytecode cached in a temporary directory, as a user's second run
+would have it. The exit status is 1 if any script is over budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 9] [--scale 1.0] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SKILLS = REPO_ROOT / "skills"
+
+# script, import budget (ms), modules that must not be imported at load
+SCRIPTS = [
+    (SKILLS / "utils" / "skill-creation-guide" / "scripts" / "quick_validate.py", 40,
+     ["yaml", "concurrent.futures"]),
+    (SKILLS / "utils" / "skill-creation-guide" / "scripts" / "package_skill.py", 45,
+     ["yaml", "concurrent.futures", "zipfile"]),
+    (SKILLS / "utils" / "skill-creation-guide" / "scripts" / "deep_validate.py", 50,
+     ["yaml", "concurrent.futures", "zipfile"]),
+    (SKILLS / "dev" / "feature-pipeline" / "scripts" / "task_manager.py", 70,
+     ["argparse", "ctypes", "select", "socket", "subprocess"]),
+    (SKILLS / "utils" / "tts-skill" / "assets" / "minimax_tts.py", 60,
+     ["requests", "concurrent.futures", "csv", "platform", "subprocess", "tempfile"]),
+]
+
+IMPORT_CODE = "import sys; sys.path.insert(0, {directory!r}); import {module}"
+
+
+def parse_importtime(stderr):
+    """Return {module: cumulative microseconds} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def bytecode_env(cache):
+    """Environment for interpreters that cache bytecode under cache."""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def measure(script, runs, env):
+    """Return (per-run import times in ms, modules imported at load)."""
+    code = IMPORT_CODE.format(directory=str(script.parent), module=script.stem)
+    cmd = [sys.executable, "-S", "-X", "importtime", "-c", code]
+    # Warm-up run writes the bytecode cache
+    warmup = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    if warmup.returncode != 0:
+        lines = warmup.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit status {warmup.returncode}")
+    times = []
+    modules = {}
+    for _ in range(runs):
+        result = subprocess.run(cmd, env=env, check=True, capture_output=True, text=True)
+        modules = parse_importtime(result.stderr)
+        times.append(modules[script.stem] / 1000)
+    return times, set(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold import time of the skill scripts")
+    parser.add_argument("--runs", type=int, default=9, help="Interpreter launches per script")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow machines)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as cache:
+        env = bytecode_env(cache)
+        for script, budget, deferred in SCRIPTS:
+            name = str(script.relative_to(REPO_ROOT))
+            try:
+                times, modules = measure(script, args.runs, env)
+            except RuntimeError as e:
+                results.append({"script": name, "error": str(e), "ok": False})
+                continue
+            median = statistics.median(times)
+            budget *= args.scale
+            eager = sorted(module for module in deferred if module in modules)
+            results.append({
+                "script": name,
+                "import_ms": round(median, 2),
+                "min_ms": round(min(times), 2),
+                "budget_ms": round(budget, 2),
+                "modules": len(modules),
+                "eager": eager,
+                "ok": median <= budget and not eager,
+            })
+
+    failed = [r for r in results if not r["ok"]]
+
+    if args.json:
+        print(json.dumps({"runs": args.runs, "scripts": results, "ok": not failed}, indent=2))
+    else:
+        print(f"{'script':20}{'median ms':>11}{'min ms':>9}{'budget':>9}{'modules':>9}")
+        for r in results:
+            if "error" in r:
+                print(f"{Path(r['script']).stem:20}  ❌ import failed: {r['error']}")
+                continue
+            mark = "✅" if r["ok"] else "❌"
+            print(f"{Path(r['script']).stem:20}{r['import_ms']:>11}{r['min_ms']:>9}"
+                  f"{r['budget_ms']:>9g}{r['modules']:>9}  {mark}")
+            for name in r["eager"]:
+                print(f"    imports {name} at load")
+        print()
+        print("All scripts within budget" if not failed else f"{len(failed)} script(s) over budget")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite - every skill script against synthetic workloads
+
+Runs each benchmark in a fresh interpreter on workloads from
+workloads.py and records, per benchmark:
+
+- wall_s: median wall time of the measured section (setup excluded)
+- ops_per_sec: work units per second (tasks, skills, MB, requests, ...)
+- peak_rss_mb: median peak RSS of the benchmark process or its children
+
+--save writes the results as a JSON baseline; --compare runs the same
+benchmarks and flags every one whose ops/sec dropped or whose peak RSS
+grew by more than the threshold against a baseline. Baselines are only
+comparable on the same machine and with the same --size.
+
+Benchmarks:
+    task_manager.parse        parse a large design doc
+    task_manager.schedule     next/done loop until every task is done
+    task_manager.affected     map changed files to affected tasks
+    task_manager.cli          `task_manager.py next` launches
+    quick_validate.all        validate a skill tree (--all)
+    deep_validate.tree        deep-validate a skill tree
+    package_skill.build       package skills with large assets from scratch
+    package_skill.incremental repackage after one file per skill changed
+    minimax_tts.batch         batch synthesis against a mock MiniMax API
+    minimax_tts.cached        text_to_audio served from the output manifest
+    qwen_image.many           agenerate_many against the Qwen-Image stub, with
+                              throttling, a failing prompt and a bad size
+    frontmatter.restricted    bench_frontmatter's restricted reader
+    frontmatter.yaml          bench_frontmatter's PyYAML path
+    startup                   bench_startup's cold imports of every script
+
+Usage:
+    python benchmarks/run_benchmarks.py [--only PATTERN] [--size quick|full] [--repeat 3]
+                                        [--save FILE] [--compare FILE] [--threshold 0.15] [--json]
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+TASK_MANAGER_DIR = REPO_ROOT / "skills" / "dev" / "feature-pipeline" / "scripts"
+SKILL_SCRIPTS_DIR = REPO_ROOT / "skills" / "utils" / "skill-creation-guide" / "scripts"
+TTS_DIR = REPO_ROOT / "skills" / "utils" / "tts-skill" / "assets"
+COVER_DIR = REPO_ROOT / "skills" / "utils" / "cover-image" / "scripts"
+
+BASELINE_VERSION = 1
+
+# Workload sizes: quick for a smoke run, full for numbers worth keeping
+SIZES = {
+    "quick": {
+        "parse_tasks": 500, "schedule_tasks": 80, "affected_tasks": 1000, "changed": 100,
+        "cli_tasks": 200, "cli_runs": 5, "validate_skills": 20, "package_skills": 3, "asset_mb": 2,
+        "tts_items": 40, "cached_items": 100, "qwen_jobs": 20, "frontmatter_iterations": 30, "startup_runs": 2,
+    },
+    "full": {
+        "parse_tasks": 4000, "schedule_tasks": 300, "affected_tasks": 4000, "changed": 500,
+        "cli_tasks": 1000, "cli_runs": 20, "validate_skills": 100, "package_skills": 8, "asset_mb": 8,
+        "tts_items": 200, "cached_items": 500, "qwen_jobs": 100, "frontmatter_iterations": 200, "startup_runs": 7,
+    },
+}
+
+MOCK_LATENCY = 0.02
+
+BENCHMARKS = {}
+
+
+class Skip(Exception):
+    """Raised by a benchmark that cannot run in this environment."""
+
+
+def benchmark(name, unit):
+    """Register a benchmark. The function does its setup and returns (run, ops)."""
+    def register(func):
+        BENCHMARKS[name] = (unit, func)
+        return func
+    return register
+
+
+def import_script(directory, module):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+    return __import__(module)
+
+
+# ============================================================
+# Benchmarks
+# ============================================================
+
+@benchmark("task_manager.parse", "tasks")
+def bench_parse(workdir, size):
+    import workloads
+    task_manager = import_script(TASK_MANAGER_DIR, "task_manager")
+    doc = workloads.design_doc(size["parse_tasks"])
+    passes = 5
+
+    def run():
+        for _ in range(passes):
+            task_manager.parse_tasks_from_markdown(doc)
+
+    return run, passes * size["parse_tasks"]
+
+
+@benchmark("task_manager.schedule", "tasks")
+def bench_schedule(workdir, size):
+    import workloads
+    task_manager = import_script(TASK_MANAGER_DIR, "task_manager")
+    doc = workloads.design_doc(size["schedule_tasks"])
+
+    def run():
+        content = doc
+        while True:
+            task = task_manager.get_next_task(task_manager.parse_tasks_from_markdown(content))
+            if task is None:
+                break
+            content = task_manager.update_task_status(content, task.title, "completed")
+        remaining = task_manager.get_status_summary(task_manager.parse_tasks_from_markdown(content))
+        assert remaining["completed"] == size["schedule_tasks"], remaining
+
+    return run, size["schedule_tasks"]
+
+
+@benchmark("task_manager.affected", "paths")
+def bench_affected(workdir, size):
+    import workloads
+    task_manager = import_script(TASK_MANAGER_DIR, "task_manager")
+    tasks = task_manager.parse_tasks_from_markdown(workloads.design_doc(size["affected_tasks"]))
+    changed = workloads.changed_files(size["changed"])
+    passes = 5
+
+    def run():
+        for _ in range(passes):
+            task_manager.find_affected(tasks, changed)
+
+    return run, passes * len(changed)
+
+
+@benchmark("task_manager.cli", "launches")
+def bench_cli(workdir, size):
+    import workloads
+    design = workdir / "design.md"
+    design.write_text(workloads.design_doc(size["cli_tasks"]))
+    cmd = [sys.executable, str(TASK_MANAGER_DIR / "task_manager.py"), "next", "--file", str(design), "--json"]
+
+    def run():
+        for _ in range(size["cli_runs"]):
+            subprocess.run(cmd, check=True, capture_output=True)
+
+    return run, size["cli_runs"]
+
+
+@benchmark("quick_validate.all", "skills")
+def bench_validate(workdir, size):
+    import workloads
+    quick_validate = import_script(SKILL_SCRIPTS_DIR, "quick_validate")
+    workloads.skill_tree(workdir, size["validate_skills"], asset_mb=0.1, large_assets=1)
+    passes = 3
+
+    def run():
+        for _ in range(passes):
+            report = quick_validate.validate_all(workdir)
+            assert report["invalid"] == 0, report
+
+    return run, passes * size["validate_skills"]
+
+
+@benchmark("deep_validate.tree", "skills")
+def bench_deep_validate(workdir, size):
+    import workloads
+    deep_validate = import_script(SKILL_SCRIPTS_DIR, "deep_validate")
+    workloads.skill_tree(workdir, size["validate_skills"], asset_mb=0.1, large_assets=1)
+
+    def run():
+        report = deep_validate.deep_validate(workdir)
+        assert report["invalid"] == 0, report
+
+    return run, size["validate_skills"]
+
+
+def _package_all(package_skill, skills, output_dir, force):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for skill in skills:
+            if package_skill.package_skill(skill, output_dir, force=force) is None:
+                raise RuntimeError(f"packaging failed: {skill}")
+
+
+@benchmark("package_skill.build", "MB")
+def bench_package(workdir, size):
+    import workloads
+    package_skill = import_script(SKILL_SCRIPTS_DIR, "package_skill")
+    skills = workloads.skill_tree(workdir / "skills", size["package_skills"], asset_mb=size["asset_mb"])
+    output_dir = workdir / "dist"
+    total = sum(f.stat().st_size for f in (workdir / "skills").rglob("*") if f.is_file())
+
+    def run():
+        _package_all(package_skill, skills, output_dir, force=True)
+
+    return run, total / (1024 * 1024)
+
+
+@benchmark("package_skill.incremental", "skills")
+def bench_package_incremental(workdir, size):
+    import workloads
+    package_skill = import_script(SKILL_SCRIPTS_DIR, "package_skill")
+    skills = workloads.skill_tree(workdir / "skills", size["package_skills"], asset_mb=size["asset_mb"])
+    output_dir = workdir / "dist"
+    _package_all(package_skill, skills, output_dir, force=True)
+    for skill in skills:
+        with open(skill / "references" / "topic-0.md", "a") as f:
+            f.write("\nOne more line.\n")
+
+    def run():
+        _package_all(package_skill, skills, output_dir, force=False)
+
+    return run, len(skills)
+
+
+def _mock_minimax(workdir):
+    """Start a mock API and point minimax_tts at it, with rate limits off."""
+    import workloads
+    mock = workloads.MockMiniMax(latency=MOCK_LATENCY).start()
+    os.environ.update({
+        "MINIMAX_API_KEY": "benchmark",
+        "MINIMAX_API_HOST": mock.url,
+        "MINIMAX_OUTPUT_DIR": str(workdir / "out"),
+        "MINIMAX_RATE_STATE": str(workdir / "ratelimit.json"),
+        "MINIMAX_RATE_RPS": "0",
+        "MINIMAX_RATE_CPM": "0",
+    })
+    try:
+        return import_script(TTS_DIR, "minimax_tts")
+    except ImportError as e:
+        raise Skip(str(e))
+
+
+@benchmark("minimax_tts.batch", "requests")
+def bench_tts_batch(workdir, size):
+    import workloads
+    minimax_tts = _mock_minimax(workdir)
+    script = workdir / "script.ndjson"
+    script.write_text(workloads.tts_script(size["tts_items"]))
+
+    def run():
+        summary = minimax_tts.batch_synthesize(str(script), str(workdir / "batch"), concurrency=4, progress=False)
+        assert summary["succeeded"] == size["tts_items"], summary
+
+    return run, size["tts_items"]
+
+
+@benchmark("minimax_tts.cached", "lookups")
+def bench_tts_cached(workdir, size):
+    import workloads
+    minimax_tts = _mock_minimax(workdir)
+    texts = [json.loads(line)["text"] for line in workloads.tts_script(size["cached_items"]).splitlines()]
+    for text in texts:
+        assert minimax_tts.text_to_audio(text)["success"]
+
+    def run():
+        for text in texts:
+            assert minimax_tts.text_to_audio(text)["cached"]
+
+    return run, len(texts)
+
+
+@benchmark("qwen_image.many", "images")
+def bench_qwen_many(workdir, size):
+    import asyncio
+    qwen_stub_server = import_script(COVER_DIR, "qwen_stub_server")
+    try:
+        qwen_image = import_script(COVER_DIR, "qwen_image")
+    except ImportError as e:
+        raise Skip(str(e))
+    server, url = qwen_stub_server.start_stub_server(delay=MOCK_LATENCY * 5, throttle_every=7, retry_after=0.1,
+                                                     fail_word="BLOCKED", http_date=True)
+    poll = qwen_image.PollPolicy(first_interval=MOCK_LATENCY, max_interval=MOCK_LATENCY * 4)
+    client = qwen_image.QwenImageClient(api_key="benchmark", api_host=url, poll=poll)
+    count = size["qwen_jobs"]
+    jobs = [{"prompt": f"cover {i}", "output_path": str(workdir / f"cover-{i}.png"), "size": "1024*1024"}
+            for i in range(count)]
+    jobs += [{"prompt": "BLOCKED cover", "output_path": str(workdir / "blocked.png")},
+             {"prompt": "odd cover", "output_path": str(workdir / "odd.png"), "size": "640*480"}]
+
+    def run():
+        results = asyncio.run(client.agenerate_many(jobs, max_concurrency=8))
+        assert all(r["success"] for r in results[:count]), results
+        assert results[count]["code"] == "DataInspectionFailed", results[count]
+        assert not results[count + 1]["success"] and "640*480" in results[count + 1]["error"], results[count + 1]
+        assert server.stats["throttled"], server.stats
+
+    return run, count
+
+
+def _frontmatter_bench(parse_name, size):
+    import bench_frontmatter
+    quick_validate = import_script(SKILL_SCRIPTS_DIR, "quick_validate")
+    parse = getattr(bench_frontmatter, parse_name)
+    files = [skill / "SKILL.md" for skill in quick_validate.find_skills(REPO_ROOT / "skills")]
+    iterations = size["frontmatter_iterations"]
+
+    def run():
+        for _ in range(iterations):
+            for skill_md in files:
+                parse(skill_md)
+
+    return run, iterations * len(files)
+
+
+@benchmark("frontmatter.restricted", "docs")
+def bench_frontmatter_fast(workdir, size):
+    return _frontmatter_bench("parse_fast", size)
+
+
+@benchmark("frontmatter.yaml", "docs")
+def bench_frontmatter_yaml(workdir, size):
+    try:
+        import yaml  # noqa: F401
+    except ImportError:
+        raise Skip("PyYAML not installed")
+    return _frontmatter_bench("parse_yaml_original", size)
+
+
+@benchmark("startup", "imports")
+def bench_startup(workdir, size):
+    import bench_startup
+    env = bench_startup.bytecode_env(str(workdir))
+    runs = size["startup_runs"]
+
+    def run():
+        for script, _, _ in bench_startup.SCRIPTS:
+            bench_startup.measure(script, runs, env)
+
+    return run, runs * len(bench_startup.SCRIPTS)
+
+
+# ============================================================
+# Running
+# ============================================================
+
+def peak_rss_mb():
+    """Peak RSS of this process or any of its waited-for children, in MB."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_child(name, size):
+    """Run one benchmark in this process and print its measurement as JSON."""
+    sys.path.insert(0, str(BENCH_DIR))
+    _, func = BENCHMARKS[name]
+    with tempfile.TemporaryDirectory(prefix="skill-bench-") as workdir:
+        try:
+            run, ops = func(Path(workdir), SIZES[size])
+        except Skip as e:
+            print(json.dumps({"skipped": str(e)}))
+            return
+        start = time.perf_counter()
+        run()
+        wall = time.perf_counter() - start
+    print(json.dumps({"wall_s": wall, "ops": ops, "peak_rss_mb": peak_rss_mb()}))
+
+
+def run_benchmark(name, size, repeat):
+    """Run a benchmark repeat times, each in a fresh interpreter."""
+    unit, _ = BENCHMARKS[name]
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--child", name, "--size", size]
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            return {"unit": unit, "error": lines[-1] if lines else f"exit status {result.returncode}"}
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        if "skipped" in sample:
+            return {"unit": unit, "skipped": sample["skipped"]}
+        samples.append(sample)
+
+    wall = statistics.median(s["wall_s"] for s in samples)
+    rss = [s["peak_rss_mb"] for s in samples if s["peak_rss_mb"] is not None]
+    ops = samples[0]["ops"]
+    return {
+        "unit": unit,
+        "ops": round(ops, 3),
+        "wall_s": round(wall, 4),
+        "ops_per_sec": round(ops / wall, 2) if wall > 0 else None,
+        "peak_rss_mb": round(statistics.median(rss), 1) if rss else None,
+        "runs": repeat,
+    }
+
+
+def compare(results, baseline, threshold, rss_threshold):
+    """
+    Compare results with a baseline.
+
+    Returns:
+        {name: {"ops_per_sec": change, "peak_rss_mb": change, "regressions": [...]}}
+        where change is the relative difference (+0.1 = 10% higher)
+    """
+    changes = {}
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if not base or "ops_per_sec" not in base or "ops_per_sec" not in result:
+            continue
+        entry = {"regressions": []}
+        if base["ops"] != result["ops"]:
+            entry["regressions"].append(f"workload changed ({base['ops']} -> {result['ops']} {result['unit']})")
+        for metric in ("ops_per_sec", "peak_rss_mb"):
+            if base.get(metric) and result.get(metric) is not None:
+                entry[metric] = result[metric] / base[metric] - 1
+        if entry.get("ops_per_sec", 0) < -threshold:
+            entry["regressions"].append(f"ops/sec {entry['ops_per_sec']:+.1%}")
+        if entry.get("peak_rss_mb", 0) > rss_threshold:
+            entry["regressions"].append(f"peak RSS {entry['peak_rss_mb']:+.1%}")
+        changes[name] = entry
+    return changes
+
+
+def print_report(results, changes):
+    print(f"{'benchmark':28}{'wall s':>9}{'ops/sec':>12}  {'unit':9}{'RSS MB':>8}{'vs baseline':>24}")
+    for name, r in results.items():
+        if "error" in r:
+            print(f"{name:28}  ❌ failed: {r['error']}")
+            continue
+        if "skipped" in r:
+            print(f"{name:28}  skipped: {r['skipped']}")
+            continue
+        rss = "-" if r["peak_rss_mb"] is None else r["peak_rss_mb"]
+        line = f"{name:28}{r['wall_s']:>9.3f}{r['ops_per_sec']:>12,.1f}  {r['unit']:9}{rss:>8}"
+        change = changes.get(name)
+        if change:
+            delta = f"{change.get('ops_per_sec', 0):+.1%} ops, {change.get('peak_rss_mb', 0):+.1%} RSS"
+            line += f"{delta:>24}  {'❌' if change['regressions'] else '✅'}"
+        print(line)
+        for regression in (change or {}).get("regressions", []):
+            print(f"    regression: {regression}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the skill scripts on synthetic workloads")
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="Run benchmarks matching this glob (repeatable), e.g. 'task_manager.*'")
+    parser.add_argument("--size", choices=sorted(SIZES), default="full", help="Workload size")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh-interpreter runs per benchmark")
+    parser.add_argument("--save", metavar="FILE", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Flag regressions against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed ops/sec drop before flagging (default: 0.15 = 15%%)")
+    parser.add_argument("--rss-threshold", type=float, default=0.2,
+                        help="Allowed peak RSS growth before flagging (default: 0.2 = 20%%)")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.size)
+        return
+
+    names = [name for name in BENCHMARKS
+             if not args.only or any(fnmatch.fnmatchcase(name, p) for p in args.only)]
+    if args.list:
+        for name in names:
+            print(f"{name:28}{BENCHMARKS[name][0]}")
+        return
+    if not names:
+        print(f"Error: No benchmark matches {args.only}", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = json.loads(Path(args.compare).read_text())
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline {args.compare}: {e}", file=sys.stderr)
+            sys.exit(1)
+        if baseline.get("size") != args.size:
+            print(f"Warning: baseline was recorded with --size {baseline.get('size')}, "
+                  f"this run uses --size {args.size}", file=sys.stderr)
+
+    results = {}
+    for name in names:
+        if not args.json:
+            print(f"  running {name}...", file=sys.stderr)
+        results[name] = run_benchmark(name, args.size, args.repeat)
+
+    report = {
+        "version": BASELINE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "size": args.size,
+        "results": results,
+    }
+    changes = compare(results, baseline, args.threshold, args.rss_threshold) if baseline else {}
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.json:
+        print(json.dumps({**report, "comparison": changes}, indent=2))
+    else:
+        print_report(results, changes)
+        if args.save:
+            print(f"\nBaseline written to {args.save}")
+
+    failed = [name for name, r in results.items() if "error" in r]
+    regressed = [name for name, change in changes.items() if change["regressions"]]
+    if baseline and not args.json:
+        print(f"\n{len(regressed)} regression(s) against {args.compare}" if regressed
+              else f"\nNo regressions against {args.compare}")
+    sys.exit(1 if failed or regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Synthetic workloads for the skill script benchmarks
+
+Generators are seeded, so the same arguments always produce the same
+workload and results from different runs can be compared:
+
+- design_doc: a feature-pipeline design doc with N tasks, dependencies
+  on earlier tasks, files (paths, directories and globs) and criteria
+- skill_tree: a tree of valid skills with references, scripts and
+  large incompressible assets, for package_skill / quick_validate
+- tts_script: an NDJSON script for `minimax_tts.py batch`
+- MockMiniMax: a local stand-in for the MiniMax API with fixed latency
+
+Usage:
+    python benchmarks/workloads.py design-doc [--tasks 200] [--dep-density 0.3] [--criteria 3] > design.md
+    python benchmarks/workloads.py skill-tree <dir> [--skills 20] [--asset-mb 4]
+    python benchmarks/workloads.py tts-script [--items 100] > script.ndjson
+    python benchmarks/workloads.py mock-server [--port 8765] [--latency 0.05]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PHASES = ["model", "api", "ui", "test", "docs"]
+WORDS = ("user account session token order cart payment invoice report export "
+         "search filter upload avatar profile setting audit webhook queue cache").split()
+
+# Tasks only depend on the DEP_WINDOW tasks before them, so dependency
+# lines stay bounded however large the doc gets
+DEP_WINDOW = 10
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _title(rng, i):
+    return f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}"
+
+
+def design_doc(tasks=200, dep_density=0.3, criteria=3, files=2, seed=0):
+    """
+    Generate a design doc for task_manager.py.
+
+    Args:
+        tasks: Number of tasks
+        dep_density: Probability that a task depends on each of the
+            DEP_WINDOW tasks before it (0 = independent tasks)
+        criteria: Acceptance criteria per task
+        files: Entries on each task's files line; about one in five is a
+            directory and one in five a glob
+        seed: Random seed
+
+    Returns:
+        The markdown text
+    """
+    rng = random.Random(seed)
+    titles = [_title(rng, i) for i in range(tasks)]
+    lines = [
+        "# Synthetic Feature",
+        "",
+        "## Overview",
+        "",
+        "Generated by benchmarks/workloads.py.",
+        "",
+        "## Implementation Tasks `retries:1` `retries.api:2` `backoff:30`",
+        "",
+    ]
+    for i, title in enumerate(titles):
+        deps = [titles[j] for j in range(max(0, i - DEP_WINDOW), i) if rng.random() < dep_density]
+        attrs = f"`priority:{rng.randint(1, 10)}` `phase:{rng.choice(PHASES)}`"
+        if deps:
+            attrs += f" `deps:{','.join(deps)}`"
+        lines.append(f"- [ ] **{title}** {attrs}")
+        if files:
+            entries = []
+            for _ in range(files):
+                module = f"src/{rng.choice(WORDS)}"
+                kind = rng.random()
+                if kind < 0.2:
+                    entries.append(f"{module}/")
+                elif kind < 0.4:
+                    entries.append(f"{module}/*.py")
+                else:
+                    entries.append(f"{module}/{rng.choice(WORDS)}_{i}.py")
+            lines.append(f"  - files: {', '.join(entries)}")
+        for c in range(criteria):
+            lines.append(f"  - [ ] {rng.choice(WORDS).title()} {rng.choice(WORDS)} criterion {c + 1}")
+    lines += ["", "## Notes", "", "End of tasks."]
+    return "\n".join(lines) + "\n"
+
+
+def changed_files(count=100, seed=0):
+    """Paths shaped like the ones design_doc puts on files lines."""
+    rng = random.Random(seed)
+    return [f"src/{rng.choice(WORDS)}/{rng.choice(WORDS)}_{rng.randrange(1000)}.py" for _ in range(count)]
+
+
+def _write_random(path, size, rng):
+    """Write size bytes of incompressible data."""
+    with open(path, "wb") as f:
+        while size > 0:
+            n = min(size, CHUNK_SIZE)
+            f.write(rng.randbytes(n))
+            size -= n
+
+
+def skill_tree(root, skills=20, references=5, scripts=3, asset_mb=4.0, large_assets=2, seed=0):
+    """
+    Generate a tree of valid skills under root/<category>/<name>/.
+
+    Each skill has a SKILL.md linking its references and scripts, some
+    text references, small scripts, and large_assets incompressible files
+    of asset_mb each (what dominates packaging time in real skills).
+
+    Returns:
+        List of skill directories
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    paths = []
+    for i in range(skills):
+        name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{i}"
+        skill = root / rng.choice(["dev", "utils", "media"]) / name
+        for sub in ("references", "scripts", "assets"):
+            (skill / sub).mkdir(parents=True, exist_ok=True)
+
+        body = [f"# {name}", "", "## Resources", ""]
+        for r in range(references):
+            ref = f"references/topic-{r}.md"
+            body.append(f"- [Topic {r}]({ref})")
+            paragraph = " ".join(rng.choice(WORDS) for _ in range(60))
+            (skill / ref).write_text(f"# Topic {r}\n\n" + "\n\n".join([paragraph] * 20) + "\n")
+        for s in range(scripts):
+            script = f"scripts/tool_{s}.py"
+            body.append(f"- `{script}`")
+            (skill / script).write_text(f"#!/usr/bin/env python3\nprint({s})\n")
+            (skill / script).chmod(0o755)
+        for a in range(large_assets):
+            asset = f"assets/blob-{a}.bin"
+            body.append(f"- `{asset}`")
+            _write_random(skill / asset, int(asset_mb * 1024 * 1024), rng)
+
+        description = f"Synthetic skill {i} for benchmarks. Use when: measuring {rng.choice(WORDS)} workloads."
+        (skill / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: \"{description}\"\n---\n\n" + "\n".join(body) + "\n"
+        )
+        paths.append(skill)
+    return paths
+
+
+def tts_script(items=100, seed=0):
+    """NDJSON lines for `minimax_tts.py batch`, each with an id and text."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(items):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))
+        lines.append(json.dumps({"id": f"line-{i:05d}", "text": text}))
+    return "\n".join(lines) + "\n"
+
+
+class MockMiniMax:
+    """
+    Local MiniMax API: t2a_v2, voice_design and voice/list.
+
+    Every request sleeps latency seconds, then answers with deterministic
+    fake audio derived from the request body. Use as a context manager;
+    point MINIMAX_API_HOST at .url.
+    """
+
+    def __init__(self, port=0, latency=0.05, audio_bytes=32 * 1024):
+        self.latency = latency
+        self.audio_bytes = audio_bytes
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                mock._count()
+                time.sleep(mock.latency)
+                self._reply({"data": {"voices": []}, "base_resp": {"status_code": 0}})
+
+            def do_POST(self):
+                mock._count()
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(mock.latency)
+                request = json.loads(body or b"{}")
+                text = request.get("text") or request.get("preview_text", "")
+                seed = hashlib.sha256(body).digest()
+                audio = (seed * (mock.audio_bytes // len(seed) + 1))[:mock.audio_bytes]
+                data = {"audio": audio.hex()}
+                if "prompt" in request:
+                    data["voice_features"] = {"gender": "female"}
+                self._reply({
+                    "data": data,
+                    "extra_info": {"audio_length": len(text) * 200},
+                    "trace_id": seed.hex()[:16],
+                    "base_resp": {"status_code": 0},
+                })
+
+        return Handler
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic benchmark workloads")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    doc = subparsers.add_parser("design-doc", help="Print a design doc for task_manager.py")
+    doc.add_argument("--tasks", type=int, default=200, help="Number of tasks")
+    doc.add_argument("--dep-density", type=float, default=0.3,
+                     help=f"Chance of depending on each of the {DEP_WINDOW} previous tasks")
+    doc.add_argument("--criteria", type=int, default=3, help="Acceptance criteria per task")
+    doc.add_argument("--files", type=int, default=2, help="Entries per files line")
+    doc.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    tree = subparsers.add_parser("skill-tree", help="Write a tree of synthetic skills")
+    tree.add_argument("root", help="Directory to create the skills in")
+    tree.add_argument("--skills", type=int, default=20, help="Number of skills")
+    tree.add_argument("--asset-mb", type=float, default=4.0, help="Size of each large asset in MB")
+    tree.add_argument("--large-assets", type=int, default=2, help="Large assets per skill")
+    tree.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    script = subparsers.add_parser("tts-script", help="Print an NDJSON script for minimax_tts.py batch")
+    script.add_argument("--items", type=int, default=100, help="Number of lines")
+    script.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    server = subparsers.add_parser("mock-server", help="Serve a mock MiniMax API until interrupted")
+    server.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    server.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+
+    args = parser.parse_args()
+
+    if args.command == "design-doc":
+        sys.stdout.write(design_doc(args.tasks, args.dep_density, args.criteria, args.files, args.seed))
+    elif args.command == "skill-tree":
+        paths = skill_tree(args.root, args.skills, asset_mb=args.asset_mb,
+                           large_assets=args.large_assets, seed=args.seed)
+        print(f"✅ Wrote {len(paths)} skills under {args.root}")
+    elif args.command == "tts-script":
+        sys.stdout.write(tts_script(args.items, args.seed))
+    elif args.command == "mock-server":
+        mock = MockMiniMax(args.port, args.latency)
+        print(f"Mock MiniMax API on {mock.url} (export MINIMAX_API_HOST={mock.url})")
+        mock.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
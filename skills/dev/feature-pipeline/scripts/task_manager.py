@@ -4,12 +4,29 @@
 Manages tasks directly in markdown files using checkbox syntax:
 - [ ] uncompleted task
 - [x] completed task
+
+claim/done/fail also append events to an NDJSON journal next to the
+design file (design.journal.ndjson), which `history` aggregates. `watch`
+streams task status changes as NDJSON while the file is edited, and
+`affected` maps changed files to the tasks that need re-verification.
+
+The script runs once per pipeline step, so startup is kept small:
+patterns are compiled once at import, and modules only one command
+needs (argparse, ctypes, select, socket, subprocess) are imported where
+they are used.
 """
 
-import argparse
+import fnmatch
+import functools
 import json
+import os
+import posixpath
 import re
+import struct
 import sys
+import time
+from collections import defaultdict, deque
+from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 from typing import Optional
@@ -28,13 +45,42 @@ class Task:
     criteria_status: list = field(default_factory=list)  # True/False for each criterion
     line_number: int = 0
     failure_reason: str = ""
+    retries: Optional[int] = None  # per-task override of the retry policy
+    backoff: Optional[float] = None
+    attempts: int = 0  # failed attempts so far
+    retry_after: str = ""  # ISO time before which a failed task is not retried
+
+
+# Retry policy defaults; see parse_retry_policy
+DEFAULT_BACKOFF = 60.0
+BACKOFF_MULTIPLIER = 2.0
+MAX_BACKOFF = 3600.0
+
+# Task line syntax; see references/task-format.md
+TASK_LINE_RE = re.compile(r'^- \[([ xX])\] \*\*(.+?)\*\*(.*)$')
+PRIORITY_RE = re.compile(r'`priority:(\d+)`')
+PHASE_RE = re.compile(r'`phase:(\w+)`')
+DEPS_RE = re.compile(r'`deps:([^`]+)`')
+RETRIES_RE = re.compile(r'`retries:(\d+)`')
+PHASE_RETRIES_RE = re.compile(r'`retries\.(\w+):(\d+)`')
+BACKOFF_RE = re.compile(r'`backoff:(\d+(?:\.\d+)?)`')
+ATTEMPTS_RE = re.compile(r'`attempts:(\d+)`')
+RETRY_AFTER_RE = re.compile(r'`retry-after:([^`]+)`')
+CRITERION_RE = re.compile(r'^- \[([ xX])\] (.+)$')
+CHECKBOX_LINE_RE = re.compile(r'^\s*- \[[ xX]\] ')
+REASON_LINE_RE = re.compile(r'^\s*- (reason|error):')
+UNCHECKED_RE = re.compile(r'^(\s*- )\[[ ]\]')
+CHECKED_RE = re.compile(r'^(\s*- )\[[xX]\]')
+MARKERS_RE = re.compile(r'^(.*?)((?: [✅❌])*)\s*$')
+SECTION_HEADER_RE = re.compile(r'^##\s+Implementation\s+Tasks', re.IGNORECASE)
+HEADING_RE = re.compile(r'^##\s+[^#]')
 
 
 def parse_task_line(line: str) -> Optional[dict]:
     """Parse a task line like: - [ ] **Task Title** `priority:1` `phase:model`"""
 
     # Match checkbox task
-    match = re.match(r'^- \[([ xX])\] \*\*(.+?)\*\*(.*)$', line.strip())
+    match = TASK_LINE_RE.match(line.strip())
     if not match:
         return None
 
@@ -51,45 +97,81 @@ def parse_task_line(line: str) -> Optional[dict]:
     dependencies = []
 
     # Extract priority
-    priority_match = re.search(r'`priority:(\d+)`', rest)
+    priority_match = PRIORITY_RE.search(rest)
     if priority_match:
         priority = int(priority_match.group(1))
 
     # Extract phase
-    phase_match = re.search(r'`phase:(\w+)`', rest)
+    phase_match = PHASE_RE.search(rest)
     if phase_match:
         phase = phase_match.group(1)
 
     # Extract dependencies
-    deps_match = re.search(r'`deps:([^`]+)`', rest)
+    deps_match = DEPS_RE.search(rest)
     if deps_match:
         dependencies = [d.strip() for d in deps_match.group(1).split(',')]
 
+    # Extract retry policy and state
+    retries_match = RETRIES_RE.search(rest)
+    backoff_match = BACKOFF_RE.search(rest)
+    attempts_match = ATTEMPTS_RE.search(rest)
+    retry_after_match = RETRY_AFTER_RE.search(rest)
+
     return {
         "title": title.strip(),
         "status": status,
         "priority": priority,
         "phase": phase,
-        "dependencies": dependencies
+        "dependencies": dependencies,
+        "retries": int(retries_match.group(1)) if retries_match else None,
+        "backoff": float(backoff_match.group(1)) if backoff_match else None,
+        "attempts": int(attempts_match.group(1)) if attempts_match else 0,
+        "retry_after": retry_after_match.group(1).strip() if retry_after_match else "",
     }
 
 
-def parse_tasks_from_markdown(content: str) -> list[Task]:
-    """Parse all tasks from markdown content."""
+def _task_from_line(task_data: dict, line_number: int) -> Task:
+    return Task(
+        title=task_data["title"],
+        status=task_data["status"],
+        priority=task_data["priority"],
+        phase=task_data["phase"],
+        dependencies=task_data["dependencies"],
+        line_number=line_number,
+        retries=task_data["retries"],
+        backoff=task_data["backoff"],
+        attempts=task_data["attempts"],
+        retry_after=task_data["retry_after"],
+    )
 
-    lines = content.split('\n')
-    tasks = []
-    current_task = None
-    in_task_section = False
 
-    for i, line in enumerate(lines):
+def parse_task_blocks(lines: list[str], start: int = 0, end: Optional[int] = None,
+                      in_task_section: bool = False) -> list[list]:
+    """Parse tasks from lines[start:end] as [first_line, end_line, Task] blocks.
+
+    A block runs from its task line up to the next task line (0-based, end
+    exclusive): detail lines anywhere in between attach to its task, so
+    TaskIndex can re-parse only the blocks an edit touches.
+    """
+
+    end = len(lines) if end is None else end
+    blocks = []
+    current = None
+
+    def close(at):
+        if current and current[1] is None:
+            current[1] = at
+
+    for i in range(start, end):
+        line = lines[i]
+
         # Check if we're in the Implementation Tasks section
-        if re.match(r'^##\s+Implementation\s+Tasks', line, re.IGNORECASE):
+        if SECTION_HEADER_RE.match(line):
             in_task_section = True
             continue
 
         # Exit task section on next ## header
-        if in_task_section and re.match(r'^##\s+[^#]', line) and 'Implementation' not in line:
+        if in_task_section and HEADING_RE.match(line) and 'Implementation' not in line:
             in_task_section = False
             continue
 
@@ -99,21 +181,14 @@ def parse_tasks_from_markdown(content: str) -> list[Task]:
         # Parse main task line
         task_data = parse_task_line(line)
         if task_data:
-            if current_task:
-                tasks.append(current_task)
-
-            current_task = Task(
-                title=task_data["title"],
-                status=task_data["status"],
-                priority=task_data["priority"],
-                phase=task_data["phase"],
-                dependencies=task_data["dependencies"],
-                line_number=i + 1
-            )
+            close(i)
+            current = [i, None, _task_from_line(task_data, i + 1)]
+            blocks.append(current)
             continue
 
         # Parse task details (indented lines under a task)
-        if current_task and line.strip().startswith('- '):
+        if current and line.strip().startswith('- '):
+            current_task = current[2]
             stripped = line.strip()
 
             # Files line
@@ -122,108 +197,252 @@ def parse_tasks_from_markdown(content: str) -> list[Task]:
                 current_task.files = [f.strip() for f in files_str.split(',') if f.strip()]
 
             # Criterion line (checkbox)
-            elif re.match(r'^- \[([ xX])\] ', stripped):
-                checkbox_match = re.match(r'^- \[([ xX])\] (.+)$', stripped)
-                if checkbox_match:
-                    is_done = checkbox_match.group(1).lower() == 'x'
-                    criterion = checkbox_match.group(2).strip()
-                    current_task.criteria.append(criterion)
-                    current_task.criteria_status.append(is_done)
+            elif checkbox_match := CRITERION_RE.match(stripped):
+                is_done = checkbox_match.group(1).lower() == 'x'
+                criterion = checkbox_match.group(2).strip()
+                current_task.criteria.append(criterion)
+                current_task.criteria_status.append(is_done)
 
             # Failure reason
             elif stripped.startswith('- reason:') or stripped.startswith('- error:'):
                 current_task.failure_reason = stripped.split(':', 1)[1].strip()
 
-    # Don't forget the last task
-    if current_task:
-        tasks.append(current_task)
+    close(end)
+    return blocks
+
+
+def parse_tasks_from_markdown(content: str) -> list[Task]:
+    """Parse all tasks from markdown content."""
+    return [task for _, _, task in parse_task_blocks(content.split('\n'))]
+
+
+def parse_retry_policy(content: str) -> dict:
+    """Read the retry policy from the Implementation Tasks header.
 
-    return tasks
+    ## Implementation Tasks `retries:2` `retries.api:3` `backoff:30`
 
+    retries:N applies to every task, retries.PHASE:N to one phase and
+    backoff:S sets the first retry delay in seconds (doubled per attempt).
+    Task-level `retries:N` / `backoff:S` override both.
+    """
+    policy = {"retries": 0, "phases": {}, "backoff": DEFAULT_BACKOFF}
+    for line in content.split('\n'):
+        if SECTION_HEADER_RE.match(line):
+            default = RETRIES_RE.search(line)
+            if default:
+                policy["retries"] = int(default.group(1))
+            for phase, count in PHASE_RETRIES_RE.findall(line):
+                policy["phases"][phase] = int(count)
+            backoff = BACKOFF_RE.search(line)
+            if backoff:
+                policy["backoff"] = float(backoff.group(1))
+            break
+    return policy
 
-def get_next_task(tasks: list[Task]) -> Optional[Task]:
-    """Get the next task to execute based on priority and dependencies."""
 
+def retry_limit(task: Task, policy: dict) -> int:
+    """Number of retries allowed after the first failed attempt."""
+    if task.retries is not None:
+        return task.retries
+    return policy["phases"].get(task.phase, policy["retries"])
+
+
+def retry_delay(task: Task, policy: dict, attempts: int) -> float:
+    """Backoff before retry number `attempts`: base * 2^(attempts-1), capped."""
+    base = task.backoff if task.backoff is not None else policy["backoff"]
+    return min(base * BACKOFF_MULTIPLIER ** (attempts - 1), MAX_BACKOFF)
+
+
+def retry_time(task: Task) -> Optional[float]:
+    """retry-after of a task as a timestamp, or None."""
+    if not task.retry_after:
+        return None
+    try:
+        return datetime.fromisoformat(task.retry_after).timestamp()
+    except ValueError:
+        return None
+
+
+def get_next_task(tasks: list[Task], now: Optional[float] = None) -> Optional[Task]:
+    """Get the next task to execute based on priority and dependencies.
+
+    Tasks waiting to be retried become available once their backoff window
+    has passed, and are only picked when no fresh task is ready.
+    """
+
+    now = time.time() if now is None else now
     completed_titles = {t.title for t in tasks if t.status == "completed"}
 
     # Find pending tasks with satisfied dependencies
     available = []
+    retrying = []
     for task in tasks:
         if task.status != "pending":
             continue
 
         # Check dependencies
         deps_satisfied = all(dep in completed_titles for dep in task.dependencies)
-        if deps_satisfied:
+        if not deps_satisfied:
+            continue
+
+        due = retry_time(task)
+        if due is None:
             available.append(task)
+        elif due <= now:
+            retrying.append(task)
 
-    if not available:
+    if not available and not retrying:
         return None
 
-    # Sort by priority (lower number = higher priority)
+    # Sort by priority (lower number = higher priority), retries behind ready work
     available.sort(key=lambda t: t.priority)
-    return available[0]
+    retrying.sort(key=lambda t: (t.priority, retry_time(t)))
+    return (available + retrying)[0]
+
+
+def next_retry_at(tasks: list[Task]) -> Optional[str]:
+    """Earliest retry-after among pending tasks, if any are waiting."""
+    waiting = [t for t in tasks if t.status == "pending" and retry_time(t) is not None]
+    if not waiting:
+        return None
+    return min(waiting, key=retry_time).retry_after
 
 
-def update_task_status(content: str, task_title: str, new_status: str, reason: str = "") -> str:
-    """Update a task's status in the markdown content."""
+@functools.lru_cache(maxsize=None)
+def _attribute_re(key: str) -> re.Pattern:
+    return re.compile(rf' ?`{re.escape(key)}:[^`]*`')
+
+
+def set_task_attributes(line: str, attributes: dict) -> str:
+    """Set (or with None, remove) `key:value` attributes on a task line, before its markers."""
+    for key, value in attributes.items():
+        line = _attribute_re(key).sub('', line)
+        if value is not None:
+            body, markers = MARKERS_RE.match(line).groups()
+            line = f"{body.rstrip()} `{key}:{value}`{markers}"
+    return line
+
+
+def update_task_status(content: str, task_title: str, new_status: str, reason: str = "",
+                       attributes: Optional[dict] = None) -> str:
+    """Update a task's status in the markdown content.
+
+    new_status is completed, failed, pending or retry (failed, but left
+    unchecked so the scheduler picks it up again). attributes are set on
+    the task line; a reason replaces any previous reason line of the task,
+    and resetting to pending drops it.
+    """
+    return update_tasks_status(content, {task_title}, new_status, reason, attributes)
+
+
+def update_tasks_status(content: str, task_titles: set, new_status: str, reason: str = "",
+                        attributes: Optional[dict] = None) -> str:
+    """update_task_status for several tasks in a single pass."""
 
     lines = content.split('\n')
     result = []
     in_target_task = False
     task_indent = 0
+    # Blank lines inside a target task are held back so the reason goes
+    # after its last detail line, not after trailing blanks
+    blanks = []
+
+    def close_target():
+        if reason and new_status in ("failed", "retry"):
+            indent = "  " * (task_indent // 2 + 1)
+            result.append(f"{indent}- reason: {reason}")
+        result.extend(blanks)
+        blanks.clear()
 
     for line in lines:
-        # Check if this is the target task
         task_data = parse_task_line(line)
-        if task_data and task_data["title"] == task_title:
+
+        # Check if we've left the target task (next task, heading or dedent);
+        # like parse_task_blocks, details after blank lines still belong to it
+        if in_target_task:
+            indent = len(line) - len(line.lstrip())
+            if task_data or HEADING_RE.match(line) or (line.strip() and indent <= task_indent):
+                close_target()
+                in_target_task = False
+            elif not line.strip():
+                blanks.append(line)
+                continue
+
+        # Check if this is a target task
+        if task_data and task_data["title"] in task_titles:
             in_target_task = True
             task_indent = len(line) - len(line.lstrip())
 
             # Update the checkbox
             if new_status == "completed":
-                line = re.sub(r'^(\s*- )\[[ ]\]', r'\1[x]', line)
+                line = UNCHECKED_RE.sub(r'\1[x]', line)
+                line = line.replace(" ❌", "")
                 # Add completion marker if not present
                 if "✅" not in line:
                     line = line.rstrip() + " ✅"
             elif new_status == "failed":
-                line = re.sub(r'^(\s*- )\[[ ]\]', r'\1[x]', line)
+                line = UNCHECKED_RE.sub(r'\1[x]', line)
                 # Add failure marker
                 if "❌" not in line:
                     line = line.rstrip() + " ❌"
-            elif new_status == "pending":
-                line = re.sub(r'^(\s*- )\[[xX]\]', r'\1[ ]', line)
+            elif new_status in ("pending", "retry"):
+                line = CHECKED_RE.sub(r'\1[ ]', line)
                 # Remove markers
                 line = line.replace(" ✅", "").replace(" ❌", "")
 
+            if attributes:
+                line = set_task_attributes(line, attributes)
             result.append(line)
             continue
 
-        # Check if we've moved to a different task
-        if task_data and task_data["title"] != task_title:
-            in_target_task = False
+        if in_target_task:
+            # Drop the previous reason; close_target writes the new one
+            if (reason or new_status == "pending") and REASON_LINE_RE.match(line):
+                continue
 
-        # Update criteria checkboxes within the task
-        if in_target_task and re.match(r'^\s*- \[[ xX]\] ', line):
-            current_indent = len(line) - len(line.lstrip())
-            if current_indent > task_indent:
+            # Update criteria checkboxes within the task
+            if CHECKBOX_LINE_RE.match(line):
                 if new_status == "completed":
-                    line = re.sub(r'^(\s*- )\[[ ]\]', r'\1[x]', line)
+                    line = UNCHECKED_RE.sub(r'\1[x]', line)
                 elif new_status == "pending":
-                    line = re.sub(r'^(\s*- )\[[xX]\]', r'\1[ ]', line)
+                    line = CHECKED_RE.sub(r'\1[ ]', line)
+
+            result.extend(blanks)
+            blanks.clear()
 
         result.append(line)
 
-        # Add failure reason after the task line if failed
-        if in_target_task and task_data and new_status == "failed" and reason:
-            indent = "  " * (task_indent // 2 + 1)
-            # Check if next line already has a reason
-            result.append(f"{indent}- reason: {reason}")
-            in_target_task = False  # Prevent adding reason multiple times
+    if in_target_task:
+        close_target()
 
     return '\n'.join(result)
 
 
+def fail_task(content: str, task_title: str, reason: str = "", now: Optional[float] = None) -> tuple[str, dict]:
+    """Record a failed attempt, scheduling a retry if the policy allows one.
+
+    Returns:
+        (updated content, {"attempts", "retry", "retry_after"})
+    """
+    task = next((t for t in parse_tasks_from_markdown(content) if t.title == task_title), None)
+    if task is None:
+        raise ValueError(f"Task not found: {task_title}")
+
+    now = time.time() if now is None else now
+    policy = parse_retry_policy(content)
+    attempts = task.attempts + 1
+    if attempts <= retry_limit(task, policy):
+        due = datetime.fromtimestamp(now + retry_delay(task, policy, attempts)).astimezone()
+        retry_after = due.isoformat(timespec="seconds")
+        updated = update_task_status(content, task_title, "retry", reason,
+                                     {"attempts": attempts, "retry-after": retry_after})
+        return updated, {"attempts": attempts, "retry": True, "retry_after": retry_after}
+
+    updated = update_task_status(content, task_title, "failed", reason,
+                                 {"attempts": attempts, "retry-after": None})
+    return updated, {"attempts": attempts, "retry": False, "retry_after": None}
+
+
 def get_status_summary(tasks: list[Task]) -> dict:
     """Get a summary of task statuses."""
 
@@ -232,7 +451,8 @@ def get_status_summary(tasks: list[Task]) -> dict:
         "completed": 0,
         "pending": 0,
         "failed": 0,
-        "blocked": 0
+        "blocked": 0,
+        "retrying": 0
     }
 
     completed_titles = {t.title for t in tasks if t.status == "completed"}
@@ -245,14 +465,512 @@ def get_status_summary(tasks: list[Task]) -> dict:
         elif task.status == "pending":
             # Check if blocked by dependencies
             deps_satisfied = all(dep in completed_titles for dep in task.dependencies)
-            if deps_satisfied:
-                summary["pending"] += 1
-            else:
+            if not deps_satisfied:
                 summary["blocked"] += 1
+            elif task.retry_after:
+                summary["retrying"] += 1
+            else:
+                summary["pending"] += 1
 
     return summary
 
 
+# ============================================================
+# Event journal
+# ============================================================
+
+JOURNAL_SUFFIX = ".journal.ndjson"
+JOURNAL_CHUNK_SIZE = 64 * 1024
+
+
+def journal_path_for(design_file, journal: Optional[str] = None) -> Path:
+    """Sidecar journal of a design file: design.md -> design.journal.ndjson."""
+    if journal:
+        return Path(journal)
+    design_file = Path(design_file)
+    return design_file.with_name(design_file.stem + JOURNAL_SUFFIX)
+
+
+class JournalWriter:
+    """Appends events to an NDJSON journal, batching writes and fsyncs.
+
+    Events are buffered and written with a single append once batch_size
+    events are pending or interval seconds have passed since the last
+    flush; each flush is followed by one fsync. close() flushes the rest.
+    """
+
+    def __init__(self, path, batch_size: int = 32, interval: float = 1.0):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.interval = interval
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def append(self, event: dict):
+        self._buffer.append(json.dumps(event, separators=(",", ":"), ensure_ascii=False))
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        data = ("\n".join(self._buffer) + "\n").encode("utf-8")
+        # O_APPEND keeps each batch contiguous when several workers share a journal
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_journal(path):
+    """Stream events from a journal, oldest first, skipping torn lines."""
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def iter_journal_reversed(path):
+    """Stream events newest first, reading the file backwards in chunks."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail = b""
+        while position > 0:
+            size = min(JOURNAL_CHUNK_SIZE, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + tail).split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        if tail.strip():
+            try:
+                yield json.loads(tail)
+            except ValueError:
+                pass
+
+
+def last_event(path, task_title: str, events=None) -> Optional[dict]:
+    """Most recent event for a task (optionally of the given kinds), or None."""
+    if not Path(path).exists():
+        return None
+    for event in iter_journal_reversed(path):
+        if event.get("task") == task_title and (events is None or event.get("event") in events):
+            return event
+    return None
+
+
+def default_worker() -> str:
+    import socket
+    return os.environ.get("FEATURE_PIPELINE_WORKER") or socket.gethostname()
+
+
+def record_claim(journal, task: Task, worker: str) -> dict:
+    """Journal the start of an attempt at a task."""
+    previous = last_event(journal, task.title, ("claim",))
+    event = {
+        "event": "claim",
+        "task": task.title,
+        "phase": task.phase,
+        "worker": worker,
+        "attempt": previous["attempt"] + 1 if previous else 1,
+        "start": round(time.time(), 3),
+    }
+    with JournalWriter(journal) as writer:
+        writer.append(event)
+    return event
+
+
+def record_outcome(journal, task_title: str, phase: str, outcome: str, worker: str, reason: str = "") -> dict:
+    """Journal the end of an attempt, paired with its claim when there is one."""
+    end = round(time.time(), 3)
+    claim = last_event(journal, task_title, ("claim", "done", "fail"))
+    if claim is None or claim["event"] != "claim":
+        claim = None
+    event = {
+        "event": outcome,
+        "task": task_title,
+        "phase": claim["phase"] if claim else phase,
+        "worker": worker,
+        "attempt": claim["attempt"] if claim else 1,
+        "start": claim["start"] if claim else None,
+        "end": end,
+        "duration": round(end - claim["start"], 3) if claim else None,
+    }
+    if reason:
+        event["reason"] = reason
+    with JournalWriter(journal) as writer:
+        writer.append(event)
+    return event
+
+
+def summarize_journal(path, bucket: int = 3600) -> dict:
+    """Aggregate a journal in one streaming pass.
+
+    Returns per-phase attempt counts, failure rates and durations, plus
+    completed tasks per time bucket (bucket seconds wide).
+    """
+    phases = defaultdict(lambda: {"done": 0, "fail": 0, "durations": 0, "total": 0.0, "max": 0.0})
+    throughput = defaultdict(int)
+    events = 0
+    first = last = None
+
+    for event in iter_journal(path):
+        events += 1
+        stamp = event.get("end") or event.get("start")
+        if stamp is not None:
+            first = stamp if first is None else min(first, stamp)
+            last = stamp if last is None else max(last, stamp)
+        kind = event.get("event")
+        if kind not in ("done", "fail"):
+            continue
+        stats = phases[event.get("phase") or "implementation"]
+        stats[kind] += 1
+        duration = event.get("duration")
+        if duration is not None:
+            stats["durations"] += 1
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+        if kind == "done" and event.get("end") is not None:
+            throughput[int(event["end"] // bucket * bucket)] += 1
+
+    phase_summary = {}
+    for phase, stats in sorted(phases.items()):
+        finished = stats["done"] + stats["fail"]
+        phase_summary[phase] = {
+            "done": stats["done"],
+            "failed": stats["fail"],
+            "failure_rate": round(stats["fail"] / finished, 3) if finished else 0.0,
+            "total_seconds": round(stats["total"], 3),
+            "mean_seconds": round(stats["total"] / stats["durations"], 3) if stats["durations"] else None,
+            "max_seconds": round(stats["max"], 3),
+        }
+
+    span = (last - first) if first is not None else 0
+    completed = sum(s["done"] for s in phase_summary.values())
+    return {
+        "events": events,
+        "first": first,
+        "last": last,
+        "completed": completed,
+        "completed_per_hour": round(completed / span * 3600, 2) if span > 0 else None,
+        "phases": phase_summary,
+        "throughput": [{"start": start, "completed": count} for start, count in sorted(throughput.items())],
+        "bucket_seconds": bucket,
+    }
+
+
+# ============================================================
+# Watch mode
+# ============================================================
+
+class TaskIndex:
+    """Parsed tasks of a design doc, updated incrementally on edits.
+
+    update() compares the new text with the previous one, finds the changed
+    line range (common prefix/suffix), re-parses only the task blocks that
+    range touches and shifts the rest. Edits that add, remove or change a
+    ## heading fall back to a full parse.
+    """
+
+    def __init__(self, content: str):
+        self.lines = content.split('\n')
+        self.blocks = parse_task_blocks(self.lines)
+        self.reparsed_lines = len(self.lines)
+
+    @property
+    def tasks(self) -> list[Task]:
+        return [task for _, _, task in self.blocks]
+
+    def _block_at(self, line: int) -> Optional[int]:
+        for i, (start, end, _) in enumerate(self.blocks):
+            if start <= line < end:
+                return i
+        return None
+
+    def update(self, content: str) -> tuple[list[Task], list[Task]]:
+        """Apply new content; returns (tasks before, tasks after) of the re-parsed region."""
+        old, new = self.lines, content.split('\n')
+        limit = min(len(old), len(new))
+        prefix = 0
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+        old_end, new_end = len(old) - suffix, len(new) - suffix
+        delta = len(new) - len(old)
+
+        changed = old[prefix:old_end] + new[prefix:new_end]
+        if any(HEADING_RE.match(line) or SECTION_HEADER_RE.match(line) for line in changed):
+            before = self.tasks
+            self.lines, self.blocks = new, parse_task_blocks(new)
+            self.reparsed_lines = len(new)
+            return before, self.tasks
+
+        # Widen the edit to whole blocks: the one before it (lines appended
+        # to a task) through the one containing its end, or up to the next
+        # block when the edit ends outside any task
+        first = self._block_at(prefix - 1) if prefix else None
+        if first is None:
+            first = self._block_at(prefix)
+        last = self._block_at(old_end)
+        if last is None and old_end > prefix:
+            last = self._block_at(old_end - 1)
+        start = min(self.blocks[first][0], prefix) if first is not None else prefix
+        if last is not None:
+            end = max(old_end, self.blocks[last][1])
+        else:
+            end = next((b[0] for b in self.blocks if b[0] >= old_end), len(old))
+
+        kept_before = [b for b in self.blocks if b[1] <= start]
+        replaced = [b for b in self.blocks if b[1] > start and b[0] < end]
+        kept_after = [b for b in self.blocks if b[0] >= end]
+
+        reparsed = parse_task_blocks(new, start, end + delta, self._in_section(start))
+        for block in kept_after:
+            block[0] += delta
+            block[1] += delta
+            block[2].line_number += delta
+        self.lines = new
+        self.blocks = kept_before + reparsed + kept_after
+        self.reparsed_lines = end + delta - start
+        return [b[2] for b in replaced], [b[2] for b in reparsed]
+
+    def _in_section(self, line: int) -> bool:
+        """Whether line lies in an Implementation Tasks section (headings above it are unchanged)."""
+        for i in range(line - 1, -1, -1):
+            if SECTION_HEADER_RE.match(self.lines[i]):
+                return True
+            if HEADING_RE.match(self.lines[i]) and 'Implementation' not in self.lines[i]:
+                return False
+        return False
+
+
+def diff_tasks(before: list[Task], after: list[Task]) -> list[dict]:
+    """Status deltas between two task lists, keyed by title."""
+    old = {t.title: asdict(t) for t in before}
+    new = {t.title: asdict(t) for t in after}
+    events = []
+    for title, task in new.items():
+        if title not in old:
+            events.append({"event": "task_added", "task": task})
+            continue
+        changes = {
+            key: [old[title][key], value]
+            for key, value in task.items()
+            if key != "line_number" and old[title][key] != value
+        }
+        if changes:
+            events.append({"event": "task_changed", "title": title, "changes": changes})
+    for title in old:
+        if title not in new:
+            events.append({"event": "task_removed", "title": title})
+    return events
+
+
+class FileWatcher:
+    """Waits for changes to one file: inotify on Linux, stat polling elsewhere.
+
+    The parent directory is watched so editors that save by renaming a
+    temporary file over the original are seen too.
+    """
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, path, interval: float = 0.5, poll: bool = False, settle: float = 0.05):
+        self.path = Path(path).resolve()
+        self.interval = interval
+        self.settle = settle
+        self._fd = None if poll else self._init_inotify()
+        self._stamp = self._stat()
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._fd is not None else "poll"
+
+    def _init_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+            if libc.inotify_add_watch(fd, str(self.path.parent).encode(), mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _stat(self):
+        try:
+            st = self.path.stat()
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            return None
+
+    def _read_events(self, timeout: Optional[float]) -> bool:
+        """Drain pending inotify events; True if any concerned the file."""
+        import select
+        relevant = False
+        while select.select([self._fd], [], [], timeout)[0]:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + self.EVENT_HEADER.size:offset + self.EVENT_HEADER.size + length]
+                offset += self.EVENT_HEADER.size + length
+                if name.rstrip(b"\0").decode(errors="replace") == self.path.name:
+                    relevant = True
+            # Keep draining the burst of events a single save produces
+            timeout = self.settle if relevant else timeout
+        return relevant
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the file changes (True) or timeout seconds pass (False)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if self._fd is not None:
+                changed = self._read_events(remaining)
+            else:
+                time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+                changed = True
+            if changed:
+                stamp = self._stat()
+                if stamp != self._stamp:
+                    self._stamp = stamp
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+# ============================================================
+# Affected tasks
+# ============================================================
+
+GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+def normalize_path(path: str) -> str:
+    path = posixpath.normpath(path.strip().replace('\\', '/'))
+    return path[2:] if path.startswith('./') else path
+
+
+class FileIndex:
+    """Inverted index from the `files:` of each task to task titles.
+
+    Plain paths are looked up directly, entries ending in / match
+    everything below them, and shell-style globs (src/api/*.py) are
+    matched with fnmatch.
+    """
+
+    def __init__(self, tasks: list[Task]):
+        self.exact = defaultdict(set)
+        self.dirs = defaultdict(set)
+        self.globs = defaultdict(set)
+        for task in tasks:
+            for entry in task.files:
+                if GLOB_CHARS.search(entry):
+                    self.globs[normalize_path(entry)].add(task.title)
+                elif entry.rstrip().endswith('/'):
+                    self.dirs[normalize_path(entry)].add(task.title)
+                else:
+                    self.exact[normalize_path(entry)].add(task.title)
+        self._glob_res = [(re.compile(fnmatch.translate(g)), g) for g in self.globs]
+
+    def lookup(self, path: str) -> dict:
+        """Tasks whose files match path, as {title: matching entry}."""
+        path = normalize_path(path)
+        matches = {title: path for title in self.exact.get(path, ())}
+        parent = posixpath.dirname(path)
+        while parent:
+            for title in self.dirs.get(parent, ()):
+                matches.setdefault(title, parent + '/')
+            parent = posixpath.dirname(parent)
+        for regex, pattern in self._glob_res:
+            if regex.match(path):
+                for title in self.globs[pattern]:
+                    matches.setdefault(title, pattern)
+        return matches
+
+
+def find_affected(tasks: list[Task], changed: list[str]) -> dict:
+    """Tasks affected by changed files, directly or through `deps:`.
+
+    Returns:
+        {title: {"files": [changed paths]} or {"via": dependency title}},
+        in task order
+    """
+    index = FileIndex(tasks)
+    affected = {}
+    for path in changed:
+        for title in index.lookup(path):
+            affected.setdefault(title, {"files": []})["files"].append(normalize_path(path))
+
+    # Propagate to dependents, breadth first
+    dependents = defaultdict(list)
+    for task in tasks:
+        for dep in task.dependencies:
+            dependents[dep].append(task.title)
+    queue = deque(affected)
+    while queue:
+        title = queue.popleft()
+        for dependent in dependents.get(title, ()):
+            if dependent not in affected:
+                affected[dependent] = {"via": title}
+                queue.append(dependent)
+
+    order = {task.title: i for i, task in enumerate(tasks)}
+    return dict(sorted(affected.items(), key=lambda item: order.get(item[0], len(order))))
+
+
+def git_changed_files(rev: str) -> list[str]:
+    """Paths changed since rev (working tree included), relative to the repo root."""
+    import subprocess
+    result = subprocess.run(["git", "diff", "--name-only", rev], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"git diff failed: {result.stderr.strip()}")
+    return [line for line in result.stdout.splitlines() if line.strip()]
+
+
 def cmd_next(args):
     """Get the next task to execute."""
     content = Path(args.file).read_text()
@@ -271,6 +989,7 @@ def cmd_next(args):
             print(json.dumps({
                 "status": "no_tasks",
                 "summary": summary,
+                "next_retry": next_retry_at(tasks),
                 "message": "No pending tasks available"
             }, indent=2))
     else:
@@ -285,15 +1004,22 @@ def cmd_next(args):
                     print(f"  - {c}")
         else:
             print("No pending tasks available")
+            retry_at = next_retry_at(tasks)
+            if retry_at:
+                print(f"Next retry at: {retry_at}")
 
 
 def cmd_done(args):
     """Mark a task as completed."""
     file_path = Path(args.file)
     content = file_path.read_text()
+    task = next((t for t in parse_tasks_from_markdown(content) if t.title == args.task), None)
+    if task is None:
+        raise ValueError(f"Task not found: {args.task}")
 
-    updated = update_task_status(content, args.task, "completed")
+    updated = update_task_status(content, args.task, "completed", attributes={"retry-after": None})
     file_path.write_text(updated)
+    record_outcome(journal_path_for(file_path, args.journal), args.task, task.phase, "done", args.worker)
 
     if args.json:
         print(json.dumps({"status": "success", "task": args.task, "new_status": "completed"}))
@@ -306,17 +1032,197 @@ def cmd_fail(args):
     file_path = Path(args.file)
     content = file_path.read_text()
 
-    updated = update_task_status(content, args.task, "failed", args.reason or "")
+    updated, outcome = fail_task(content, args.task, args.reason or "")
     file_path.write_text(updated)
+    record_outcome(journal_path_for(file_path, args.journal), args.task,
+                   _task_phase(content, args.task), "fail", args.worker, args.reason or "")
 
+    new_status = "retry" if outcome["retry"] else "failed"
     if args.json:
-        print(json.dumps({"status": "success", "task": args.task, "new_status": "failed", "reason": args.reason}))
+        print(json.dumps({"status": "success", "task": args.task, "new_status": new_status,
+                          "reason": args.reason, **outcome}))
     else:
-        print(f"❌ Marked '{args.task}' as failed")
+        if outcome["retry"]:
+            print(f"🔁 '{args.task}' failed (attempt {outcome['attempts']}), retry after {outcome['retry_after']}")
+        else:
+            print(f"❌ Marked '{args.task}' as failed")
         if args.reason:
             print(f"   Reason: {args.reason}")
 
 
+def _task_phase(content: str, task_title: str) -> str:
+    for task in parse_tasks_from_markdown(content):
+        if task.title == task_title:
+            return task.phase
+    return "implementation"
+
+
+def cmd_claim(args):
+    """Take the next task (or a named one) and journal the start of the attempt."""
+    content = Path(args.file).read_text()
+    tasks = parse_tasks_from_markdown(content)
+
+    if args.task:
+        task = next((t for t in tasks if t.title == args.task), None)
+        if task is None:
+            raise ValueError(f"Task not found: {args.task}")
+    else:
+        task = get_next_task(tasks)
+
+    if task is None:
+        if args.json:
+            print(json.dumps({"status": "no_tasks", "summary": get_status_summary(tasks),
+                              "next_retry": next_retry_at(tasks)}, indent=2))
+        else:
+            print("No pending tasks available")
+        return
+
+    event = record_claim(journal_path_for(args.file, args.journal), task, args.worker)
+    if args.json:
+        print(json.dumps({"status": "claimed", "attempt": event["attempt"], "task": asdict(task)}, indent=2))
+    else:
+        print(f"Claimed: {task.title} (attempt {event['attempt']})")
+        print(f"Priority: {task.priority} | Phase: {task.phase}")
+        if task.files:
+            print(f"Files: {', '.join(task.files)}")
+
+
+def _format_seconds(seconds) -> str:
+    if seconds is None:
+        return "-"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{seconds:.1f}s"
+
+
+def cmd_history(args):
+    """Summarize the event journal."""
+    journal = journal_path_for(args.file, args.journal)
+    if not journal.exists():
+        raise FileNotFoundError(2, "No such file", str(journal))
+    summary = summarize_journal(journal, args.bucket)
+
+    if args.json:
+        print(json.dumps({"journal": str(journal), **summary}, indent=2))
+        return
+
+    print(f"Journal: {journal} ({summary['events']} events)")
+    if summary["first"] is not None:
+        first = datetime.fromtimestamp(summary["first"]).strftime("%Y-%m-%d %H:%M")
+        last = datetime.fromtimestamp(summary["last"]).strftime("%Y-%m-%d %H:%M")
+        print(f"Span: {first} -> {last} ({_format_seconds(summary['last'] - summary['first'])})")
+    rate = summary["completed_per_hour"]
+    print(f"Completed: {summary['completed']}" + (f" ({rate}/hour)" if rate else ""))
+
+    if summary["phases"]:
+        print()
+        print(f"  {'Phase':<16}{'Done':>6}{'Failed':>8}{'Fail%':>8}{'Mean':>9}{'Max':>9}{'Total':>9}")
+        for phase, stats in summary["phases"].items():
+            print(f"  {phase:<16}{stats['done']:>6}{stats['failed']:>8}"
+                  f"{stats['failure_rate'] * 100:>7.1f}%"
+                  f"{_format_seconds(stats['mean_seconds']):>9}"
+                  f"{_format_seconds(stats['max_seconds']):>9}"
+                  f"{_format_seconds(stats['total_seconds']):>9}")
+
+    if summary["throughput"]:
+        print()
+        print(f"Throughput (completed per {_format_seconds(summary['bucket_seconds'])}):")
+        peak = max(b["completed"] for b in summary["throughput"])
+        for bucket in summary["throughput"]:
+            label = datetime.fromtimestamp(bucket["start"]).strftime("%Y-%m-%d %H:%M")
+            bar = "█" * max(1, round(bucket["completed"] / peak * 30))
+            print(f"  {label}  {bar} {bucket['completed']}")
+
+
+def _emit(event: dict):
+    event["ts"] = round(time.time(), 3)
+    print(json.dumps(event, ensure_ascii=False), flush=True)
+
+
+def cmd_watch(args):
+    """Stream task status deltas as NDJSON while the design doc changes."""
+    file_path = Path(args.file)
+    index = TaskIndex(file_path.read_text())
+    summary = get_status_summary(index.tasks)
+    watcher = FileWatcher(file_path, args.interval, args.poll)
+    _emit({"event": "snapshot", "mode": watcher.mode, "summary": summary,
+           "tasks": [asdict(t) for t in index.tasks]})
+
+    deadline = None if args.timeout is None else time.monotonic() + args.timeout
+    try:
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            if not watcher.wait(remaining):
+                continue
+            try:
+                content = file_path.read_text()
+            except FileNotFoundError:
+                continue
+            before, after = index.update(content)
+            for event in diff_tasks(before, after):
+                _emit(event)
+            new_summary = get_status_summary(index.tasks)
+            if new_summary != summary:
+                summary = new_summary
+                _emit({"event": "summary", "summary": summary, "reparsed_lines": index.reparsed_lines})
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def cmd_affected(args):
+    """List tasks affected by changed files, optionally resetting them to pending."""
+    file_path = Path(args.file)
+    content = file_path.read_text()
+    tasks = parse_tasks_from_markdown(content)
+
+    changed = []
+    for path in args.changed or []:
+        if path == '-':
+            changed.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            changed.append(path)
+    if args.git:
+        changed.extend(git_changed_files(args.git))
+
+    affected = find_affected(tasks, changed)
+    status = {task.title: task.status for task in tasks}
+    to_reset = [title for title in affected if status[title] != "pending"]
+
+    if args.reset and to_reset:
+        updated = update_tasks_status(content, set(to_reset), "pending",
+                                      attributes={"attempts": None, "retry-after": None})
+        file_path.write_text(updated)
+        with JournalWriter(journal_path_for(file_path, args.journal)) as writer:
+            for title in to_reset:
+                writer.append({"event": "reset", "task": title, "worker": args.worker,
+                               "end": round(time.time(), 3), "reason": "affected by changed files"})
+
+    if args.json:
+        print(json.dumps({
+            "changed": [normalize_path(p) for p in changed],
+            "affected": [{"title": title, "status": status[title], **reason} for title, reason in affected.items()],
+            "reset": to_reset if args.reset else [],
+        }, indent=2))
+        return
+
+    print(f"Changed: {len(changed)} files")
+    print(f"Affected: {len(affected)} tasks")
+    for title, reason in affected.items():
+        icon = {"completed": "✅", "failed": "❌", "pending": "⬜"}.get(status[title], "?")
+        cause = ", ".join(reason["files"]) if "files" in reason else f"via {reason['via']}"
+        print(f"  {icon} {title}  <- {cause}")
+    if args.reset:
+        print(f"\nReset {len(to_reset)} tasks to pending")
+
+
 def cmd_status(args):
     """Show status summary."""
     content = Path(args.file).read_text()
@@ -340,6 +1246,7 @@ def cmd_status(args):
         print(f"  Completed: {summary['completed']}")
         print(f"  Pending:   {summary['pending']}")
         print(f"  Blocked:   {summary['blocked']}")
+        print(f"  Retrying:  {summary['retrying']}")
         print(f"  Failed:    {summary['failed']}")
 
         # Show next task
@@ -358,10 +1265,14 @@ def cmd_list(args):
     else:
         for task in tasks:
             status_icon = {"completed": "✅", "failed": "❌", "pending": "⬜"}.get(task.status, "?")
+            if task.status == "pending" and task.retry_after:
+                status_icon = "🔁"
             print(f"{status_icon} [{task.priority}] {task.title}")
 
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(description="Markdown task manager")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -371,10 +1282,21 @@ def main():
     next_parser.add_argument("--json", action="store_true", help="Output as JSON")
     next_parser.set_defaults(func=cmd_next)
 
+    # claim command
+    claim_parser = subparsers.add_parser("claim", help="Claim next task and journal the attempt")
+    claim_parser.add_argument("--file", required=True, help="Markdown file path")
+    claim_parser.add_argument("--task", help="Claim this task instead of the next one")
+    claim_parser.add_argument("--worker", help="Worker name for the journal (default: $FEATURE_PIPELINE_WORKER or hostname)")
+    claim_parser.add_argument("--journal", help="Journal path (default: <design>.journal.ndjson)")
+    claim_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    claim_parser.set_defaults(func=cmd_claim)
+
     # done command
     done_parser = subparsers.add_parser("done", help="Mark task as completed")
     done_parser.add_argument("--file", required=True, help="Markdown file path")
     done_parser.add_argument("--task", required=True, help="Task title")
+    done_parser.add_argument("--worker", help="Worker name for the journal (default: $FEATURE_PIPELINE_WORKER or hostname)")
+    done_parser.add_argument("--journal", help="Journal path (default: <design>.journal.ndjson)")
     done_parser.add_argument("--json", action="store_true", help="Output as JSON")
     done_parser.set_defaults(func=cmd_done)
 
@@ -383,6 +1305,8 @@ def main():
     fail_parser.add_argument("--file", required=True, help="Markdown file path")
     fail_parser.add_argument("--task", required=True, help="Task title")
     fail_parser.add_argument("--reason", default="", help="Failure reason")
+    fail_parser.add_argument("--worker", help="Worker name for the journal (default: $FEATURE_PIPELINE_WORKER or hostname)")
+    fail_parser.add_argument("--journal", help="Journal path (default: <design>.journal.ndjson)")
     fail_parser.add_argument("--json", action="store_true", help="Output as JSON")
     fail_parser.set_defaults(func=cmd_fail)
 
@@ -398,12 +1322,41 @@ def main():
     list_parser.add_argument("--json", action="store_true", help="Output as JSON")
     list_parser.set_defaults(func=cmd_list)
 
+    # watch command
+    watch_parser = subparsers.add_parser("watch", help="Stream task status changes as NDJSON")
+    watch_parser.add_argument("--file", required=True, help="Markdown file path")
+    watch_parser.add_argument("--poll", action="store_true", help="Poll instead of using inotify")
+    watch_parser.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds")
+    watch_parser.add_argument("--timeout", type=float, help="Stop after this many seconds")
+    watch_parser.set_defaults(func=cmd_watch)
+
+    # affected command
+    affected_parser = subparsers.add_parser("affected", help="Find tasks affected by changed files")
+    affected_parser.add_argument("--file", required=True, help="Markdown file path")
+    affected_parser.add_argument("--changed", nargs="+", help="Changed paths ('-' reads them from stdin)")
+    affected_parser.add_argument("--git", metavar="REV", help="Add files changed since REV (git diff --name-only)")
+    affected_parser.add_argument("--reset", action="store_true", help="Reset affected tasks to pending")
+    affected_parser.add_argument("--worker", help="Worker name for the journal (default: $FEATURE_PIPELINE_WORKER or hostname)")
+    affected_parser.add_argument("--journal", help="Journal path (default: <design>.journal.ndjson)")
+    affected_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    affected_parser.set_defaults(func=cmd_affected)
+
+    # history command
+    history_parser = subparsers.add_parser("history", help="Summarize the event journal")
+    history_parser.add_argument("--file", required=True, help="Markdown file path")
+    history_parser.add_argument("--journal", help="Journal path (default: <design>.journal.ndjson)")
+    history_parser.add_argument("--bucket", type=int, default=3600, help="Throughput bucket in seconds")
+    history_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    history_parser.set_defaults(func=cmd_history)
+
     args = parser.parse_args()
+    if getattr(args, "worker", "") is None:
+        args.worker = default_worker()
 
     try:
         args.func(args)
-    except FileNotFoundError:
-        print(f"Error: File not found: {args.file}", file=sys.stderr)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename or args.file}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
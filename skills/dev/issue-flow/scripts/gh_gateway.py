@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+gh gateway - batched, cached GitHub access for issue-flow
+
+Wraps `gh api` so an issue-flow run spends fewer round trips waiting on
+GitHub:
+
+    issue     Several issues (or PRs) with labels, assignees and comments in
+              one GraphQL query. Results are cached on disk and revalidated
+              with ETag conditional requests; a 304 carries no payload and
+              does not count against the rate limit.
+    comment   Find, create or update the comment carrying an issue-flow
+              marker (<!-- issue-flow-plan -->) in one step.
+    checks    Wait for CI like `gh pr checks --watch`, but poll check runs
+              with ETags and back off while nothing changes.
+
+Usage:
+    gh_gateway.py [--repo OWNER/REPO] [--max-age S] [--cache-dir DIR]
+                  [--record FILE | --replay FILE] [--stats]
+                  issue <N> [<N> ...]
+                  comment <N> --marker NAME [--body TEXT | --body-file FILE]
+                  checks <PR> [--timeout S] [--fail-fast] [--json]
+
+Examples:
+    gh_gateway.py issue 42                             # same JSON as gh issue view --json
+    gh_gateway.py issue 42 43 44                       # one GraphQL call for all three
+    gh_gateway.py comment 42 --marker issue-flow-plan  # print the plan comment, if any
+    gh_gateway.py comment 42 --marker issue-flow-plan --body-file plan.md
+    gh_gateway.py checks 57 --fail-fast --timeout 1800
+
+The repository defaults to $GH_REPO, then the origin remote. The cache
+lives in --cache-dir, else $ISSUE_FLOW_CACHE, else ~/.cache/issue-flow; entries younger
+than --max-age seconds are served without any request.
+
+--record FILE appends every exchange with GitHub to an NDJSON file.
+--replay FILE serves those exchanges instead of calling gh: repeated
+requests get the recorded responses in order, conditional requests get a
+304 when the ETag matches, and waits run on a virtual clock, so a whole
+CI wait replays instantly. A replay uses a throwaway cache unless
+--cache-dir is given, so recorded responses never reach the real cache
+and a stale real cache never hides the recorded requests.
+
+Exit codes of `checks` follow gh pr checks: 0 passed (or no checks),
+1 failed, 8 still pending at the timeout.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "issue-flow"
+DEFAULT_MAX_AGE = 60  # seconds an issue is served from cache without revalidation
+
+GRAPHQL_BATCH = 50  # issues per GraphQL query
+REVALIDATE_WORKERS = 8
+
+DEFAULT_CHECK_TIMEOUT = 1800
+MIN_POLL_INTERVAL = 5
+MAX_POLL_INTERVAL = 60
+POLL_BACKOFF = 1.5
+NO_CHECKS_GRACE = 60  # seconds to wait for CI to register any check
+RATE_LIMIT_RESERVE = 100  # spread polls out when fewer requests than this remain
+
+PENDING_EXIT_CODE = 8
+
+REMOTE_RE = re.compile(r"github\.com[:/]([^/]+)/([^/\s]+?)(?:\.git)?/?$")
+
+ISSUE_FIELDS = """
+    number title body state url updatedAt
+    labels(first: 100) { nodes { name } }
+    assignees(first: 100) { nodes { login } }
+    comments(last: 100) { nodes { id databaseId body createdAt author { login } } }
+"""
+
+FAILED_CONCLUSIONS = {"failure", "timed_out", "cancelled", "action_required", "startup_failure", "stale"}
+CHECK_ICONS = {"pass": "✅", "fail": "❌", "pending": "⏳", "skipping": "⏭️ "}
+
+Response = namedtuple("Response", "status headers body")
+
+
+class GhError(Exception):
+    """Raised when gh or the GitHub API reports an error."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================================
+# Transports
+# ============================================================
+
+def parse_included(output):
+    """Split `gh api --include` output into a Response."""
+    head, _, body = output.replace("\r\n", "\n").partition("\n\n")
+    lines = head.split("\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return Response(status, headers, body)
+
+
+class GhTransport:
+    """Sends each request through `gh api`."""
+
+    def request(self, method, path, fields=None, headers=None):
+        args = ["gh", "api", path, "--include", "--method", method]
+        for name, value in (headers or {}).items():
+            args += ["-H", f"{name}: {value}"]
+        for name, value in (fields or {}).items():
+            args += ["-f", f"{name}={value}"]
+        try:
+            proc = subprocess.run(args, capture_output=True, text=True)
+        except FileNotFoundError:
+            raise GhError("gh CLI not found. Install it from https://cli.github.com")
+        # gh exits non-zero on HTTP errors but still prints the response
+        if not proc.stdout.startswith("HTTP/"):
+            raise GhError(proc.stderr.strip() or f"gh api {path} failed")
+        return parse_included(proc.stdout)
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class RecordingTransport:
+    """Passes requests to another transport and appends each exchange to an NDJSON file."""
+
+    def __init__(self, inner, path, repo):
+        self.inner = inner
+        self.path = Path(path)
+        self.repo = repo
+        self._lock = threading.Lock()
+        self.time, self.sleep = inner.time, inner.sleep
+
+    def request(self, method, path, fields=None, headers=None):
+        response = self.inner.request(method, path, fields, headers)
+        record = {
+            "repo": self.repo,
+            "request": {"method": method, "path": path, "fields": fields or {}},
+            "response": response._asdict(),
+        }
+        # A 304 only makes sense for the request that sent If-None-Match;
+        # replay derives those from the recorded ETags instead
+        if response.status != 304:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return response
+
+
+class ReplayTransport:
+    """
+    Offline stand-in for GitHub that serves recorded exchanges.
+
+    Responses to the same request are served in recorded order, the last
+    one repeating. Conditional requests whose If-None-Match equals the
+    ETag of the response about to be served get a 304, as GitHub would.
+    """
+
+    def __init__(self, path):
+        self.responses = {}
+        self.repo = None
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self.repo = self.repo or record.get("repo")
+                request = record["request"]
+                key = self._key(request["method"], request["path"], request.get("fields"))
+                self.responses.setdefault(key, deque()).append(Response(**record["response"]))
+        self.now = time.time()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(method, path, fields):
+        return method, path, json.dumps(fields or {}, sort_keys=True)
+
+    def request(self, method, path, fields=None, headers=None):
+        with self._lock:
+            queue = self.responses.get(self._key(method, path, fields))
+            if not queue:
+                raise GhError(f"No recorded response for {method} {path}", 404)
+            response = queue.popleft() if len(queue) > 1 else queue[0]
+        etag = response.headers.get("etag")
+        if etag and (headers or {}).get("If-None-Match") == etag:
+            return Response(304, {"etag": etag}, "")
+        return response
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+# ============================================================
+# Gateway
+# ============================================================
+
+def resolve_repo(repo=None):
+    """OWNER/REPO from the argument, $GH_REPO, the origin remote, or gh."""
+    repo = repo or os.environ.get("GH_REPO")
+    if not repo:
+        proc = subprocess.run(["git", "remote", "get-url", "origin"], capture_output=True, text=True)
+        match = REMOTE_RE.search(proc.stdout.strip())
+        if match:
+            repo = f"{match.group(1)}/{match.group(2)}"
+    if not repo:
+        proc = subprocess.run(["gh", "repo", "view", "--json", "nameWithOwner", "-q", ".nameWithOwner"],
+                              capture_output=True, text=True)
+        repo = proc.stdout.strip()
+    if repo.count("/") != 1:
+        raise GhError("Could not determine the repository; pass --repo OWNER/REPO")
+    return repo
+
+
+class Gateway:
+    """Batched and cached access to one repository."""
+
+    def __init__(self, repo, transport=None, cache_dir=None, max_age=DEFAULT_MAX_AGE):
+        self.repo = repo
+        self.owner, self.name = repo.split("/")
+        self.transport = transport or GhTransport()
+        cache_root = Path(cache_dir or os.environ.get("ISSUE_FLOW_CACHE") or DEFAULT_CACHE_DIR)
+        self.cache_dir = cache_root / repo.replace("/", "__")
+        self.max_age = max_age
+        self.stats = Counter()
+        self.rate_limit = None  # (remaining, reset epoch) from the latest response
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # --- requests ---
+
+    def request(self, method, path, fields=None, headers=None):
+        path = path.replace("{owner}", self.owner).replace("{repo}", self.name)
+        self._count("requests")
+        response = self.transport.request(method, path, fields, headers)
+        if "x-ratelimit-remaining" in response.headers:
+            self.rate_limit = (int(response.headers["x-ratelimit-remaining"]),
+                               int(response.headers.get("x-ratelimit-reset", 0)))
+        if response.status == 304:
+            self._count("not_modified")
+        elif response.status >= 400:
+            try:
+                message = json.loads(response.body).get("message", response.body)
+            except ValueError:
+                message = response.body
+            raise GhError(f"{method} {path}: HTTP {response.status} {message}".strip(), response.status)
+        return response
+
+    def graphql(self, query, **variables):
+        self._count("graphql")
+        response = self.request("POST", "graphql", {"query": query, **variables})
+        data = json.loads(response.body)
+        if data.get("errors") and not data.get("data"):
+            raise GhError("; ".join(e.get("message", "") for e in data["errors"]))
+        return data["data"]
+
+    # --- disk cache ---
+
+    def _cache_file(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def _load(self, key):
+        try:
+            return json.loads(self._cache_file(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key, entry):
+        path = self._cache_file(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _invalidate(self, key):
+        try:
+            self._cache_file(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def get_json(self, path):
+        """GET a REST path, revalidating the cached copy with its ETag."""
+        key = f"GET {path}"
+        entry = self._load(key)
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else None
+        response = self.request("GET", path, headers=headers)
+        if response.status == 304:
+            return entry["body"], False
+        body = json.loads(response.body)
+        if response.headers.get("etag"):
+            self._store(key, {"etag": response.headers["etag"], "body": body})
+        return body, True
+
+    # --- issues ---
+
+    def issues(self, numbers):
+        """
+        Issues (or PRs) in `gh issue view --json` shape, with comments.
+
+        Fresh cache entries cost nothing; stale ones are revalidated with
+        concurrent conditional requests; everything changed or missing is
+        fetched in a single GraphQL query per 50 issues.
+        """
+        numbers = [int(n) for n in numbers]
+        now = self.transport.time()
+        entries = {n: self._load(f"issue:{n}") for n in set(numbers)}
+
+        stale = [n for n, e in entries.items() if e and now - e["fetched"] > self.max_age]
+        missing = [n for n, e in entries.items() if not e]
+        self.stats["cache_hits"] += len(entries) - len(stale) - len(missing)
+
+        etags = {}
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(REVALIDATE_WORKERS, len(stale))) as executor:
+                results = list(executor.map(lambda n: self._revalidate(n, entries[n]), stale))
+            for n, (fresh, etag) in zip(stale, results):
+                etags[n] = etag
+                if fresh:
+                    entries[n].update(fetched=now, etag=etag)
+                    self._store(f"issue:{n}", entries[n])
+                else:
+                    missing.append(n)
+
+        for start in range(0, len(missing), GRAPHQL_BATCH):
+            for n, issue in self._fetch_issues(missing[start:start + GRAPHQL_BATCH]).items():
+                entries[n] = {"issue": issue, "updatedAt": issue["updatedAt"], "etag": etags.get(n), "fetched": now}
+                self._store(f"issue:{n}", entries[n])
+        return [entries[n]["issue"] for n in numbers]
+
+    def _revalidate(self, number, entry):
+        """(still fresh, current ETag) for a cached issue."""
+        headers = {"If-None-Match": entry["etag"]} if entry.get("etag") else None
+        response = self.request("GET", f"repos/{{owner}}/{{repo}}/issues/{number}", headers=headers)
+        etag = response.headers.get("etag", entry.get("etag"))
+        if response.status == 304:
+            return True, etag
+        # First revalidation of a GraphQL result: adopt the ETag if nothing changed
+        return json.loads(response.body).get("updated_at") == entry["updatedAt"], etag
+
+    def _fetch_issues(self, numbers):
+        aliases = " ".join(
+            f"i{n}: issueOrPullRequest(number: {n}) {{ ... on Issue {{ {ISSUE_FIELDS} }} "
+            f"... on PullRequest {{ {ISSUE_FIELDS} }} }}"
+            for n in numbers
+        )
+        query = ("query($owner: String!, $name: String!) { "
+                 f"repository(owner: $owner, name: $name) {{ {aliases} }} }}")
+        repository = self.graphql(query, owner=self.owner, name=self.name)["repository"]
+        issues = {}
+        for n in numbers:
+            node = repository.get(f"i{n}")
+            if not node:
+                raise GhError(f"Issue #{n} not found in {self.repo}", 404)
+            issues[n] = {
+                **{k: v for k, v in node.items() if k not in ("labels", "assignees", "comments")},
+                "labels": node["labels"]["nodes"],
+                "assignees": node["assignees"]["nodes"],
+                "comments": node["comments"]["nodes"],
+            }
+        return issues
+
+    # --- marker comments ---
+
+    def find_comment(self, number, marker):
+        """Latest comment on an issue containing <!-- marker -->, or None."""
+        tag = f"<!-- {marker} -->"
+        comments = self.issues([number])[0]["comments"]
+        return next((c for c in reversed(comments) if tag in c["body"]), None)
+
+    def upsert_comment(self, number, marker, body):
+        """
+        Create or update the marker comment on an issue.
+
+        Returns:
+            ("created" | "updated" | "unchanged", comment JSON)
+        """
+        tag = f"<!-- {marker} -->"
+        if tag not in body:
+            body = f"{tag}\n{body}"
+        existing = self.find_comment(number, marker)
+        if existing and existing["body"] == body:
+            return "unchanged", existing
+        if existing:
+            path = f"repos/{{owner}}/{{repo}}/issues/comments/{existing['databaseId']}"
+            action, response = "updated", self.request("PATCH", path, {"body": body})
+        else:
+            path = f"repos/{{owner}}/{{repo}}/issues/{number}/comments"
+            action, response = "created", self.request("POST", path, {"body": body})
+        self._invalidate(f"issue:{number}")
+        return action, json.loads(response.body)
+
+    # --- CI checks ---
+
+    def checks(self, sha):
+        """Check runs and commit statuses of a commit as (checks, changed)."""
+        runs, runs_changed = self.get_json(f"repos/{{owner}}/{{repo}}/commits/{sha}/check-runs?per_page=100")
+        status, status_changed = self.get_json(f"repos/{{owner}}/{{repo}}/commits/{sha}/status")
+        checks = []
+        for run in runs.get("check_runs", []):
+            if run["status"] != "completed":
+                bucket = "pending"
+            elif run["conclusion"] == "skipped":
+                bucket = "skipping"
+            else:
+                bucket = "fail" if run["conclusion"] in FAILED_CONCLUSIONS else "pass"
+            checks.append({"name": run["name"], "bucket": bucket, "link": run.get("html_url")})
+        for item in status.get("statuses", []):
+            bucket = {"success": "pass", "pending": "pending"}.get(item["state"], "fail")
+            checks.append({"name": item["context"], "bucket": bucket, "link": item.get("target_url")})
+        return checks, runs_changed or status_changed
+
+    def rate_limit_delay(self):
+        """Seconds between polls that keep the remaining quota until the reset."""
+        if not self.rate_limit or self.rate_limit[0] >= RATE_LIMIT_RESERVE:
+            return 0
+        remaining, reset = self.rate_limit
+        return max(reset - self.transport.time(), 0) / max(remaining, 1)
+
+    def wait_checks(self, pr, timeout=DEFAULT_CHECK_TIMEOUT, fail_fast=False):
+        """
+        Poll a PR's CI until it finishes, fails (with fail_fast) or times out.
+
+        The poll interval starts at MIN_POLL_INTERVAL, grows by POLL_BACKOFF
+        each time nothing changed (both conditional requests came back 304)
+        up to MAX_POLL_INTERVAL, and resets when any check moves.
+
+        Returns:
+            Dict with state ("pass" | "fail" | "pending" | "none"), checks,
+            head sha, polls and elapsed seconds
+        """
+        start = self.transport.time()
+        pull, _ = self.get_json(f"repos/{{owner}}/{{repo}}/pulls/{pr}")
+        sha = pull["head"]["sha"]
+        interval = MIN_POLL_INTERVAL
+        polls = 0
+        while True:
+            checks, changed = self.checks(sha)
+            polls += 1
+            elapsed = self.transport.time() - start
+            buckets = {c["bucket"] for c in checks}
+            if "fail" in buckets and (fail_fast or "pending" not in buckets):
+                state = "fail"
+            elif checks and "pending" not in buckets:
+                state = "pass"
+            elif not checks and elapsed >= NO_CHECKS_GRACE:
+                state = "none"
+            elif elapsed >= timeout:
+                state = "pending"
+            else:
+                interval = MIN_POLL_INTERVAL if changed else min(interval * POLL_BACKOFF, MAX_POLL_INTERVAL)
+                self.transport.sleep(min(max(interval, self.rate_limit_delay()), timeout - elapsed))
+                continue
+            return {"pr": int(pr), "sha": sha, "state": state, "checks": checks,
+                    "polls": polls, "elapsed": round(elapsed, 1)}
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def print_stats(gateway):
+    stats = gateway.stats
+    print(f"gh: {stats['requests']} request(s), {stats['not_modified']} not modified, "
+          f"{stats['graphql']} GraphQL batch(es), {stats['cache_hits']} cache hit(s)", file=sys.stderr)
+
+
+def cmd_issue(gateway, args):
+    issues = gateway.issues(args.numbers)
+    print(json.dumps(issues[0] if len(issues) == 1 else issues, indent=2, ensure_ascii=False))
+    return 0
+
+
+def cmd_comment(gateway, args):
+    if args.body_file:
+        body = Path(args.body_file).read_text(encoding="utf-8")
+    else:
+        body = args.body
+    if body is None:
+        comment = gateway.find_comment(args.number, args.marker)
+        if not comment:
+            print(f"No comment with marker '{args.marker}' on #{args.number}", file=sys.stderr)
+            return 1
+        print(json.dumps(comment, indent=2, ensure_ascii=False))
+        return 0
+    action, comment = gateway.upsert_comment(args.number, args.marker, body)
+    print(f"✅ Comment {action}: {comment.get('html_url') or comment.get('databaseId')}")
+    return 0
+
+
+def cmd_checks(gateway, args):
+    result = gateway.wait_checks(args.pr, args.timeout, args.fail_fast)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for check in result["checks"]:
+            print(f"{CHECK_ICONS[check['bucket']]} {check['name']}")
+        summary = {
+            "pass": "✅ All checks passed",
+            "fail": "❌ Some checks failed",
+            "pending": f"⏳ Checks still pending after {args.timeout}s",
+            "none": "No checks reported on this PR",
+        }[result["state"]]
+        print(f"\n{summary} ({result['polls']} polls, {result['elapsed']}s)")
+    return {"fail": 1, "pending": PENDING_EXIT_CODE}.get(result["state"], 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched, cached gh access for issue-flow")
+    parser.add_argument("--repo", help="OWNER/REPO (default: $GH_REPO or the origin remote)")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE,
+                        help=f"Serve cached issues younger than this without a request (default: {DEFAULT_MAX_AGE}s)")
+    parser.add_argument("--cache-dir", help="Cache directory (default: $ISSUE_FLOW_CACHE or ~/.cache/issue-flow; "
+                                            "a temporary directory with --replay)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", help="Append every GitHub exchange to this NDJSON file")
+    mode.add_argument("--replay", help="Serve recorded exchanges instead of calling gh")
+    parser.add_argument("--stats", action="store_true", help="Print request counts to stderr")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    issue_parser = subparsers.add_parser("issue", help="Issues with comments, as JSON")
+    issue_parser.add_argument("numbers", nargs="+", type=int, help="Issue or PR numbers")
+
+    comment_parser = subparsers.add_parser("comment", help="Find or upsert a marker comment")
+    comment_parser.add_argument("number", type=int, help="Issue or PR number")
+    comment_parser.add_argument("--marker", required=True, help="Marker name, e.g. issue-flow-plan")
+    body_group = comment_parser.add_mutually_exclusive_group()
+    body_group.add_argument("--body", help="Comment body (omit to print the existing comment)")
+    body_group.add_argument("--body-file", help="Read the comment body from a file")
+
+    checks_parser = subparsers.add_parser("checks", help="Wait for PR checks")
+    checks_parser.add_argument("pr", type=int, help="PR number")
+    checks_parser.add_argument("--timeout", type=float, default=DEFAULT_CHECK_TIMEOUT, help="Seconds to wait")
+    checks_parser.add_argument("--fail-fast", action="store_true", help="Stop at the first failed check")
+    checks_parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    commands = {"issue": cmd_issue, "comment": cmd_comment, "checks": cmd_checks}
+    scratch = None
+    try:
+        cache_dir = args.cache_dir
+        if args.replay:
+            transport = ReplayTransport(args.replay)
+            repo = args.repo or transport.repo or resolve_repo()
+            if not cache_dir:
+                scratch = tempfile.TemporaryDirectory(prefix="issue-flow-replay-")
+                cache_dir = scratch.name
+        else:
+            repo = resolve_repo(args.repo)
+            transport = RecordingTransport(GhTransport(), args.record, repo) if args.record else GhTransport()
+        gateway = Gateway(repo, transport, cache_dir=cache_dir, max_age=args.max_age)
+        code = commands[args.command](gateway, args)
+    except GhError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError as e:
+        print(f"❌ Error: File not found: {e.filename}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if scratch:
+            scratch.cleanup()
+    if args.stats:
+        print_stats(gateway)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
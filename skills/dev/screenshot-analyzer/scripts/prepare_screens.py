@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Screenshot preprocessing for screenshot-analyzer
+
+Runs once before the analyzer agents so that all three of them read the
+same small set of images:
+
+    dedupe     near-identical screens (perceptual hash within --threshold
+               bits) are dropped; the highest-resolution copy is kept
+    downscale  images are reduced to what vision models read anyway
+               (long edge <= 1568px, about 1.15 megapixels)
+    tile       very tall scrolling captures are cut into overlapping
+               viewport-sized tiles instead of one unreadable strip
+
+Usage:
+    prepare_screens.py <image|dir> [<image|dir> ...] [--out <dir>]
+                       [--threshold 10] [--max-edge 1568] [--max-pixels 1150000]
+                       [--tall-ratio 2.5] [--format png|jpeg|webp] [--jobs N] [--json]
+
+Examples:
+    prepare_screens.py screenshots/
+    prepare_screens.py shots/*.png --out /tmp/screens --format jpeg
+    prepare_screens.py shots/ --threshold 0            # exact-duplicate matching only
+
+Writes the processed images and manifest.json to --out (default:
+screenshots-prepared). Each manifest screen lists its source, tiles and
+the duplicates it stands for; pass the tile paths to the agents. Files
+that cannot be read are listed under "errors" instead of stopping the run.
+
+Library usage:
+    from prepare_screens import prepare_screens
+
+    manifest = prepare_screens(["screenshots/"], "screenshots-prepared")
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    raise ImportError("Please install Pillow: pip install Pillow")
+
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp"}
+
+# dHash over a 16x16 grid: UI screens of one product share chrome and
+# whitespace, so 64-bit hashes would merge genuinely different screens
+HASH_SIZE = 16
+HASH_BITS = HASH_SIZE * HASH_SIZE
+DEFAULT_THRESHOLD = 10
+ASPECT_TOLERANCE = 0.05
+
+# Vision models downscale beyond these anyway
+DEFAULT_MAX_EDGE = 1568
+DEFAULT_MAX_PIXELS = 1_150_000
+DEFAULT_TALL_RATIO = 2.5
+TILE_RATIO = 2.0  # tile height / width
+TILE_OVERLAP = 0.1
+
+FORMAT_SETTINGS = {
+    "png": {"format": "PNG", "compress_level": 6},
+    "jpeg": {"format": "JPEG", "quality": 85, "optimize": True},
+    "webp": {"format": "WEBP", "quality": 85, "method": 4},
+}
+EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+# Corrupt, truncated or oversized images fail one file, not the run
+IMAGE_ERRORS = (OSError, ValueError, SyntaxError, Image.DecompressionBombError)
+
+
+def collect_images(paths):
+    """Expand files and directories to a sorted list of image paths."""
+    images = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            images.extend(p for p in sorted(path.rglob("*")) if p.suffix.lower() in IMAGE_EXTENSIONS)
+        elif path.exists():
+            images.append(path)
+        else:
+            raise FileNotFoundError(2, "No such file", str(path))
+    # The same file given twice (e.g. a file and its directory) is one input
+    return list(dict.fromkeys(images))
+
+
+def dhash(img):
+    """Difference hash of an image as an int of HASH_BITS bits."""
+    # reduce() only handles the common modes; palette, bilevel and
+    # 32-bit images go to grayscale first
+    if img.mode not in ("L", "RGB", "RGBA"):
+        img = img.convert("L")
+    factor = min(img.width // (HASH_SIZE + 1), img.height // HASH_SIZE) // 4
+    if factor > 1:
+        img = img.reduce(factor)
+    small = img.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return value
+
+
+def _chunks(value, count):
+    """Split a hash into `count` bit ranges, tagged with their position."""
+    width = math.ceil(HASH_BITS / count)
+    mask = (1 << width) - 1
+    return [(i, (value >> (i * width)) & mask) for i in range(count)]
+
+
+def find_duplicates(hashes, sizes, threshold):
+    """
+    Group near-duplicate images.
+
+    Two hashes within `threshold` bits agree exactly on at least one of
+    threshold + 1 chunks (pigeonhole), so candidates come from chunk
+    buckets instead of comparing every pair.
+
+    Args:
+        hashes: List of ints from dhash()
+        sizes: List of (width, height); screens must have similar aspect ratios
+        threshold: Maximum Hamming distance for a duplicate
+
+    Returns:
+        List of groups (lists of indices); the first index of each group is
+        the image to keep
+    """
+    parent = list(range(len(hashes)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for i, value in enumerate(hashes):
+        aspect = sizes[i][1] / sizes[i][0]
+        for chunk in _chunks(value, threshold + 1):
+            for j in buckets.get(chunk, ()):
+                if (root(i) != root(j)
+                        and bin(value ^ hashes[j]).count("1") <= threshold
+                        and abs(aspect - sizes[j][1] / sizes[j][0]) <= ASPECT_TOLERANCE * aspect):
+                    parent[root(i)] = root(j)
+            buckets.setdefault(chunk, []).append(i)
+
+    groups = {}
+    for i in range(len(hashes)):
+        groups.setdefault(root(i), []).append(i)
+    # Keep the largest capture, then the first in input order
+    return sorted(
+        (sorted(members, key=lambda i: (-sizes[i][0] * sizes[i][1], i)) for members in groups.values()),
+        key=lambda group: min(group),
+    )
+
+
+def plan_tiles(size, max_edge, max_pixels, tall_ratio):
+    """
+    Output scale and source row ranges for one screen.
+
+    Returns:
+        (scale, [(top, bottom), ...]) in source pixels
+    """
+    width, height = size
+    if height / width <= tall_ratio:
+        scale = min(1.0, max_edge / max(width, height), math.sqrt(max_pixels / (width * height)))
+        return scale, [(0, height)]
+
+    # Tall capture: size tiles of TILE_RATIO, then step through with overlap
+    tile_width = min(width, max_edge / TILE_RATIO, math.sqrt(max_pixels / TILE_RATIO))
+    scale = min(1.0, tile_width / width)
+    tile_height = round(width * TILE_RATIO)
+    step = round(tile_height * (1 - TILE_OVERLAP))
+    tiles = []
+    top = 0
+    while True:
+        bottom = min(top + tile_height, height)
+        tiles.append((max(bottom - tile_height, 0), bottom))
+        if bottom == height:
+            return scale, tiles
+        top += step
+
+
+def render(img, scale, tiles, stem, out_dir, fmt):
+    """Write the tiles of one screen; returns tile entries for the manifest."""
+    entries = []
+    width = img.width
+    for index, (top, bottom) in enumerate(tiles):
+        size = (max(1, round(width * scale)), max(1, round((bottom - top) * scale)))
+        tile = img.resize(size, Image.LANCZOS, box=(0, top, width, bottom), reducing_gap=3.0)
+        if fmt == "jpeg" and tile.mode not in ("RGB", "L"):
+            tile = tile.convert("RGB")
+        suffix = f"-t{index + 1}" if len(tiles) > 1 else ""
+        path = out_dir / f"{stem}{suffix}{EXTENSIONS[fmt]}"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tile.save(tmp_path, **FORMAT_SETTINGS[fmt])
+        os.replace(tmp_path, path)
+        entries.append({"path": str(path), "size": list(size), "rows": [top, bottom]})
+    return entries
+
+
+def _load(path):
+    img = Image.open(path)
+    img.load()
+    if img.mode not in ("RGB", "RGBA", "L"):
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+    return img
+
+
+def prepare_screens(paths, out_dir="screenshots-prepared", threshold=DEFAULT_THRESHOLD,
+                    max_edge=DEFAULT_MAX_EDGE, max_pixels=DEFAULT_MAX_PIXELS,
+                    tall_ratio=DEFAULT_TALL_RATIO, fmt="png", jobs=None):
+    """
+    Dedupe, downscale and tile screenshots; write them and manifest.json.
+
+    Returns:
+        The manifest dict
+    """
+    if fmt not in FORMAT_SETTINGS:
+        raise ValueError(f"Unsupported format '{fmt}'. Use one of: {', '.join(FORMAT_SETTINGS)}")
+    if threshold < 0 or threshold >= HASH_BITS:
+        raise ValueError(f"threshold must be between 0 and {HASH_BITS - 1}")
+    start = time.perf_counter()
+    sources = collect_images(paths)
+    inputs = len(sources)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Hash pass: open headers and small thumbnails only
+    def fingerprint(path):
+        try:
+            with Image.open(path) as img:
+                size = img.size
+                img.draft("RGB", (img.width // 8 or 1, img.height // 8 or 1))
+                return size, dhash(img), None
+        except IMAGE_ERRORS as e:
+            return None, None, {"source": str(path), "error": str(e) or type(e).__name__}
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        fingerprints = list(executor.map(fingerprint, sources))
+        errors = [error for _, _, error in fingerprints if error]
+        sources = [path for path, (_, _, error) in zip(sources, fingerprints) if not error]
+        sizes = [size for size, _, error in fingerprints if not error]
+        hashes = [value for _, value, error in fingerprints if not error]
+        groups = find_duplicates(hashes, sizes, threshold)
+
+        def process(numbered):
+            number, group = numbered
+            keep = group[0]
+            source = sources[keep]
+            scale, rows = plan_tiles(sizes[keep], max_edge, max_pixels, tall_ratio)
+            try:
+                tiles = render(_load(source), scale, rows, f"s{number:03d}-{source.stem}", out_dir, fmt)
+            except IMAGE_ERRORS as e:
+                return {"source": str(source), "error": str(e) or type(e).__name__}
+            return {
+                "id": f"s{number:03d}",
+                "source": str(source),
+                "size": list(sizes[keep]),
+                "hash": f"{hashes[keep]:0{HASH_BITS // 4}x}",
+                "tiles": tiles,
+                "duplicates": [str(sources[i]) for i in group[1:]],
+            }
+
+        screens = []
+        for result in executor.map(process, enumerate(groups, 1)):
+            (errors if "error" in result else screens).append(result)
+
+    source_pixels = sum(w * h for w, h in sizes)
+    output_pixels = sum(t["size"][0] * t["size"][1] for s in screens for t in s["tiles"])
+    manifest = {
+        "settings": {"threshold": threshold, "max_edge": max_edge, "max_pixels": max_pixels,
+                     "tall_ratio": tall_ratio, "format": fmt},
+        "screens": screens,
+        "errors": errors,
+        "stats": {
+            "inputs": inputs,
+            "unique": len(screens),
+            "duplicates": sum(len(s["duplicates"]) for s in screens),
+            "errors": len(errors),
+            "images": sum(len(s["tiles"]) for s in screens),
+            "source_pixels": source_pixels,
+            "output_pixels": output_pixels,
+            "pixel_ratio": round(output_pixels / source_pixels, 4) if source_pixels else None,
+            "elapsed": round(time.perf_counter() - start, 3),
+        },
+    }
+    manifest_path = out_dir / "manifest.json"
+    tmp_path = manifest_path.with_name(".manifest.json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dedupe, downscale and tile screenshots before analysis")
+    parser.add_argument("paths", nargs="+", help="Screenshot files or directories")
+    parser.add_argument("--out", default="screenshots-prepared", help="Output directory")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help=f"Max differing hash bits (of {HASH_BITS}) for a duplicate (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--max-edge", type=int, default=DEFAULT_MAX_EDGE, help="Longest output edge in pixels")
+    parser.add_argument("--max-pixels", type=int, default=DEFAULT_MAX_PIXELS, help="Pixels per output image")
+    parser.add_argument("--tall-ratio", type=float, default=DEFAULT_TALL_RATIO,
+                        help="Height/width ratio above which captures are tiled")
+    parser.add_argument("--format", default="png", choices=list(FORMAT_SETTINGS), help="Output format")
+    parser.add_argument("--jobs", type=int, help="Worker threads (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="Print the manifest as JSON")
+    args = parser.parse_args()
+
+    try:
+        manifest = prepare_screens(args.paths, args.out, args.threshold, args.max_edge,
+                                   args.max_pixels, args.tall_ratio, args.format, args.jobs)
+    except FileNotFoundError as e:
+        print(f"❌ Error: File not found: {e.filename}", file=sys.stderr)
+        sys.exit(1)
+    except (ValueError, OSError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(manifest, indent=2, ensure_ascii=False))
+        return
+    for screen in manifest["screens"]:
+        tiles = len(screen["tiles"])
+        extra = f", {tiles} tiles" if tiles > 1 else ""
+        dupes = f", {len(screen['duplicates'])} duplicate(s)" if screen["duplicates"] else ""
+        print(f"✅ {screen['id']} {screen['source']}{extra}{dupes}")
+    for error in manifest["errors"]:
+        print(f"❌ {error['source']}: {error['error']}")
+    stats = manifest["stats"]
+    ratio = f"{stats['pixel_ratio']:.1%}" if stats["pixel_ratio"] is not None else "n/a"
+    failed = f", {stats['errors']} unreadable" if stats["errors"] else ""
+    print(f"\n{stats['inputs']} screenshots -> {stats['unique']} unique, {stats['images']} images "
+          f"({ratio} of the source pixels){failed} in {stats['elapsed']}s")
+    print(f"Manifest: {Path(args.out) / 'manifest.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Batch cover generation across style presets, palettes and renderings
+
+Expands a style-preset x palette x rendering grid into prompts built from
+the cover-image references, drops duplicate prompts, serves previously
+generated covers from a content-addressed cache, and submits the rest to
+Qwen-Image concurrently under a quota-aware rate limiter. Ten variants
+take roughly the wall time of one.
+
+Usage:
+    batch_covers.py --title "<title>" --out <dir> [--summary "<text>"]
+                    [--styles a,b|all] [--palettes a,b|all] [--renderings a,b|all]
+                    [--size 1664*928] [--concurrency 8] [--rate 2] [--cache <dir>]
+                    [--max N] [--dry-run]
+
+Examples:
+    # Every palette for one preset
+    batch_covers.py --title "深入理解 Rust 所有权" --styles tech-dark --palettes all --out covers/
+
+    # Explicit grid without presets
+    batch_covers.py --title "Weekly Notes" --palettes warm,cool --renderings flat-vector,painterly --out covers/
+
+Without --styles, type/mood/font come from --type/--mood/--font. With
+--styles, each preset supplies its own palette and rendering unless
+--palettes/--renderings are given, in which case those override it.
+
+The cache lives in $COVER_IMAGE_CACHE (default ~/.cache/cover-image).
+Entries are keyed by SHA-256 of model, size and prompt. A batch.json
+manifest in the output directory records every variant, its prompt key
+and whether it came from the cache.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import re
+import shutil
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from qwen_image import DEFAULT_MODEL, DEFAULT_SIZE, SUPPORTED_SIZES, QwenImageClient, RateLimiter
+
+REFERENCES_DIR = Path(__file__).resolve().parent.parent / "references"
+DEFAULT_CACHE_DIR = Path(os.environ.get("COVER_IMAGE_CACHE", "~/.cache/cover-image")).expanduser()
+
+DEFAULTS = {"type": "conceptual", "mood": "balanced", "font": "clean"}
+
+# Prompt fragments, from references/workflow/prompt-template.md
+MOOD_APPLICATION = {
+    "subtle": "Use low contrast, muted colors, light visual weight, calm aesthetic",
+    "balanced": "Use medium contrast, normal saturation, balanced visual weight",
+    "bold": "Use high contrast, vivid saturated colors, heavy visual weight, dynamic energy",
+}
+FONT_APPLICATION = {
+    "clean": "Use clean geometric sans-serif typography. Modern, minimal letterforms.",
+    "handwritten": "Use warm hand-lettered typography with organic brush strokes. Friendly, personal feel.",
+    "serif": "Use elegant serif typography with refined letterforms. Classic, editorial character.",
+    "display": "Use bold decorative display typography. Heavy, expressive headlines.",
+}
+TYPE_COMPOSITION = {
+    "hero": "Large focal visual (60-70% area), title overlay on visual, dramatic composition",
+    "conceptual": "Abstract shapes representing core concepts, information hierarchy, clean zones",
+    "typography": "Title as primary element (40%+ area), minimal supporting visuals, strong hierarchy",
+    "metaphor": "Concrete object/scene representing abstract idea, symbolic elements, emotional resonance",
+    "scene": "Atmospheric environment, narrative elements, mood-setting lighting and colors",
+    "minimal": "Single focal element, generous whitespace (60%+), essential shapes only",
+}
+
+
+# ============================================================
+# Reference parsing
+# ============================================================
+
+def _bullets(section):
+    return [line[2:].strip() for line in section.splitlines() if line.startswith("- ")]
+
+
+def _section(text, heading):
+    """Return the body of a '## heading' section."""
+    match = re.search(rf"^## {re.escape(heading)}\s*$(.*?)(?=^## |\Z)", text, re.MULTILINE | re.DOTALL)
+    return match.group(1) if match else ""
+
+
+@lru_cache(maxsize=None)
+def load_style_presets():
+    """Parse style presets: name -> {type, palette, rendering, mood, font, hints}."""
+    text = (REFERENCES_DIR / "style-presets.md").read_text(encoding="utf-8")
+    presets = {}
+    for match in re.finditer(r"^### ([\w-]+)\s*$(.*?)(?=^##|\Z)", text, re.MULTILINE | re.DOTALL):
+        name, body = match.groups()
+        block = re.search(r"```yaml\n(.*?)```", body, re.DOTALL)
+        if not block:
+            continue
+        preset = dict(re.findall(r"^(\w+):\s*(\S+)\s*$", block.group(1), re.MULTILINE))
+        hints = body.split("**Prompt hints**", 1)
+        preset["hints"] = _bullets(hints[1]) if len(hints) > 1 else []
+        presets[name] = preset
+    return presets
+
+
+@lru_cache(maxsize=None)
+def load_palette(name):
+    """Parse a palette: {summary, colors: [(role, name, hex)], decorative}."""
+    path = REFERENCES_DIR / "palettes" / f"{name}.md"
+    text = path.read_text(encoding="utf-8")
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    colors = re.findall(r"^\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*(#[0-9A-Fa-f]{3,8})\s*\|", text, re.MULTILINE)
+    return {
+        "summary": lines[1] if len(lines) > 1 else "",
+        "colors": colors,
+        "decorative": _bullets(_section(text, "Decorative Hints")),
+    }
+
+
+@lru_cache(maxsize=None)
+def load_rendering(name):
+    """Parse a rendering: {summary, characteristics}."""
+    text = (REFERENCES_DIR / "renderings" / f"{name}.md").read_text(encoding="utf-8")
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return {
+        "summary": lines[1] if len(lines) > 1 else "",
+        "characteristics": " ".join(_section(text, "Core Characteristics").split()),
+    }
+
+
+def available(kind):
+    """Names available for 'palettes' or 'renderings'."""
+    return sorted(p.stem for p in (REFERENCES_DIR / kind).glob("*.md"))
+
+
+# ============================================================
+# Grid expansion and prompts
+# ============================================================
+
+def build_prompt(title, summary, variant):
+    """Render the prompt of one variant, following prompt-template.md."""
+    palette = load_palette(variant["palette"])
+    rendering = load_rendering(variant["rendering"])
+    colors = ", ".join(f"{role} {hex_}" for role, _, hex_ in palette["colors"])
+
+    lines = [
+        "# Content Context",
+        f"Article title: {title}",
+    ]
+    if summary:
+        lines.append(f"Content summary: {summary}")
+    lines += [
+        "",
+        "# Visual Design",
+        f"Type: {variant['type']}",
+        f"Palette: {variant['palette']} - {palette['summary']}",
+        f"Rendering: {variant['rendering']} - {rendering['summary']}",
+        f"Font: {variant['font']}",
+        f"Mood: {variant['mood']}",
+        "",
+        "# Text Elements",
+        f"Title: {title}",
+        "",
+        "# Mood Application",
+        MOOD_APPLICATION.get(variant["mood"], ""),
+        "",
+        "# Font Application",
+        FONT_APPLICATION.get(variant["font"], ""),
+        "",
+        "# Composition",
+        f"Type composition: {TYPE_COMPOSITION.get(variant['type'], '')}",
+        f"Decorative: {'; '.join(palette['decorative'])}",
+        f"Color scheme: {colors}",
+        f"Rendering notes: {rendering['characteristics']}",
+    ]
+    if variant.get("hints"):
+        lines.append(f"Style hints: {'; '.join(variant['hints'])}")
+    return "\n".join(lines)
+
+
+def expand_grid(styles, palettes, renderings, overrides):
+    """
+    Expand the grid into variant dicts.
+
+    Args:
+        styles: Preset names, or [] to build variants from overrides alone
+        palettes, renderings: Names, or [] to use each preset's own
+        overrides: type/mood/font values applied on top of presets
+    """
+    presets = load_style_presets()
+    variants = []
+    for style in styles or [None]:
+        if style is not None and style not in presets:
+            raise ValueError(f"Unknown style preset '{style}'. Available: {', '.join(presets)}")
+        base = dict(DEFAULTS)
+        if style:
+            base.update(presets[style])
+        base.update({k: v for k, v in overrides.items() if v})
+        for palette, rendering in itertools.product(palettes or [base.get("palette")],
+                                                    renderings or [base.get("rendering")]):
+            if not palette or not rendering:
+                raise ValueError("Without --styles, give both --palettes and --renderings")
+            variants.append({**base, "style": style, "palette": palette, "rendering": rendering})
+    return variants
+
+
+def prompt_key(prompt, size, model=DEFAULT_MODEL):
+    return hashlib.sha256(f"{model}\n{size}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def cache_path(cache_dir, key):
+    return Path(cache_dir) / key[:2] / f"{key}.png"
+
+
+def variant_filename(variant):
+    parts = [variant["style"], variant["palette"], variant["rendering"]]
+    return "-".join(p for p in parts if p) + ".png"
+
+
+def link_or_copy(src, dst):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+# ============================================================
+# Batch run
+# ============================================================
+
+def run_batch(title, variants, out_dir, summary="", size=DEFAULT_SIZE, cache_dir=DEFAULT_CACHE_DIR,
+              concurrency=8, rate=2.0, client=None):
+    """
+    Generate every variant, reusing cached and duplicate prompts.
+
+    Args:
+        client: Optional QwenImageClient; one is created when needed
+
+    Returns:
+        Manifest dict, also written to out_dir/batch.json
+    """
+    out_dir = Path(out_dir)
+    entries = []
+    pending = {}
+    for variant in variants:
+        prompt = build_prompt(title, summary, variant)
+        key = prompt_key(prompt, size)
+        entry = {
+            "style": variant["style"], "palette": variant["palette"], "rendering": variant["rendering"],
+            "type": variant["type"], "mood": variant["mood"], "font": variant["font"],
+            "key": key, "path": str(out_dir / variant_filename(variant)),
+        }
+        entries.append(entry)
+        if key not in pending and not cache_path(cache_dir, key).exists():
+            pending[key] = prompt
+
+    results = {}
+    if pending:
+        own_client = client is None
+        if own_client:
+            client = QwenImageClient(pool_size=max(concurrency, 1), limiter=RateLimiter(rate))
+        try:
+            keys = list(pending)
+            jobs = [{"prompt": pending[k], "output_path": cache_path(cache_dir, k), "size": size} for k in keys]
+            results = dict(zip(keys, asyncio.run(client.agenerate_many(jobs, max_concurrency=concurrency))))
+        finally:
+            if own_client:
+                client.close()
+
+    for entry in entries:
+        result = results.get(entry["key"])
+        if result is not None and not result["success"]:
+            entry.update(status="failed", error=result["error"])
+            continue
+        link_or_copy(cache_path(cache_dir, entry["key"]), Path(entry["path"]))
+        entry["status"] = "generated" if result is not None else "cached"
+
+    manifest = {
+        "title": title,
+        "size": size,
+        "variants": entries,
+        "unique_prompts": len({e["key"] for e in entries}),
+        "submitted": len(pending),
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "batch.json").write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifest
+
+
+def parse_list(value, kind):
+    if not value:
+        return []
+    if value == "all":
+        return available(kind) if kind != "styles" else list(load_style_presets())
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate cover variants across a style grid")
+    parser.add_argument("--title", required=True, help="Article title rendered on the cover")
+    parser.add_argument("--summary", default="", help="Short content summary")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--styles", help="Comma-separated style presets, or 'all'")
+    parser.add_argument("--palettes", help="Comma-separated palettes, or 'all'")
+    parser.add_argument("--renderings", help="Comma-separated renderings, or 'all'")
+    parser.add_argument("--type", help="Override type")
+    parser.add_argument("--mood", help="Override mood")
+    parser.add_argument("--font", help="Override font")
+    parser.add_argument("--size", default=DEFAULT_SIZE, choices=SUPPORTED_SIZES, help="Image size")
+    parser.add_argument("--concurrency", type=int, default=8, help="Generations in flight at once")
+    parser.add_argument("--rate", type=float, default=2.0, help="Max task submissions per second")
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_DIR), help="Cache directory")
+    parser.add_argument("--max", type=int, help="Only the first N variants")
+    parser.add_argument("--dry-run", action="store_true", help="Print the variants and cache status only")
+    args = parser.parse_args()
+
+    try:
+        variants = expand_grid(
+            parse_list(args.styles, "styles"),
+            parse_list(args.palettes, "palettes"),
+            parse_list(args.renderings, "renderings"),
+            {"type": args.type, "mood": args.mood, "font": args.font},
+        )
+        for variant in variants:
+            load_palette(variant["palette"])
+            load_rendering(variant["rendering"])
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.max:
+        variants = variants[:args.max]
+
+    if args.dry_run:
+        seen = set()
+        for variant in variants:
+            key = prompt_key(build_prompt(args.title, args.summary, variant), args.size)
+            state = "duplicate" if key in seen else "cached" if cache_path(args.cache, key).exists() else "new"
+            seen.add(key)
+            print(f"{state:>9}  {variant_filename(variant)}  {key[:12]}")
+        return
+
+    print(f"🎨 {len(variants)} variants")
+    try:
+        manifest = run_batch(args.title, variants, args.out, args.summary, args.size,
+                             args.cache, args.concurrency, args.rate)
+    except ValueError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    failed = 0
+    for entry in manifest["variants"]:
+        if entry["status"] == "failed":
+            failed += 1
+            print(f"❌ {entry['path']}: {entry['error']}")
+        else:
+            print(f"✅ {entry['path']} ({entry['status']})")
+    print(f"\n{manifest['unique_prompts']} unique prompts, {manifest['submitted']} submitted, {failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Multi-size cover export for cover-image
+
+Decodes each generated cover once and produces every platform size from
+it: crop boxes are centred on a detected focal point, resized straight
+from the decoded source, and encoded on a thread pool with per-format
+encoder settings. JPEG sources are decoded at reduced resolution when the
+largest target does not need the full image.
+
+Usage:
+    export_sizes.py <image> [<image> ...] [--platforms wechat,xiaohongshu|all]
+                    [--format png|jpeg|webp] [--out <dir>] [--focus auto|center|X,Y]
+                    [--jobs N] [--json]
+
+Examples:
+    export_sizes.py cover.png                          # all platforms, next to the source
+    export_sizes.py cover.png --platforms wechat,900x500 --format jpeg
+    export_sizes.py covers/*.png --out covers/export --focus 0.3,0.5
+
+Targets are platform names or WIDTHxHEIGHT. Outputs are named
+<source stem>-<target>.<ext>. --focus takes the focal point as fractions
+of width and height; "auto" picks the centre of visual detail and falls
+back to the image centre for flat images.
+
+Library usage:
+    from export_sizes import export_covers
+
+    report = export_covers(["cover.png"], ["wechat", "twitter"], fmt="jpeg")
+    print(report["images_per_second"])
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageFilter
+except ImportError:
+    raise ImportError("Please install Pillow: pip install Pillow")
+
+
+# Target sizes, as in SKILL.md "Resize for Platform"
+PLATFORMS = {
+    "wechat": (900, 383),
+    "blog": (1920, 1080),
+    "xiaohongshu": (1080, 1080),
+    "poster": (1080, 1440),
+    "twitter": (1200, 675),
+}
+
+FORMAT_SETTINGS = {
+    "png": {"format": "PNG", "compress_level": 6},
+    "jpeg": {"format": "JPEG", "quality": 88, "optimize": True, "progressive": True, "subsampling": "4:2:0"},
+    "webp": {"format": "WEBP", "quality": 85, "method": 4},
+}
+EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+FOCUS_SAMPLE_SIZE = 96
+FOCUS_MIN_ENERGY = 2.0
+
+
+def parse_target(target):
+    """Resolve a platform name or WIDTHxHEIGHT to (name, (width, height))."""
+    if target in PLATFORMS:
+        return target, PLATFORMS[target]
+    try:
+        width, height = (int(v) for v in target.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Unknown target '{target}'. Use WIDTHxHEIGHT or one of: {', '.join(PLATFORMS)}")
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid target size: {target}")
+    return target.lower(), (width, height)
+
+
+def crop_box(source_size, target_size, focus):
+    """
+    Largest box of the target aspect ratio inside the source, centred on
+    the focal point as far as the image edges allow.
+    """
+    src_w, src_h = source_size
+    aspect = target_size[0] / target_size[1]
+    if src_w / src_h > aspect:
+        box_w, box_h = src_h * aspect, src_h
+    else:
+        box_w, box_h = src_w, src_w / aspect
+    left = min(max(focus[0] * src_w - box_w / 2, 0), src_w - box_w)
+    top = min(max(focus[1] * src_h - box_h / 2, 0), src_h - box_h)
+    return (left, top, left + box_w, top + box_h)
+
+
+def required_scale(source_size, targets):
+    """Largest target/crop scale factor over all targets; <1 means the source is bigger than needed."""
+    scale = 0.0
+    for size in targets:
+        box = crop_box(source_size, size, (0.5, 0.5))
+        scale = max(scale, size[0] / (box[2] - box[0]))
+    return scale
+
+
+def find_focus(img):
+    """
+    Focal point as (x, y) fractions: the centroid of edge energy on a small
+    grayscale sample, or the centre when the image has little detail.
+    """
+    sample = img.convert("L")
+    sample.thumbnail((FOCUS_SAMPLE_SIZE, FOCUS_SAMPLE_SIZE))
+    edges = sample.filter(ImageFilter.FIND_EDGES)
+    width, height = edges.size
+    if width < 3 or height < 3:
+        return (0.5, 0.5)
+    # FIND_EDGES leaves a one-pixel frame; ignore it
+    edges = edges.crop((1, 1, width - 1, height - 1))
+    width, height = edges.size
+
+    total = sum_x = sum_y = 0
+    for i, value in enumerate(edges.tobytes()):
+        if value:
+            total += value
+            sum_x += value * (i % width)
+            sum_y += value * (i // width)
+    if total < FOCUS_MIN_ENERGY * width * height:
+        return (0.5, 0.5)
+    return ((sum_x / total + 1.5) / (width + 2), (sum_y / total + 1.5) / (height + 2))
+
+
+def decode(source, targets):
+    """
+    Open and decode a source once, at the smallest resolution that still
+    covers every target (JPEG DCT scaling; other formats decode in full).
+    """
+    img = Image.open(source)
+    scale = required_scale(img.size, targets)
+    if scale < 1 and img.format == "JPEG":
+        img.draft("RGB", (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+    img.load()
+    return img
+
+
+def encode(img, box, size, output_path, fmt):
+    """Resize the crop box of img to size and write it atomically."""
+    resized = img.resize(size, Image.LANCZOS, box=box, reducing_gap=3.0)
+    if fmt == "jpeg" and resized.mode not in ("RGB", "L"):
+        resized = resized.convert("RGB")
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    resized.save(tmp_path, **FORMAT_SETTINGS[fmt])
+    os.replace(tmp_path, output_path)
+    return str(output_path)
+
+
+def export_covers(sources, targets=None, out_dir=None, fmt="png", focus="auto", jobs=None):
+    """
+    Export every source to every target size.
+
+    Args:
+        sources: Image paths
+        targets: Platform names or WIDTHxHEIGHT strings (default: all platforms)
+        out_dir: Output directory (default: next to each source)
+        fmt: "png", "jpeg" or "webp"
+        focus: "auto", "center" or an (x, y) tuple of fractions
+        jobs: Encoder threads (default: CPU count)
+
+    Returns:
+        Report dict with the outputs, elapsed seconds and images per second
+    """
+    if fmt not in FORMAT_SETTINGS:
+        raise ValueError(f"Unsupported format '{fmt}'. Use one of: {', '.join(FORMAT_SETTINGS)}")
+    resolved = [parse_target(t) for t in (targets or list(PLATFORMS))]
+    sizes = [size for _, size in resolved]
+
+    start = time.perf_counter()
+    outputs = []
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        pending = []
+        # Decoding runs here while the previous source's encodes run on the pool
+        for source in sources:
+            source = Path(source)
+            img = decode(source, sizes)
+            point = find_focus(img) if focus == "auto" else (0.5, 0.5) if focus == "center" else focus
+            target_dir = Path(out_dir) if out_dir else source.parent
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for name, size in resolved:
+                output_path = target_dir / f"{source.stem}-{name}{EXTENSIONS[fmt]}"
+                box = crop_box(img.size, size, point)
+                future = executor.submit(encode, img, box, size, output_path, fmt)
+                pending.append((str(source), name, size, point, future))
+        for source, name, size, point, future in pending:
+            outputs.append({
+                "source": source,
+                "target": name,
+                "size": list(size),
+                "focus": [round(point[0], 3), round(point[1], 3)],
+                "path": future.result(),
+            })
+
+    elapsed = time.perf_counter() - start
+    return {
+        "outputs": outputs,
+        "elapsed": round(elapsed, 4),
+        "images_per_second": round(len(outputs) / elapsed, 2) if elapsed else None,
+    }
+
+
+def parse_focus(value):
+    if value in ("auto", "center"):
+        return value
+    try:
+        x, y = (float(v) for v in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("focus must be auto, center or X,Y fractions")
+    if not (0 <= x <= 1 and 0 <= y <= 1):
+        raise argparse.ArgumentTypeError("focus fractions must be between 0 and 1")
+    return (x, y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a cover to every platform size in one pass")
+    parser.add_argument("sources", nargs="+", help="Source images")
+    parser.add_argument("--platforms", default="all",
+                        help=f"Comma-separated targets: {', '.join(PLATFORMS)}, WIDTHxHEIGHT, or 'all'")
+    parser.add_argument("--format", default="png", choices=list(FORMAT_SETTINGS), help="Output format")
+    parser.add_argument("--out", help="Output directory (default: next to each source)")
+    parser.add_argument("--focus", default="auto", type=parse_focus, help="auto, center, or X,Y fractions")
+    parser.add_argument("--jobs", type=int, help="Encoder threads (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    targets = None if args.platforms == "all" else [t.strip() for t in args.platforms.split(",") if t.strip()]
+    try:
+        report = export_covers(args.sources, targets, args.out, args.format, args.focus, args.jobs)
+    except (ValueError, OSError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    for output in report["outputs"]:
+        width, height = output["size"]
+        print(f"✅ {output['path']} ({width}x{height})")
+    print(f"\n{len(report['outputs'])} images in {report['elapsed']:.2f}s "
+          f"({report['images_per_second']} images/s)")
+
+
+if __name__ == "__main__":
+    main()
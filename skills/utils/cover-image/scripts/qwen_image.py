@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+DashScope Qwen-Image client for cover-image
+
+Submits text-to-image tasks, polls them with adaptive backoff and streams
+the results to disk. One client holds a pooled HTTP session, so many
+generations reuse the same connections; the async API runs any number of
+generations concurrently under asyncio.
+
+Usage:
+    qwen_image.py "<prompt>" -o cover.png [--size 1664*928] [--n 1]
+
+Submissions can be paced with a RateLimiter shared by every generation of
+a client; it backs off when DashScope throttles and recovers afterwards.
+
+Library usage:
+    import sys
+    sys.path.insert(0, "/path/to/skills/utils/cover-image/scripts")
+    from qwen_image import QwenImageClient
+
+    with QwenImageClient() as client:
+        paths = client.generate("A minimalist cover ...", "cover.png")
+
+        # Many covers at once
+        results = asyncio.run(client.agenerate_many([
+            {"prompt": "...", "output_path": "a.png"},
+            {"prompt": "...", "output_path": "b.png", "size": "1024*1024"},
+        ], max_concurrency=4))
+
+Environment variables:
+    DASHSCOPE_API_KEY: API key (required)
+    DASHSCOPE_API_HOST: API host (optional, default https://dashscope.aliyuncs.com);
+        point it at scripts/qwen_stub_server.py to run without the real service
+"""
+
+import asyncio
+import email.utils
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    raise ImportError("Please install requests: pip install requests")
+
+
+DEFAULT_API_HOST = "https://dashscope.aliyuncs.com"
+SYNTHESIS_PATH = "/api/v1/services/aigc/text2image/image-synthesis"
+TASK_PATH = "/api/v1/tasks/{task_id}"
+
+DEFAULT_MODEL = "qwen-image-plus"
+DEFAULT_SIZE = "1664*928"
+SUPPORTED_SIZES = ("1664*928", "1024*1024", "928*1664", "1472*1104", "1104*1472")
+
+THROTTLING_CODES = {"Throttling", "Throttling.RateQuota", "Throttling.AllocationQuota"}
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class QwenImageError(Exception):
+    """A DashScope request or task failed."""
+
+    def __init__(self, message, code=None, response=None):
+        super().__init__(f"{code}: {message}" if code else message)
+        self.code = code
+        self.response = response
+
+
+class RateLimitedError(QwenImageError):
+    """DashScope rejected a request with a throttling code."""
+
+    def __init__(self, message, code=None, response=None, retry_after=None):
+        super().__init__(message, code, response)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """
+    Seconds to wait from a Retry-After header: delay-seconds or an
+    HTTP-date (RFC 9110). Returns None when missing or unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+@dataclass
+class PollPolicy:
+    """
+    Timing of task polling and throttling retries.
+
+    The first poll happens after first_interval seconds; each following
+    wait grows by multiplier up to max_interval. Throttled requests wait
+    for the server's Retry-After, or throttle_wait seconds.
+    """
+    first_interval: float = 1.0
+    multiplier: float = 1.6
+    max_interval: float = 8.0
+    timeout: float = 180.0
+    throttle_wait: float = 60.0
+    max_throttle_retries: int = 5
+
+    def intervals(self):
+        interval = self.first_interval
+        while True:
+            yield interval
+            interval = min(interval * self.multiplier, self.max_interval)
+
+
+class RateLimiter:
+    """
+    Quota-aware token bucket for task submissions.
+
+    Callers reserve a slot and sleep for the returned delay, so the same
+    limiter paces sync and async callers alike. When the service throttles
+    anyway, the rate is halved; each accepted submission then wins back a
+    little of it, up to the configured ceiling (additive increase,
+    multiplicative decrease).
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one slot; return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def accepted(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class QwenImageClient:
+    """Qwen-Image client with a pooled session, shared by sync and async calls."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_host: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        poll: Optional[PollPolicy] = None,
+        pool_size: int = 16,
+        timeout: float = 30.0,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.api_key = api_key or os.environ.get("DASHSCOPE_API_KEY")
+        if not self.api_key:
+            raise ValueError("Please set the DASHSCOPE_API_KEY environment variable")
+        self.api_host = (api_host or os.environ.get("DASHSCOPE_API_HOST") or DEFAULT_API_HOST).rstrip("/")
+        self.model = model
+        self.poll = poll or PollPolicy()
+        self.timeout = timeout
+        self.limiter = limiter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Authorization"] = f"Bearer {self.api_key}"
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------
+    # Single requests
+    # ------------------------------------------------------------
+
+    def _check(self, response):
+        """Return the JSON body of a response, raising on API errors."""
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        code = body.get("code")
+        if response.status_code == 429 or code in THROTTLING_CODES:
+            raise RateLimitedError(
+                body.get("message", "Rate limited"), code or "Throttling", body,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+        if response.status_code >= 400 or code:
+            raise QwenImageError(body.get("message", f"HTTP {response.status_code}"), code, body)
+        return body
+
+    def submit(self, prompt: str, size: str = DEFAULT_SIZE, n: int = 1, **parameters) -> str:
+        """Create an async generation task and return its task id."""
+        if size not in SUPPORTED_SIZES:
+            raise ValueError(f"Unsupported size {size}, expected one of: {', '.join(SUPPORTED_SIZES)}")
+        payload = {
+            "model": self.model,
+            "input": {"prompt": prompt},
+            "parameters": {"size": size, "n": n, **parameters},
+        }
+        response = self.session.post(
+            self.api_host + SYNTHESIS_PATH,
+            json=payload,
+            headers={"X-DashScope-Async": "enable"},
+            timeout=self.timeout,
+        )
+        body = self._check(response)
+        task_id = body.get("output", {}).get("task_id")
+        if not task_id:
+            raise QwenImageError(f"Task creation failed: {body}", response=body)
+        return task_id
+
+    def query(self, task_id: str) -> dict:
+        """Return the task's output section (task_status, results, ...)."""
+        response = self.session.get(self.api_host + TASK_PATH.format(task_id=task_id), timeout=self.timeout)
+        return self._check(response).get("output", {})
+
+    def download(self, url: str, output_path) -> str:
+        """Stream an image to disk through a temp file, never holding it in memory."""
+        output_path = Path(output_path).expanduser()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(f".{output_path.name}.part")
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            os.replace(tmp_path, output_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return str(output_path)
+
+    # ------------------------------------------------------------
+    # Full generation, shared by the sync and async entry points
+    # ------------------------------------------------------------
+
+    def _throttled(self, func, *args, limited=False):
+        """
+        Step generator: call func, waiting and retrying while throttled.
+        With limited=True each attempt first takes a slot from the limiter.
+        """
+        limiter = self.limiter if limited else None
+        for attempt in range(self.poll.max_throttle_retries + 1):
+            if limiter:
+                delay = limiter.reserve()
+                if delay:
+                    yield ("sleep", delay)
+            try:
+                result = yield ("call", func, args)
+            except RateLimitedError as e:
+                if limiter:
+                    limiter.throttled()
+                if attempt == self.poll.max_throttle_retries:
+                    raise
+                # Retry-After: 0 (or a date already past) means retry now
+                yield ("sleep", self.poll.throttle_wait if e.retry_after is None else e.retry_after)
+                continue
+            if limiter:
+                limiter.accepted()
+            return result
+
+    def _generation_steps(self, prompt, output_path, size, n, parameters):
+        """
+        Step generator for one generation: yields ("call", func, args) and
+        ("sleep", seconds) steps and returns the downloaded paths. Running
+        the steps is left to _run_sync / _run_async.
+        """
+        task_id = yield from self._throttled(lambda: self.submit(prompt, size, n, **parameters), limited=True)
+
+        deadline = time.monotonic() + self.poll.timeout
+        for interval in self.poll.intervals():
+            if time.monotonic() + interval > deadline:
+                raise QwenImageError(f"Generation timeout after {self.poll.timeout:.0f}s", "Timeout")
+            yield ("sleep", interval)
+            output = yield from self._throttled(self.query, task_id)
+            status = output.get("task_status", "UNKNOWN")
+            if status == "SUCCEEDED":
+                break
+            if status in ("FAILED", "CANCELED", "UNKNOWN"):
+                raise QwenImageError(output.get("message", f"Task {status}"), output.get("code", status), output)
+
+        urls = [r["url"] for r in output.get("results", []) if r.get("url")]
+        if not urls:
+            raise QwenImageError(f"Task succeeded without images: {output}", response=output)
+        paths = []
+        for i, url in enumerate(urls):
+            path = Path(output_path)
+            if i:
+                path = path.with_name(f"{path.stem}-{i + 1}{path.suffix}")
+            paths.append((yield ("call", self.download, (url, path))))
+        return paths
+
+    @staticmethod
+    def _run_sync(steps):
+        result, error = None, None
+        while True:
+            try:
+                step = steps.throw(error) if error else steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            result, error = None, None
+            if step[0] == "sleep":
+                time.sleep(step[1])
+                continue
+            try:
+                result = step[1](*step[2])
+            except Exception as e:
+                error = e
+
+    @staticmethod
+    async def _run_async(steps):
+        result, error = None, None
+        while True:
+            try:
+                step = steps.throw(error) if error else steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            result, error = None, None
+            if step[0] == "sleep":
+                await asyncio.sleep(step[1])
+                continue
+            try:
+                result = await asyncio.to_thread(step[1], *step[2])
+            except Exception as e:
+                error = e
+
+    def generate(self, prompt: str, output_path, size: str = DEFAULT_SIZE, n: int = 1, **parameters) -> list:
+        """
+        Generate n images and save them; the first to output_path, the
+        others to output_path with a -2, -3, ... suffix.
+
+        Returns:
+            List of saved file paths
+        """
+        return self._run_sync(self._generation_steps(prompt, output_path, size, n, parameters))
+
+    async def agenerate(self, prompt: str, output_path, size: str = DEFAULT_SIZE, n: int = 1, **parameters) -> list:
+        """Async generate(): waits on asyncio, HTTP calls run in worker threads."""
+        return await self._run_async(self._generation_steps(prompt, output_path, size, n, parameters))
+
+    async def agenerate_many(self, jobs, max_concurrency: int = 8) -> list:
+        """
+        Run many generations concurrently.
+
+        Args:
+            jobs: Iterable of dicts with agenerate() keyword arguments
+            max_concurrency: Maximum generations in flight at once
+
+        Returns:
+            One dict per job, in order: {"success": True, "paths": [...]} or
+            {"success": False, "error": ..., "code": ...}; a bad job (such as
+            an unsupported size) fails on its own without cancelling the rest
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(job):
+            async with semaphore:
+                try:
+                    return {"success": True, "paths": await self.agenerate(**job)}
+                except (QwenImageError, requests.exceptions.RequestException,
+                        OSError, ValueError, TypeError) as e:
+                    return {"success": False, "error": str(e), "code": getattr(e, "code", None)}
+
+        return await asyncio.gather(*(run(job) for job in jobs))
+
+
+def generate_cover(prompt, output_path, size=DEFAULT_SIZE):
+    """
+    Generate one cover image with Qwen-Image-Plus.
+
+    Returns:
+        str: Path of the saved image
+    """
+    with QwenImageClient() as client:
+        return client.generate(prompt, output_path, size)[0]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate images with Qwen-Image")
+    parser.add_argument("prompt", help="Image prompt")
+    parser.add_argument("-o", "--output", required=True, help="Output image path")
+    parser.add_argument("--size", default=DEFAULT_SIZE, choices=SUPPORTED_SIZES, help="Image size")
+    parser.add_argument("--n", type=int, default=1, help="Number of images (1-4)")
+    args = parser.parse_args()
+
+    try:
+        with QwenImageClient() as client:
+            paths = client.generate(args.prompt, args.output, args.size, args.n)
+    except (ValueError, QwenImageError, requests.exceptions.RequestException) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    for path in paths:
+        print(f"✅ Saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
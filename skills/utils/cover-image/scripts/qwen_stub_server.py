@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the DashScope Qwen-Image API
+
+Implements the task submission, task query and image download endpoints
+used by qwen_image.py, with configurable latency, throttling and failures,
+so the client can be exercised without network access or API credits.
+
+Usage:
+    qwen_stub_server.py [--port 8765] [--delay 2.0] [--throttle-every 0] [--http-date] [--fail-word BLOCKED]
+
+    export DASHSCOPE_API_HOST=http://127.0.0.1:8765
+    export DASHSCOPE_API_KEY=stub
+    python qwen_image.py "test prompt" -o out.png
+
+Library usage:
+    from qwen_stub_server import start_stub_server
+
+    server, url = start_stub_server(delay=0.2, throttle_every=3)
+    ...  # QwenImageClient(api_key="stub", api_host=url)
+    print(server.stats)
+    server.shutdown()
+
+Behaviour:
+    - Tasks report PENDING, then RUNNING, then SUCCEEDED once --delay has elapsed
+    - Every --throttle-every'th request is answered 429 Throttling.RateQuota
+      with a short Retry-After, in seconds or (--http-date) as an HTTP-date
+    - Prompts containing --fail-word end FAILED with DataInspectionFailed
+    - Images are real, solid-colour PNGs of the requested size
+"""
+
+import argparse
+import email.utils
+import hashlib
+import json
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SYNTHESIS_PATH = "/api/v1/services/aigc/text2image/image-synthesis"
+TASK_RE = re.compile(r"^/api/v1/tasks/([\w-]+)$")
+IMAGE_RE = re.compile(r"^/images/([\w-]+)-(\d+)\.png$")
+
+
+def make_png(width, height, rgb):
+    """Encode a solid-colour RGB PNG."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + bytes(rgb) * width
+    raw = zlib.compress(row * height, 6)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", raw) + chunk(b"IEND", b"")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "QwenStub/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _preflight(self, endpoint):
+        """Count the request and apply auth and throttling; True if handled."""
+        server = self.server
+        with server.lock:
+            server.stats["requests"] += 1
+            server.stats[endpoint] += 1
+            count = server.stats["requests"]
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._send_json(401, {"code": "InvalidApiKey", "message": "No API key provided."})
+            return True
+        if server.throttle_every and endpoint != "images" and count % server.throttle_every == 0:
+            with server.lock:
+                server.stats["throttled"] += 1
+            self._send_json(
+                429,
+                {"code": "Throttling.RateQuota", "message": "Requests rate limit exceeded, please try again later."},
+                {"Retry-After": server.retry_after_header()},
+            )
+            return True
+        return False
+
+    def do_POST(self):
+        if self.path != SYNTHESIS_PATH:
+            return self._send_json(404, {"code": "NotFound", "message": self.path})
+        if self._preflight("submit"):
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = body.get("input", {}).get("prompt")
+        size = body.get("parameters", {}).get("size", "1664*928")
+        if not prompt or not re.match(r"^\d+\*\d+$", size):
+            return self._send_json(400, {"code": "InvalidParameter", "message": "prompt and size are required"})
+
+        task_id = str(uuid.uuid4())
+        with self.server.lock:
+            self.server.tasks[task_id] = {
+                "created": time.monotonic(),
+                "prompt": prompt,
+                "size": size,
+                "n": int(body.get("parameters", {}).get("n", 1)),
+            }
+        self._send_json(200, {"output": {"task_id": task_id, "task_status": "PENDING"}, "request_id": task_id})
+
+    def do_GET(self):
+        match = TASK_RE.match(self.path)
+        if match:
+            if self._preflight("query"):
+                return
+            return self._query(match.group(1))
+        match = IMAGE_RE.match(self.path)
+        if match:
+            self._preflight("images")
+            return self._image(match.group(1), int(match.group(2)))
+        if self.path == "/stats":
+            with self.server.lock:
+                return self._send_json(200, dict(self.server.stats))
+        self._send_json(404, {"code": "NotFound", "message": self.path})
+
+    def _query(self, task_id):
+        task = self.server.tasks.get(task_id)
+        if task is None:
+            return self._send_json(200, {"output": {"task_id": task_id, "task_status": "UNKNOWN"}})
+        elapsed = time.monotonic() - task["created"]
+        output = {"task_id": task_id}
+        if self.server.fail_word and self.server.fail_word in task["prompt"]:
+            output.update(task_status="FAILED", code="DataInspectionFailed",
+                          message="Input data may contain inappropriate content.")
+        elif elapsed < self.server.delay / 2:
+            output["task_status"] = "PENDING"
+        elif elapsed < self.server.delay:
+            output["task_status"] = "RUNNING"
+        else:
+            host = self.headers.get("Host")
+            output.update(task_status="SUCCEEDED", results=[
+                {"url": f"http://{host}/images/{task_id}-{i}.png"} for i in range(task["n"])
+            ])
+        self._send_json(200, {"output": output, "request_id": str(uuid.uuid4())})
+
+    def _image(self, task_id, index):
+        task = self.server.tasks.get(task_id)
+        if task is None or index >= task["n"]:
+            return self._send_json(404, {"code": "NotFound", "message": self.path})
+        width, height = (int(v) for v in task["size"].split("*"))
+        rgb = hashlib.sha256(f"{task['prompt']}-{index}".encode("utf-8")).digest()[:3]
+        data = make_png(width, height, rgb)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay=2.0, throttle_every=0, retry_after=0.2, fail_word=None, verbose=False,
+                 http_date=False):
+        super().__init__(address, StubHandler)
+        self.delay = delay
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.http_date = http_date
+        self.fail_word = fail_word
+        self.verbose = verbose
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "submit": 0, "query": 0, "images": 0, "throttled": 0}
+
+    def retry_after_header(self):
+        if self.http_date:
+            return email.utils.formatdate(time.time() + self.retry_after, usegmt=True)
+        return str(self.retry_after)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(port=0, **options):
+    """
+    Start a stub server on a background thread.
+
+    Returns:
+        (server, base_url); call server.shutdown() when done
+    """
+    server = StubServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the DashScope Qwen-Image API")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--delay", type=float, default=2.0, help="Seconds until a task succeeds")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Throttle every Nth request (0 = never)")
+    parser.add_argument("--retry-after", type=float, default=0.2, help="Retry-After seconds on throttled responses")
+    parser.add_argument("--http-date", action="store_true", help="Send Retry-After as an HTTP-date")
+    parser.add_argument("--fail-word", default=None, help="Prompts containing this word fail")
+    args = parser.parse_args()
+
+    server = StubServer(("127.0.0.1", args.port), args.delay, args.throttle_every,
+                        args.retry_after, args.fail_word, verbose=True, http_date=args.http_date)
+    print(f"Qwen-Image stub listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
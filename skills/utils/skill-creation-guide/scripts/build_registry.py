@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Skill Registry Builder - Precomputes an index of every skill in a repository
+
+Usage:
+    build_registry.py <skills_root> [--out FILE] [--package-json FILE] [--check]
+
+Examples:
+    build_registry.py skills
+    build_registry.py skills --out dist/registry.json
+    build_registry.py skills --check
+
+Scans the tree once and writes a compact JSON index with, per skill: name,
+path, description, SKILL.md and total byte sizes, per-file SHA-256/size/mode
+and the files SKILL.md references. Loaders can read this one file instead of
+opening and parsing every SKILL.md.
+
+Refreshes are incremental: files untouched since the previous index was
+written are not re-hashed, and skills whose files are all unchanged keep
+their previous entry without being re-parsed.
+
+The skills listed in package.json are compared with the skills on disk.
+With --check nothing is written; the run fails if package.json has drifted
+from disk or if an existing index is stale, which makes it suitable for CI.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from deep_validate import analyze_skill
+from package_skill import build_manifest, collect_files
+from quick_validate import find_skills, parse_frontmatter, read_frontmatter, FrontmatterError
+
+REGISTRY_VERSION = 1
+DEFAULT_REGISTRY_NAME = "skills-registry.json"
+
+
+def load_registry(registry_path):
+    """
+    Load a registry index.
+
+    Returns:
+        The registry dict, or None if missing, unreadable or of another version
+    """
+    try:
+        registry = json.loads(Path(registry_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if registry.get("version") != REGISTRY_VERSION:
+        return None
+    return registry
+
+
+def build_entry(skill_path, rel_path, previous=None, previous_mtime=None):
+    """
+    Build the registry entry of one skill.
+
+    Args:
+        skill_path: Absolute path of the skill folder
+        rel_path: Path of the skill relative to the repository, as in package.json
+        previous: The skill's entry in the previous registry, if any
+        previous_mtime: mtime (ns) of the previous registry file, if any
+
+    Returns:
+        Registry entry dict
+    """
+    files = collect_files(skill_path)
+    manifest = build_manifest(skill_path.name, files, previous, previous_mtime)
+
+    if previous and previous["files"] == manifest["files"]:
+        return previous
+
+    try:
+        frontmatter = parse_frontmatter(read_frontmatter(skill_path / 'SKILL.md'))
+    except FrontmatterError:
+        frontmatter = None
+    if not isinstance(frontmatter, dict):
+        frontmatter = {}
+
+    analysis = analyze_skill(skill_path)
+    name = frontmatter.get('name')
+    description = frontmatter.get('description')
+    return {
+        "name": name.strip() if isinstance(name, str) else skill_path.name,
+        "path": rel_path,
+        "description": description.strip() if isinstance(description, str) else "",
+        "valid": analysis["valid"],
+        "sizes": {
+            "skill_md": manifest["files"]["SKILL.md"]["size"],
+            "total": sum(entry["size"] for entry in manifest["files"].values()),
+            "context_tokens": analysis["budget"]["total_tokens"],
+        },
+        "references": analysis["graph"].get("SKILL.md", []),
+        "files": manifest["files"],
+    }
+
+
+def build_registry(skills_root, repo_root, previous=None, previous_mtime=None):
+    """
+    Build the registry for every skill under skills_root.
+
+    Paths are recorded relative to repo_root in the "./skills/..." form
+    package.json uses.
+    """
+    previous_skills = {s["path"]: s for s in previous["skills"]} if previous else {}
+    skills = []
+    for skill_path in find_skills(skills_root):
+        skill_path = skill_path.resolve()
+        rel_path = f"./{skill_path.relative_to(repo_root).as_posix()}"
+        skills.append(build_entry(skill_path, rel_path, previous_skills.get(rel_path), previous_mtime))
+    return {"version": REGISTRY_VERSION, "skills": skills}
+
+
+def check_package_json(registry, package_json):
+    """
+    Compare the skills listed in package.json with the registry.
+
+    Returns:
+        List of drift messages, empty if they agree
+    """
+    try:
+        listed = json.loads(Path(package_json).read_text(encoding='utf-8'))["skills"]["skills"]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return [f"Cannot read skills list from {package_json}: {e}"]
+
+    listed_by_path = {os.path.normpath(s.get("path", "")): s for s in listed}
+    on_disk_by_path = {os.path.normpath(s["path"]): s for s in registry["skills"]}
+
+    problems = []
+    for path, skill in sorted(on_disk_by_path.items()):
+        if path not in listed_by_path:
+            problems.append(f"Skill on disk but missing from package.json: {skill['name']} ({skill['path']})")
+        elif listed_by_path[path].get("name") != skill["name"]:
+            problems.append(
+                f"Name mismatch for {skill['path']}: package.json says "
+                f"'{listed_by_path[path].get('name')}', SKILL.md says '{skill['name']}'"
+            )
+    for path, skill in sorted(listed_by_path.items()):
+        if path not in on_disk_by_path:
+            problems.append(f"Skill in package.json but not on disk: {skill.get('name')} ({skill.get('path')})")
+    return problems
+
+
+def serialize(registry):
+    return json.dumps(registry, separators=(",", ":"), sort_keys=True, ensure_ascii=False) + "\n"
+
+
+def print_usage():
+    print("Usage: build_registry.py <skills_root> [--out FILE] [--package-json FILE] [--check]")
+
+
+def main(argv):
+    check = '--check' in argv
+    argv = [arg for arg in argv if arg != '--check']
+
+    options = {'--out': None, '--package-json': None}
+    for flag in options:
+        if flag in argv:
+            i = argv.index(flag)
+            if i + 1 >= len(argv):
+                print_usage()
+                return 1
+            options[flag] = argv[i + 1]
+            del argv[i:i + 2]
+
+    if len(argv) != 1 or argv[0].startswith('--'):
+        print_usage()
+        return 1
+
+    skills_root = Path(argv[0]).resolve()
+    if not skills_root.is_dir():
+        print(f"❌ Error: Skills root not found: {skills_root}")
+        return 1
+    repo_root = skills_root.parent
+    out_path = Path(options['--out'] or repo_root / DEFAULT_REGISTRY_NAME)
+    package_json = Path(options['--package-json'] or repo_root / "package.json")
+
+    previous = load_registry(out_path)
+    previous_mtime = out_path.stat().st_mtime_ns if previous else None
+    registry = build_registry(skills_root, repo_root, previous, previous_mtime)
+
+    problems = check_package_json(registry, package_json)
+    for problem in problems:
+        print(f"❌ {problem}")
+
+    content = serialize(registry)
+    if check:
+        if out_path.exists() and (previous is None or serialize(previous) != content):
+            problems.append("stale")
+            print(f"❌ Registry is out of date: {out_path}")
+        if problems:
+            return 1
+        print(f"✅ Registry up to date: {len(registry['skills'])} skills, package.json in sync")
+        return 0
+
+    if previous is not None and serialize(previous) == content:
+        print(f"✅ Registry unchanged: {out_path}")
+    else:
+        tmp_path = out_path.with_name(f".{out_path.name}.tmp")
+        tmp_path.write_text(content, encoding='utf-8')
+        os.replace(tmp_path, out_path)
+        print(f"✅ Wrote registry of {len(registry['skills'])} skills to: {out_path}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Deep skill validation - link graph, orphan detection and context budgets
+
+Usage:
+    deep_validate.py <skill_directory_or_skills_root> [--json] [--strict]
+                     [--max-tokens N] [--max-body-lines N]
+
+Examples:
+    deep_validate.py skills/utils/cover-image
+    deep_validate.py skills/ --json
+
+On top of the frontmatter checks of quick_validate.py, every skill found
+under the given path is checked for:
+
+- Broken links: markdown links ([text](path)) to files or directories
+  that do not exist
+- Orphaned files: bundled files not reachable from SKILL.md through
+  markdown links or path mentions such as `references/types.md`
+- Context budget: SKILL.md body plus every transitively referenced file
+  that would be read into context (everything except scripts/ and
+  assets/). Skills whose estimated token count exceeds --max-tokens are
+  flagged, as are SKILL.md bodies longer than --max-body-lines.
+
+Broken links, frontmatter errors and budget overruns fail the run;
+orphans and long bodies are warnings unless --strict is given. All
+skills are processed in one pass and each file is read at most once.
+"""
+
+import json
+import re
+import sys
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+
+from package_skill import collect_files
+from quick_validate import collect_errors, find_skills
+
+DEFAULT_MAX_TOKENS = 50000
+DEFAULT_MAX_BODY_LINES = 500
+
+# Top-level folders whose files are not loaded into context
+NON_CONTEXT_DIRS = {'scripts', 'assets'}
+# Files that are never expected to be referenced
+UNREFERENCED_OK = {'SKILL.md', 'LICENSE', 'LICENSE.txt', 'LICENSE.md'}
+
+FENCE_RE = re.compile(r'^(```|~~~).*?^\1[^\n]*$', re.MULTILINE | re.DOTALL)
+LINK_RE = re.compile(r'!?\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+MENTION_RE = re.compile(r'(?<![\w/.-])((?:references|rules|assets|scripts)/[\w./-]*[\w/])')
+SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
+FRONTMATTER_RE = re.compile(r'^---\n.*?\n---[^\n]*\n?', re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def read_text(path):
+    """Read a file as UTF-8 once; returns None for binary files."""
+    try:
+        return path.read_text(encoding='utf-8')
+    except (UnicodeDecodeError, OSError):
+        return None
+
+
+def estimate_tokens(text):
+    """Rough token estimate: ~4 ASCII characters per token, 1 per other character."""
+    ascii_chars = sum(1 for ch in text if ch < '\x80')
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def extract_references(text):
+    """
+    Return (links, mentions) found in markdown text.
+
+    Links are markdown link targets outside fenced code blocks; mentions
+    are bare paths into references/, rules/, assets/ or scripts/ anywhere
+    in the text, including code.
+    """
+    links = []
+    for target in LINK_RE.findall(FENCE_RE.sub('', text)):
+        if SCHEME_RE.match(target) or target.startswith('#'):
+            continue
+        target = target.split('#', 1)[0]
+        if target:
+            links.append(target)
+    return links, MENTION_RE.findall(text)
+
+
+def resolve_target(skill_path, source, target):
+    """Resolve a reference relative to the referencing file, then the skill root."""
+    for base in (source.parent, skill_path):
+        candidate = (base / target).resolve()
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def expand_target(target, files_by_path):
+    """Return the skill files a resolved target stands for (a file or a whole directory)."""
+    if target in files_by_path:
+        return [target]
+    prefix = f"{target}/"
+    return [path for path in files_by_path if str(path).startswith(prefix)]
+
+
+def analyze_skill(skill_path, max_tokens=DEFAULT_MAX_TOKENS, max_body_lines=DEFAULT_MAX_BODY_LINES):
+    """
+    Build the reference graph of one skill and check it.
+
+    Returns:
+        Result dict with errors, warnings, broken links, orphans and budget
+    """
+    skill_path = Path(skill_path).resolve()
+    errors = list(collect_errors(skill_path))
+    warnings = []
+
+    files_by_path = {path.resolve(): rel for path, rel in collect_files(skill_path)}
+    skill_md = (skill_path / 'SKILL.md').resolve()
+
+    # Walk the graph breadth-first from SKILL.md
+    broken = []
+    edges = {}
+    reachable = {skill_md}
+    queue = deque([skill_md])
+    while queue:
+        source = queue.popleft()
+        if source.suffix.lower() != '.md':
+            continue
+        text = read_text(source)
+        if text is None:
+            continue
+        links, mentions = extract_references(text)
+        targets = []
+        for target, required in [(t, True) for t in links] + [(t, False) for t in mentions]:
+            resolved = resolve_target(skill_path, source, target)
+            if resolved is None:
+                if required:
+                    broken.append({"source": files_by_path.get(source, source.name), "target": target})
+                continue
+            targets.extend(expand_target(resolved, files_by_path))
+        edges[files_by_path.get(source, 'SKILL.md')] = sorted({files_by_path[t] for t in targets})
+        for target in targets:
+            if target not in reachable:
+                reachable.add(target)
+                queue.append(target)
+
+    for link in broken:
+        errors.append(f"Broken link in {link['source']}: {link['target']}")
+
+    orphans = sorted(
+        rel for path, rel in files_by_path.items()
+        if path not in reachable and Path(rel).name not in UNREFERENCED_OK
+    )
+    for orphan in orphans:
+        warnings.append(f"Orphaned file (not referenced from SKILL.md): {orphan}")
+
+    # Context budget: SKILL.md body plus referenced context files
+    skill_text = read_text(skill_md) or ''
+    body = FRONTMATTER_RE.sub('', skill_text, count=1)
+    body_lines = body.count('\n')
+    body_tokens = estimate_tokens(body)
+    referenced_bytes = 0
+    referenced_tokens = 0
+    for path in reachable:
+        rel = files_by_path.get(path)
+        if rel is None or path == skill_md or rel.split('/', 1)[0] in NON_CONTEXT_DIRS:
+            continue
+        text = read_text(path)
+        if text is None:
+            continue
+        referenced_bytes += len(text.encode('utf-8'))
+        referenced_tokens += estimate_tokens(text)
+    total_tokens = body_tokens + referenced_tokens
+
+    if body_lines > max_body_lines:
+        warnings.append(f"SKILL.md body is {body_lines} lines (recommended maximum {max_body_lines})")
+    if total_tokens > max_tokens:
+        errors.append(
+            f"Context budget exceeded: ~{total_tokens} tokens with all references loaded "
+            f"(maximum {max_tokens})"
+        )
+
+    return {
+        "path": str(skill_path),
+        "valid": not errors,
+        "errors": errors,
+        "warnings": warnings,
+        "broken_links": broken,
+        "orphans": orphans,
+        "graph": edges,
+        "budget": {
+            "body_bytes": len(body.encode('utf-8')),
+            "body_lines": body_lines,
+            "body_tokens": body_tokens,
+            "referenced_bytes": referenced_bytes,
+            "referenced_tokens": referenced_tokens,
+            "total_tokens": total_tokens,
+        },
+    }
+
+
+def deep_validate(path, max_tokens=DEFAULT_MAX_TOKENS, max_body_lines=DEFAULT_MAX_BODY_LINES):
+    """
+    Deep-validate one skill, or every skill under a root directory.
+
+    Returns:
+        Report dict with per-skill results and totals
+    """
+    path = Path(path)
+    skills = [path] if (path / 'SKILL.md').exists() else find_skills(path)
+    results = [analyze_skill(skill, max_tokens, max_body_lines) for skill in skills]
+    invalid = sum(1 for r in results if not r["valid"])
+    return {
+        "root": str(path),
+        "total": len(results),
+        "valid": len(results) - invalid,
+        "invalid": invalid,
+        "warnings": sum(len(r["warnings"]) for r in results),
+        "skills": results,
+    }
+
+
+def print_usage():
+    print("Usage: python deep_validate.py <skill_directory_or_skills_root> [--json] [--strict]")
+    print("                               [--max-tokens N] [--max-body-lines N]")
+
+
+def main(argv):
+    as_json = '--json' in argv
+    strict = '--strict' in argv
+    argv = [arg for arg in argv if arg not in ('--json', '--strict')]
+
+    limits = {'--max-tokens': DEFAULT_MAX_TOKENS, '--max-body-lines': DEFAULT_MAX_BODY_LINES}
+    for flag in limits:
+        if flag in argv:
+            i = argv.index(flag)
+            try:
+                limits[flag] = int(argv[i + 1])
+            except (IndexError, ValueError):
+                print_usage()
+                return 1
+            del argv[i:i + 2]
+
+    if len(argv) != 1 or argv[0].startswith('--'):
+        print_usage()
+        return 1
+
+    report = deep_validate(argv[0], limits['--max-tokens'], limits['--max-body-lines'])
+
+    if as_json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for result in report["skills"]:
+            budget = result["budget"]
+            icon = "✅" if result["valid"] else "❌"
+            print(f"{icon} {result['path']}  (~{budget['total_tokens']} tokens, "
+                  f"SKILL.md body {budget['body_lines']} lines)")
+            for error in result["errors"]:
+                print(f"   ❌ {error}")
+            for warning in result["warnings"]:
+                print(f"   ⚠️  {warning}")
+        print(f"\n{report['valid']}/{report['total']} skills valid, {report['warnings']} warning(s)")
+
+    if report["invalid"] or (strict and report["warnings"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
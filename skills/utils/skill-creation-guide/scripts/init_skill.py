@@ -4,20 +4,66 @@ Skill Initializer - Creates a new skill from template
 
 Usage:
     init_skill.py <skill-name> --path <path>
+    init_skill.py --batch <manifest.yaml|manifest.json> [--path <path>]
 
 Examples:
     init_skill.py my-new-skill --path skills/public
     init_skill.py my-api-helper --path skills/private
     init_skill.py custom-skill --path /custom/location
+    init_skill.py --batch skill-family.yaml --path skills/generated
+
+Batch manifest format (YAML or JSON):
+
+    path: skills/generated            # default location (--path overrides)
+    defaults:                         # applied to every skill
+      variables:
+        org: Acme
+      templates:
+        SKILL.md: templates/SKILL.md.tmpl
+    skills:
+      - name: translate-python
+        description: Translate code to Python. Use when ...
+        variables:
+          language: Python
+        files:
+          references/style.md: "# {language} style for {skill_title}"
+          scripts/run.py:
+            template: templates/run.py.tmpl
+            mode: "755"
+        examples: false               # skip the example scripts/references/assets
+
+Templates are Python format strings; {skill_name}, {skill_title},
+{description} and {description_yaml} (the description as a quoted YAML
+scalar, for frontmatter) are always available alongside the manifest
+variables. Every rendered SKILL.md must pass the frontmatter checks of
+quick_validate before anything is written.
+Template paths are relative to the manifest. Each template is compiled
+once and shared across skills. Files are written in parallel into a
+staging directory, and the skills are moved into place only once all of
+them have rendered, so a failing batch leaves nothing behind.
 """
 
+import json
+import os
+import shutil
+import string
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from quick_validate import (FrontmatterError, check_frontmatter, check_name, parse_frontmatter,
+                            read_frontmatter_lines)
+
+DEFAULT_DESCRIPTION = (
+    "[TODO: Complete and informative explanation of what the skill does and when to use it. "
+    "Include WHEN to use this skill - specific scenarios, file types, or tasks that trigger it.]"
+)
+
 
 SKILL_TEMPLATE = """---
 name: {skill_name}
-description: [TODO: Complete and informative explanation of what the skill does and when to use it. Include WHEN to use this skill - specific scenarios, file types, or tasks that trigger it.]
+description: {description_yaml}
 ---
 
 # {skill_title}
@@ -191,6 +237,125 @@ def title_case_skill_name(skill_name):
     return ' '.join(word.capitalize() for word in skill_name.split('-'))
 
 
+class CompiledTemplate:
+    """A format-string template parsed once and rendered many times."""
+
+    _formatter = string.Formatter()
+
+    def __init__(self, text, source="<template>"):
+        self.source = source
+        try:
+            self.segments = list(self._formatter.parse(text))
+        except ValueError as e:
+            raise ValueError(f"Invalid template {source}: {e}")
+
+    def render(self, variables):
+        out = []
+        for literal, field_name, spec, conversion in self.segments:
+            out.append(literal)
+            if field_name is None:
+                continue
+            try:
+                value, _ = self._formatter.get_field(field_name, (), variables)
+            except (KeyError, AttributeError, IndexError):
+                raise ValueError(f"Unknown variable '{{{field_name}}}' in {self.source}")
+            value = self._formatter.convert_field(value, conversion)
+            out.append(format(value, spec or ''))
+        return ''.join(out)
+
+
+class LiteralTemplate:
+    """Template content written verbatim."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def render(self, variables):
+        return self.text
+
+
+# Files created for every skill: path -> (template, mode, example file)
+DEFAULT_FILES = {
+    'SKILL.md': (CompiledTemplate(SKILL_TEMPLATE, 'SKILL.md'), None, False),
+    'scripts/example.py': (CompiledTemplate(EXAMPLE_SCRIPT, 'scripts/example.py'), 0o755, True),
+    'references/api_reference.md': (
+        CompiledTemplate(EXAMPLE_REFERENCE, 'references/api_reference.md'), None, True),
+    'assets/example_asset.txt': (LiteralTemplate(EXAMPLE_ASSET), None, True),
+}
+
+
+def render_skill(skill_name, description=None, variables=None, templates=None, files=None, examples=True):
+    """
+    Render the files of one skill without touching the filesystem.
+
+    Args:
+        skill_name: Name of the skill
+        description: Frontmatter description (defaults to a TODO placeholder)
+        variables: Extra template variables
+        templates: Overrides for default files, path -> template
+        files: Additional files, path -> (template, mode)
+        examples: Whether to include the example scripts/references/assets
+
+    Returns:
+        List of (relative path, content, mode) tuples
+    """
+    description = description or DEFAULT_DESCRIPTION
+    context = dict(variables or {})
+    context.update(
+        skill_name=skill_name,
+        skill_title=title_case_skill_name(skill_name),
+        description=description,
+        # JSON strings are valid YAML double-quoted scalars
+        description_yaml=json.dumps(description, ensure_ascii=False),
+    )
+    templates = templates or {}
+
+    rendered = []
+    for rel_path, (template, mode, is_example) in DEFAULT_FILES.items():
+        if is_example and not examples:
+            continue
+        rendered.append((rel_path, templates.get(rel_path, template).render(context), mode))
+    for rel_path, (template, mode) in (files or {}).items():
+        rendered.append((rel_path, template.render(context), mode))
+    return rendered
+
+
+def check_rendered_skill(rendered):
+    """
+    Check the frontmatter of a rendered SKILL.md against the validator rules.
+
+    Returns:
+        List of error messages, empty if the frontmatter is valid
+    """
+    content = next((content for rel_path, content, _ in rendered if rel_path == 'SKILL.md'), None)
+    if content is None:
+        return ["SKILL.md not rendered"]
+    try:
+        frontmatter = parse_frontmatter(read_frontmatter_lines(content.splitlines(keepends=True)))
+    except FrontmatterError as e:
+        return [str(e)]
+    return check_frontmatter(frontmatter)
+
+
+def write_files(skill_dir, rendered, executor=None):
+    """Write rendered files under skill_dir, in parallel when given an executor."""
+    for parent in sorted({(skill_dir / rel_path).parent for rel_path, _, _ in rendered}):
+        parent.mkdir(parents=True, exist_ok=True)
+
+    def write(item):
+        rel_path, content, mode = item
+        file_path = skill_dir / rel_path
+        file_path.write_text(content)
+        if mode is not None:
+            file_path.chmod(mode)
+
+    if executor:
+        list(executor.map(write, rendered))
+    else:
+        for item in rendered:
+            write(item)
+
+
 def init_skill(skill_name, path):
     """
     Initialize a new skill directory with template SKILL.md.
@@ -202,6 +367,12 @@ def init_skill(skill_name, path):
     Returns:
         Path to created skill directory, or None if error
     """
+    name_errors = check_name(skill_name)
+    if name_errors:
+        for error in name_errors:
+            print(f"❌ Error: {error}")
+        return None
+
     # Determine skill directory path
     skill_dir = Path(path).resolve() / skill_name
 
@@ -218,46 +389,14 @@ def init_skill(skill_name, path):
         print(f"❌ Error creating directory: {e}")
         return None
 
-    # Create SKILL.md from template
-    skill_title = title_case_skill_name(skill_name)
-    skill_content = SKILL_TEMPLATE.format(
-        skill_name=skill_name,
-        skill_title=skill_title
-    )
-
-    skill_md_path = skill_dir / 'SKILL.md'
-    try:
-        skill_md_path.write_text(skill_content)
-        print("✅ Created SKILL.md")
-    except Exception as e:
-        print(f"❌ Error creating SKILL.md: {e}")
-        return None
-
-    # Create resource directories with example files
+    # Create SKILL.md and resource directories with example files
     try:
-        # Create scripts/ directory with example script
-        scripts_dir = skill_dir / 'scripts'
-        scripts_dir.mkdir(exist_ok=True)
-        example_script = scripts_dir / 'example.py'
-        example_script.write_text(EXAMPLE_SCRIPT.format(skill_name=skill_name))
-        example_script.chmod(0o755)
-        print("✅ Created scripts/example.py")
-
-        # Create references/ directory with example reference doc
-        references_dir = skill_dir / 'references'
-        references_dir.mkdir(exist_ok=True)
-        example_reference = references_dir / 'api_reference.md'
-        example_reference.write_text(EXAMPLE_REFERENCE.format(skill_title=skill_title))
-        print("✅ Created references/api_reference.md")
-
-        # Create assets/ directory with example asset placeholder
-        assets_dir = skill_dir / 'assets'
-        assets_dir.mkdir(exist_ok=True)
-        example_asset = assets_dir / 'example_asset.txt'
-        example_asset.write_text(EXAMPLE_ASSET)
-        print("✅ Created assets/example_asset.txt")
+        rendered = render_skill(skill_name)
+        write_files(skill_dir, rendered)
+        for rel_path, _, _ in rendered:
+            print(f"✅ Created {rel_path}")
     except Exception as e:
-        print(f"❌ Error creating resource directories: {e}")
+        print(f"❌ Error creating skill files: {e}")
         return None
 
     # Print next steps
@@ -270,22 +409,176 @@ def init_skill(skill_name, path):
     return skill_dir
 
 
+def load_manifest(manifest_path):
+    """Load a batch manifest from YAML or JSON."""
+    text = Path(manifest_path).read_text(encoding='utf-8')
+    if Path(manifest_path).suffix.lower() == '.json':
+        return json.loads(text)
+    import yaml
+    return yaml.safe_load(text)
+
+
+def prepare_batch(manifest, base_dir, default_path=None):
+    """
+    Resolve a manifest into per-skill render jobs, checking everything that
+    can fail before any file is written.
+
+    Returns:
+        (jobs, errors): jobs is a list of (skill directory, rendered files)
+    """
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('skills'), list):
+        return [], ["Manifest must be a mapping with a 'skills' list"]
+
+    compiled = {}
+
+    def load_template(spec, label):
+        # Inline strings are templates themselves; {template: path} loads a file
+        if isinstance(spec, str):
+            return CompiledTemplate(spec, label)
+        source = (base_dir / spec['template']).resolve()
+        if source not in compiled:
+            compiled[source] = CompiledTemplate(source.read_text(encoding='utf-8'), str(source))
+        return compiled[source]
+
+    def template_file(spec, label):
+        # Overrides in 'templates' are file paths
+        return load_template({'template': spec} if isinstance(spec, str) else spec, label)
+
+    defaults = manifest.get('defaults') or {}
+    location = default_path or manifest.get('path') or '.'
+
+    jobs = []
+    errors = []
+    seen = set()
+    for entry in manifest['skills']:
+        name = entry.get('name', '') if isinstance(entry, dict) else ''
+        if not name:
+            errors.append(f"Skill entry without a name: {entry!r}")
+            continue
+        errors.extend(check_name(name))
+
+        skill_dir = (Path(entry.get('path') or location).expanduser().resolve()) / name
+        if skill_dir in seen:
+            errors.append(f"Duplicate skill in manifest: {skill_dir}")
+        elif skill_dir.exists():
+            errors.append(f"Skill directory already exists: {skill_dir}")
+        seen.add(skill_dir)
+
+        try:
+            variables = {**defaults.get('variables', {}), **entry.get('variables', {})}
+            templates = {
+                rel_path: template_file(spec, rel_path)
+                for rel_path, spec in {**defaults.get('templates', {}), **entry.get('templates', {})}.items()
+            }
+            files = {}
+            for rel_path, spec in {**defaults.get('files', {}), **entry.get('files', {})}.items():
+                mode = spec.get('mode') if isinstance(spec, dict) else None
+                if isinstance(mode, str):
+                    mode = int(mode, 8)
+                files[rel_path] = (load_template(spec, rel_path), mode)
+            examples = entry.get('examples', defaults.get('examples', True))
+            rendered = render_skill(name, entry.get('description'), variables, templates, files, examples)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            errors.append(f"{name}: {e}")
+            continue
+        skill_errors = check_rendered_skill(rendered)
+        if skill_errors:
+            errors.extend(f"{name}: SKILL.md: {error}" for error in skill_errors)
+            continue
+        jobs.append((skill_dir, rendered))
+    return jobs, errors
+
+
+def init_batch(manifest_path, path=None):
+    """
+    Create every skill listed in a batch manifest, all or nothing.
+
+    Args:
+        manifest_path: YAML or JSON manifest file
+        path: Location overriding the manifest's 'path'
+
+    Returns:
+        List of created skill directories, or None if error
+    """
+    manifest_path = Path(manifest_path).resolve()
+    try:
+        manifest = load_manifest(manifest_path)
+    except Exception as e:
+        print(f"❌ Error reading manifest: {e}")
+        return None
+
+    jobs, errors = prepare_batch(manifest, manifest_path.parent, path)
+    if errors:
+        for error in errors:
+            print(f"❌ Error: {error}")
+        print("   No skills were created.")
+        return None
+
+    # Stage every skill in a temp directory next to its destination, so the
+    # final moves are same-filesystem renames
+    staging = {}
+    moved = []
+    try:
+        with ThreadPoolExecutor() as executor:
+            for skill_dir, rendered in jobs:
+                parent = skill_dir.parent
+                if parent not in staging:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    staging[parent] = Path(tempfile.mkdtemp(prefix='.init_skill-', dir=parent))
+                write_files(staging[parent] / skill_dir.name, rendered, executor)
+
+        for skill_dir, _ in jobs:
+            os.rename(staging[skill_dir.parent] / skill_dir.name, skill_dir)
+            moved.append(skill_dir)
+    except Exception as e:
+        for skill_dir in moved:
+            shutil.rmtree(skill_dir, ignore_errors=True)
+        print(f"❌ Error creating skills: {e}")
+        print("   No skills were created.")
+        return None
+    finally:
+        for tmp_dir in staging.values():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    for skill_dir, rendered in jobs:
+        print(f"✅ {skill_dir} ({len(rendered)} files)")
+    print(f"\n✅ Initialized {len(jobs)} skills from {manifest_path.name}")
+    return [skill_dir for skill_dir, _ in jobs]
+
+
+def print_usage():
+    print("Usage: init_skill.py <skill-name> --path <path>")
+    print("       init_skill.py --batch <manifest.yaml|manifest.json> [--path <path>]")
+    print("\nSkill name requirements:")
+    print("  - Hyphen-case identifier (e.g., 'data-analyzer')")
+    print("  - Lowercase letters, digits, and hyphens only")
+    print("  - Max 64 characters")
+    print("  - Must match directory name exactly")
+    print("\nExamples:")
+    print("  init_skill.py my-new-skill --path skills/public")
+    print("  init_skill.py my-api-helper --path skills/private")
+    print("  init_skill.py custom-skill --path /custom/location")
+    print("  init_skill.py --batch skill-family.yaml --path skills/generated")
+
+
 def main():
-    if len(sys.argv) < 4 or sys.argv[2] != '--path':
-        print("Usage: init_skill.py <skill-name> --path <path>")
-        print("\nSkill name requirements:")
-        print("  - Hyphen-case identifier (e.g., 'data-analyzer')")
-        print("  - Lowercase letters, digits, and hyphens only")
-        print("  - Max 40 characters")
-        print("  - Must match directory name exactly")
-        print("\nExamples:")
-        print("  init_skill.py my-new-skill --path skills/public")
-        print("  init_skill.py my-api-helper --path skills/private")
-        print("  init_skill.py custom-skill --path /custom/location")
+    args = sys.argv[1:]
+
+    if len(args) in (2, 4) and args[0] == '--batch' and (len(args) == 2 or args[2] == '--path'):
+        manifest_path = args[1]
+        path = args[3] if len(args) == 4 else None
+        print(f"🚀 Initializing skills from manifest: {manifest_path}")
+        if path:
+            print(f"   Location: {path}")
+        print()
+        sys.exit(0 if init_batch(manifest_path, path) else 1)
+
+    if len(args) < 3 or args[1] != '--path':
+        print_usage()
         sys.exit(1)
 
-    skill_name = sys.argv[1]
-    path = sys.argv[3]
+    skill_name = args[0]
+    path = args[2]
 
     print(f"🚀 Initializing skill: {skill_name}")
     print(f"   Location: {path}")
@@ -3,30 +3,255 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--force] [--deterministic]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --force
+    python utils/package_skill.py skills/public/my-skill ./dist --deterministic
+
+Packaging is incremental: every .skill file embeds a manifest with the
+SHA-256, size and mode of each packaged file. When the output archive
+already exists, unchanged files reuse their compressed entries from it,
+and if nothing changed at all the existing archive is kept as-is.
+Pass --force to rebuild from scratch.
+
+With --deterministic, identical sources always produce byte-identical
+archives: entries are sorted, timestamps are fixed (SOURCE_DATE_EPOCH if
+set, otherwise 1980-01-01), permissions are normalized to 0644/0755 and
+the compression level is pinned. The archive's SHA-256 is printed so it
+can be used as a cache key.
+
+.git, __pycache__, .DS_Store and anything matched by a .skillignore file
+in the skill folder (one glob pattern per line) are never packaged.
+
+zipfile is imported by the functions that build or read archives, so
+importing collect_files (as deep_validate does) stays cheap.
 """
 
+import fnmatch
+import hashlib
+import json
+import os
+import struct
 import sys
-import zipfile
+import time
 from pathlib import Path
 from quick_validate import validate_skill
 
 
-def package_skill(skill_path, output_dir=None):
+MANIFEST_NAME = ".skill-manifest.json"
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+IGNORE_FILE = ".skillignore"
+DEFAULT_EXCLUDES = [".git", "__pycache__", ".DS_Store", IGNORE_FILE, MANIFEST_NAME]
+
+# Settings pinned in deterministic mode
+DETERMINISTIC_EPOCH = (1980, 1, 1, 0, 0, 0)
+DETERMINISTIC_COMPRESSLEVEL = 9
+
+
+def hash_file(file_path):
+    """Return the hex SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_ignore_patterns(skill_path):
+    """Return the exclusion patterns: the defaults plus those in .skillignore."""
+    patterns = list(DEFAULT_EXCLUDES)
+    ignore_file = skill_path / IGNORE_FILE
+    if ignore_file.is_file():
+        for line in ignore_file.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                patterns.append(line.rstrip('/'))
+    return patterns
+
+
+def is_excluded(rel_path, patterns):
+    """
+    Check a relative posix path against exclusion patterns.
+
+    A pattern without a slash matches any single path component (so
+    "*.log" or "node_modules" apply at every depth); a pattern with a
+    slash matches the whole path relative to the skill folder.
+    """
+    parts = rel_path.split('/')
+    for pattern in patterns:
+        if '/' in pattern:
+            if fnmatch.fnmatchcase(rel_path, pattern.lstrip('/')):
+                return True
+        elif any(fnmatch.fnmatchcase(part, pattern) for part in parts):
+            return True
+    return False
+
+
+def collect_files(skill_path):
+    """
+    Return the files to package, as (path, relative posix path) pairs
+    sorted by relative path. Excluded directories are not descended into.
+    """
+    patterns = load_ignore_patterns(skill_path)
+    files = []
+    for root, dirs, filenames in os.walk(skill_path):
+        rel_root = Path(root).relative_to(skill_path).as_posix()
+        prefix = '' if rel_root == '.' else f"{rel_root}/"
+        dirs[:] = [d for d in dirs if not is_excluded(prefix + d, patterns)]
+        for filename in filenames:
+            rel_path = prefix + filename
+            if not is_excluded(rel_path, patterns):
+                files.append((Path(root) / filename, rel_path))
+    files.sort(key=lambda item: item[1])
+    return files
+
+
+def deterministic_date_time():
+    """Fixed entry timestamp, honouring SOURCE_DATE_EPOCH when it is set."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        # Zip timestamps cannot go below 1980
+        return max(time.gmtime(int(epoch))[:6], DETERMINISTIC_EPOCH)
+    return DETERMINISTIC_EPOCH
+
+
+def normalized_mode(mode):
+    """Map a file mode to 0755 if any execute bit is set, otherwise 0644."""
+    return 0o755 if mode & 0o111 else 0o644
+
+
+def deterministic_zipinfo(arcname, mode, date_time):
+    """Create a ZipInfo carrying only reproducible metadata."""
+    import zipfile
+
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    zinfo.create_system = 3  # Unix, regardless of the host platform
+    zinfo.external_attr = (0o100000 | normalized_mode(mode)) << 16
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    return zinfo
+
+
+def read_manifest(archive_path, skill_name):
+    """
+    Read the manifest embedded in a previously built .skill file.
+
+    Returns:
+        The manifest dict, or None if the archive is missing, unreadable,
+        or was built without a manifest
+    """
+    import zipfile
+
+    try:
+        with zipfile.ZipFile(archive_path) as zipf:
+            data = zipf.read(f"{skill_name}/{MANIFEST_NAME}")
+        manifest = json.loads(data)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def build_manifest(skill_name, files, previous=None, previous_mtime=None, deterministic=False,
+                   date_time=None):
+    """
+    Build the manifest for the current state of the skill folder.
+
+    A file whose size matches the previous manifest and that has not been
+    modified since the previous archive was written keeps its recorded
+    hash instead of being re-read.
+
+    Args:
+        skill_name: Name of the skill (top-level folder in the archive)
+        files: (path, relative path) pairs from collect_files()
+        previous: Manifest of the existing archive, if any
+        previous_mtime: mtime (ns) of the existing archive, if any
+        deterministic: Record normalized modes, as stored in deterministic archives
+        date_time: Fixed entry timestamp of a deterministic archive
+
+    Returns:
+        Manifest dict
+    """
+    previous_files = previous["files"] if previous else {}
+    entries = {}
+    for file_path, rel_path in files:
+        st = file_path.stat()
+        old = previous_files.get(rel_path)
+        if (old and previous_mtime is not None
+                and old["size"] == st.st_size
+                and st.st_mtime_ns < previous_mtime):
+            sha256 = old["sha256"]
+        else:
+            sha256 = hash_file(file_path)
+        entries[rel_path] = {
+            "sha256": sha256,
+            "size": st.st_size,
+            "mode": normalized_mode(st.st_mode) if deterministic else st.st_mode & 0o777,
+        }
+    return {
+        "version": MANIFEST_VERSION,
+        "skill": skill_name,
+        "deterministic": deterministic,
+        "date_time": list(date_time) if date_time else None,
+        "files": entries,
+    }
+
+
+def copy_raw_entry(src_zip, dst_zip, zinfo):
+    """
+    Copy an already-compressed member from one open archive to another
+    without decompressing and recompressing it.
+
+    zipfile has no public API for this, so the local file header is
+    written by hand and the member registered in dst_zip's central
+    directory.
+    """
+    import zipfile
+
+    src_zip.fp.seek(zinfo.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, src_zip.fp.read(zipfile.sizeFileHeader))
+    # Skip the local file name (field 10) and extra field (field 11)
+    src_zip.fp.seek(header[10] + header[11], os.SEEK_CUR)
+    raw = src_zip.fp.read(zinfo.compress_size)
+
+    new_info = zipfile.ZipInfo(zinfo.filename, zinfo.date_time)
+    new_info.compress_type = zinfo.compress_type
+    new_info.external_attr = zinfo.external_attr
+    new_info.create_system = zinfo.create_system
+    new_info.flag_bits = zinfo.flag_bits & ~0x08  # sizes are known, no data descriptor
+    new_info.CRC = zinfo.CRC
+    new_info.compress_size = zinfo.compress_size
+    new_info.file_size = zinfo.file_size
+    new_info.header_offset = dst_zip.fp.tell()
+
+    dst_zip.fp.write(new_info.FileHeader(zip64=False))
+    dst_zip.fp.write(raw)
+    dst_zip.filelist.append(new_info)
+    dst_zip.NameToInfo[new_info.filename] = new_info
+    dst_zip.start_dir = dst_zip.fp.tell()
+
+
+def package_skill(skill_path, output_dir=None, force=False, deterministic=False):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        force: Rebuild every entry even if a previous archive is up to date
+        deterministic: Produce a byte-reproducible archive (sorted entries,
+            fixed timestamps and permissions, pinned compression level)
 
     Returns:
         Path to the created .skill file, or None if error
     """
+    import zipfile
+
     skill_path = Path(skill_path).resolve()
 
     # Validate skill folder exists
@@ -63,42 +288,100 @@ def package_skill(skill_path, output_dir=None):
 
     skill_filename = output_path / f"{skill_name}.skill"
 
-    # Create the .skill file (zip format)
+    files = collect_files(skill_path)
+
+    # Compare against the previous archive, if any
+    date_time = deterministic_date_time() if deterministic else None
+    previous = None
+    previous_mtime = None
+    if not force and skill_filename.exists():
+        previous = read_manifest(skill_filename, skill_name)
+        # Entries built in the other mode or with another fixed timestamp
+        # (SOURCE_DATE_EPOCH) carry different metadata, so they cannot be reused
+        if previous and (previous.get("deterministic", False) != deterministic
+                         or previous.get("date_time") != (list(date_time) if date_time else None)):
+            previous = None
+        if previous:
+            previous_mtime = skill_filename.stat().st_mtime_ns
+
+    manifest = build_manifest(skill_name, files, previous, previous_mtime, deterministic, date_time)
+
+    if previous and previous["files"] == manifest["files"]:
+        print(f"✅ Up to date, nothing changed since last build: {skill_filename}")
+        if deterministic:
+            print(f"   SHA-256: {hash_file(skill_filename)}")
+        return skill_filename
+
+    compresslevel = DETERMINISTIC_COMPRESSLEVEL if deterministic else None
+
+    previous_files = previous["files"] if previous else {}
+    tmp_filename = skill_filename.with_name(f".{skill_filename.name}.tmp")
+
+    # Create the .skill file (zip format) next to the old one, then swap it in
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
+        with zipfile.ZipFile(tmp_filename, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zipf:
+            old_zip = zipfile.ZipFile(skill_filename) if previous else None
+            try:
+                for file_path, rel_path in files:
                     # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
+                    arcname = f"{skill_name}/{rel_path}"
+                    old_entry = previous_files.get(rel_path)
+                    if old_entry == manifest["files"][rel_path] and arcname in old_zip.NameToInfo:
+                        copy_raw_entry(old_zip, zipf, old_zip.NameToInfo[arcname])
+                        print(f"  Reused: {arcname}")
+                    elif deterministic:
+                        zinfo = deterministic_zipinfo(arcname, manifest["files"][rel_path]["mode"], date_time)
+                        zipf.writestr(zinfo, file_path.read_bytes(), compresslevel=compresslevel)
+                        print(f"  Added: {arcname}")
+                    else:
+                        zipf.write(file_path, arcname)
+                        print(f"  Added: {arcname}")
+            finally:
+                if old_zip:
+                    old_zip.close()
 
+            manifest_arcname = f"{skill_name}/{MANIFEST_NAME}"
+            if deterministic:
+                manifest_arcname = deterministic_zipinfo(manifest_arcname, 0o644, date_time)
+            zipf.writestr(manifest_arcname, json.dumps(manifest, indent=2, sort_keys=True),
+                          compresslevel=compresslevel)
+
+        os.replace(tmp_filename, skill_filename)
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        if deterministic:
+            print(f"   SHA-256: {hash_file(skill_filename)}")
         return skill_filename
 
     except Exception as e:
+        tmp_filename.unlink(missing_ok=True)
         print(f"❌ Error creating .skill file: {e}")
         return None
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
+    flags = {'--force', '--deterministic'}
+    force = '--force' in sys.argv[1:]
+    deterministic = '--deterministic' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg not in flags]
+
+    if len(args) < 1:
+        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory] [--force] [--deterministic]")
         print("\nExample:")
         print("  python utils/package_skill.py skills/public/my-skill")
         print("  python utils/package_skill.py skills/public/my-skill ./dist")
+        print("  python utils/package_skill.py skills/public/my-skill ./dist --force")
+        print("  python utils/package_skill.py skills/public/my-skill ./dist --deterministic")
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    skill_path = args[0]
+    output_dir = args[1] if len(args) > 1 else None
 
     print(f"📦 Packaging skill: {skill_path}")
     if output_dir:
         print(f"   Output directory: {output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(skill_path, output_dir, force=force, deterministic=deterministic)
 
     if result:
         sys.exit(0)
@@ -1,95 +1,461 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    quick_validate.py <skill_directory>
+    quick_validate.py --all <skills_root> [--json] [--jobs N]
+
+With --all, every SKILL.md under the root is validated concurrently in a
+single process and all errors of each skill are reported. --json prints a
+machine-readable report instead. The exit status is 0 only if every skill
+is valid.
+
+Frontmatter is read only up to the closing '---' and parsed by a small
+reader covering the YAML subset used in SKILL.md files (plain and quoted
+scalars, folded/literal block strings, and the one-level 'metadata' map).
+PyYAML is imported only when a document falls outside that subset, and
+the thread pool only in --all mode, so validating one skill starts fast.
 """
 
 import sys
 import os
 import re
-import yaml
+import json
 from pathlib import Path
 
-def validate_skill(skill_path):
-    """Basic validation of a skill"""
+# Define allowed properties
+ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
+
+# Directories never searched for skills in --all mode
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv'}
+
+# Skill names: hyphen-case
+NAME_RE = re.compile(r'^[a-z0-9-]+$')
+
+# Patterns for the restricted frontmatter reader
+KEY_RE = re.compile(r'^([A-Za-z_][\w-]*):(?:\s+(.*))?$')
+BLOCK_HEADER_RE = re.compile(r'^([>|])(-?)$')
+# Plain scalars YAML would resolve to something other than a string
+NON_STRING_RE = re.compile(
+    r'^(?:~|null|Null|NULL|true|True|TRUE|false|False|FALSE|yes|Yes|YES|no|No|NO|on|On|ON|off|Off|OFF'
+    r'|[-+]?(?:0|[1-9][\d_]*)|[-+]?0o?[0-7_]+|[-+]?0x[\da-fA-F_]+|[-+]?0b[01_]+'
+    r'|[-+]?(?:\d[\d_]*)?\.[\d_]*(?:[eE][-+]?\d+)?|[-+]?\d[\d_]*[eE][-+]?\d+|[-+]?\d[\d_]*(?::[0-5]?\d)+(?:\.[\d_]*)?'
+    r'|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)|\d{4}-\d\d?-\d\d?.*|=|<<)$'
+)
+PLAIN_INDICATORS = set('-?:,[]{}#&*!|>\'"%@`')
+SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'n': '\n', 't': '\t', 'r': '\r', '0': '\0'}
+
+
+class FrontmatterError(Exception):
+    """Raised when SKILL.md frontmatter is missing or malformed."""
+
+
+class _Unsupported(Exception):
+    """Raised by the restricted reader for YAML it does not handle."""
+
+
+def read_frontmatter(skill_md):
+    """
+    Read the frontmatter block of a SKILL.md without reading the body.
+
+    Returns:
+        The text between the opening and closing '---' lines
+
+    Raises:
+        FrontmatterError: If the file has no (terminated) frontmatter
+    """
+    with open(skill_md, encoding='utf-8') as f:
+        return read_frontmatter_lines(f)
+
+
+def read_frontmatter_lines(lines):
+    """
+    Extract the frontmatter block from an iterable of text lines, consuming
+    it only up to the closing '---'. Works on any text stream, such as a
+    member opened inside a .skill archive.
+    """
+    lines = iter(lines)
+    first = next(lines, '')
+    if not first.startswith('---'):
+        raise FrontmatterError("No YAML frontmatter found")
+    if first.rstrip('\r\n') != '---':
+        raise FrontmatterError("Invalid frontmatter format")
+    block = []
+    for line in lines:
+        if line.startswith('---'):
+            return ''.join(block).rstrip('\n')
+        block.append(line)
+    raise FrontmatterError("Invalid frontmatter format")
+
+
+def _parse_scalar(value):
+    """Parse an inline scalar value, or raise _Unsupported."""
+    if value.startswith('"'):
+        if len(value) < 2 or not value.endswith('"'):
+            raise _Unsupported
+        out = []
+        chars = iter(value[1:-1])
+        for ch in chars:
+            if ch == '"':
+                raise _Unsupported
+            if ch == '\\':
+                escaped = next(chars, None)
+                if escaped not in SIMPLE_ESCAPES:
+                    raise _Unsupported
+                out.append(SIMPLE_ESCAPES[escaped])
+            else:
+                out.append(ch)
+        return ''.join(out)
+    if value.startswith("'"):
+        inner = value[1:-1]
+        if len(value) < 2 or not value.endswith("'") or "'" in inner.replace("''", ''):
+            raise _Unsupported
+        return inner.replace("''", "'")
+    if (not value or value[0] in PLAIN_INDICATORS or ': ' in value or ' #' in value
+            or value.endswith(':') or NON_STRING_RE.match(value)):
+        raise _Unsupported
+    return value
+
+
+def _parse_block(header, lines, at_end):
+    """
+    Parse the body of a '>' or '|' block scalar (optionally with '-').
+
+    at_end tells whether the block closes the document, in which case its
+    last line has no line break to keep.
+    """
+    style, chomp = BLOCK_HEADER_RE.match(header).groups()
+    trailing = len(lines)
+    while lines and not lines[-1].strip():
+        lines = lines[:-1]
+    # Leading blank lines become line breaks (and set the indentation)
+    if not lines or not lines[0].strip():
+        raise _Unsupported
+    at_end = at_end and trailing == len(lines)
+    indent = len(lines[0]) - len(lines[0].lstrip(' '))
+    body = []
+    for line in lines:
+        if not line.strip():
+            body.append('')
+            continue
+        if len(line) - len(line.lstrip(' ')) != indent or '\t' in line[:indent + 1]:
+            # More-indented lines have special folding rules
+            raise _Unsupported
+        body.append(line[indent:])
+
+    if style == '|':
+        text = '\n'.join(body)
+    else:
+        text = ''
+        for i, line in enumerate(body):
+            if i == 0:
+                text = line
+            elif line == '':
+                text += '\n'
+            elif body[i - 1] == '':
+                text += line
+            else:
+                text += ' ' + line
+    return text if chomp == '-' or at_end else text + '\n'
+
+
+def _parse_map(lines, nested, at_end=True):
+    """
+    Parse 'key: value' lines at a single indentation level.
+
+    At the top level a key with an empty value opens either a nested map
+    or a block sequence of plain scalars; nested maps go no deeper.
+    """
+    result = {}
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+        if line[0] in ' \t#':
+            raise _Unsupported
+        match = KEY_RE.match(line.rstrip())
+        if not match:
+            raise _Unsupported
+        key, value = match.group(1), (match.group(2) or '').strip()
+        if key in result:
+            raise _Unsupported
+
+        # Collect the indented lines belonging to this key
+        j = i + 1
+        while j < len(lines) and (not lines[j].strip() or lines[j][0] == ' '):
+            j += 1
+        children = lines[i + 1:j]
+        has_children = any(c.strip() for c in children)
+
+        children_at_end = at_end and j == len(lines)
+
+        if BLOCK_HEADER_RE.match(value):
+            result[key] = _parse_block(value, children, children_at_end)
+        elif value:
+            if has_children:
+                raise _Unsupported
+            result[key] = _parse_scalar(value)
+        elif not has_children:
+            raise _Unsupported  # empty value means null
+        else:
+            first = next(c for c in children if c.strip())
+            indent = len(first) - len(first.lstrip(' '))
+            if any(c.strip() and not c.startswith(' ' * indent) for c in children):
+                raise _Unsupported
+            children = [c[indent:] for c in children]
+            items = [c for c in children if c.strip()]
+            if all(c.startswith('- ') for c in items):
+                result[key] = [_parse_scalar(c[2:].strip()) for c in items]
+            elif nested:
+                raise _Unsupported
+            else:
+                result[key] = _parse_map(children, nested=True, at_end=children_at_end)
+        i = j
+    return result
+
+
+def parse_frontmatter_fast(text):
+    """
+    Parse frontmatter using the restricted reader.
+
+    Returns:
+        The frontmatter dict, or None if the text uses YAML features the
+        reader does not handle
+    """
+    if '\t' in text or '\r' in text:
+        return None
+    try:
+        return _parse_map(text.split('\n'), nested=False)
+    except _Unsupported:
+        return None
+
+
+def parse_frontmatter_yaml(text):
+    """Parse frontmatter with PyYAML, imported on first use."""
+    try:
+        import yaml
+    except ImportError:
+        raise FrontmatterError("PyYAML is required to parse this frontmatter: pip install pyyaml")
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise FrontmatterError(f"Invalid YAML in frontmatter: {e}")
+
+
+def parse_frontmatter(text):
+    """Parse frontmatter text, falling back to PyYAML for complex documents."""
+    frontmatter = parse_frontmatter_fast(text)
+    if frontmatter is None:
+        frontmatter = parse_frontmatter_yaml(text)
+    return frontmatter
+
+
+def collect_errors(skill_path):
+    """
+    Validate a skill and return every problem found.
+
+    Structural problems (missing SKILL.md, unparseable frontmatter) end the
+    check early; field-level problems are all collected.
+
+    Returns:
+        List of error messages, empty if the skill is valid
+    """
     skill_path = Path(skill_path)
 
     # Check SKILL.md exists
     skill_md = skill_path / 'SKILL.md'
     if not skill_md.exists():
-        return False, "SKILL.md not found"
+        return ["SKILL.md not found"]
 
-    # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
-        return False, "No YAML frontmatter found"
+    # Read and parse frontmatter
+    try:
+        frontmatter = parse_frontmatter(read_frontmatter(skill_md))
+    except FrontmatterError as e:
+        return [str(e)]
+    return check_frontmatter(frontmatter)
 
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
 
-    frontmatter_text = match.group(1)
+def check_frontmatter(frontmatter):
+    """
+    Check parsed frontmatter against the SKILL.md rules.
 
-    # Parse YAML frontmatter
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
-    except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+    Returns:
+        List of error messages, empty if the frontmatter is valid
+    """
+    if not isinstance(frontmatter, dict):
+        return ["Frontmatter must be a YAML dictionary"]
 
-    # Define allowed properties
-    ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
+    errors = []
 
     # Check for unexpected properties (excluding nested keys under metadata)
     unexpected_keys = set(frontmatter.keys()) - ALLOWED_PROPERTIES
     if unexpected_keys:
-        return False, (
+        errors.append(
             f"Unexpected key(s) in SKILL.md frontmatter: {', '.join(sorted(unexpected_keys))}. "
             f"Allowed properties are: {', '.join(sorted(ALLOWED_PROPERTIES))}"
         )
 
     # Check required fields
     if 'name' not in frontmatter:
-        return False, "Missing 'name' in frontmatter"
+        errors.append("Missing 'name' in frontmatter")
     if 'description' not in frontmatter:
-        return False, "Missing 'description' in frontmatter"
+        errors.append("Missing 'description' in frontmatter")
 
     # Extract name for validation
     name = frontmatter.get('name', '')
     if not isinstance(name, str):
-        return False, f"Name must be a string, got {type(name).__name__}"
+        errors.append(f"Name must be a string, got {type(name).__name__}")
+        name = ''
     name = name.strip()
     if name:
-        # Check naming convention (hyphen-case: lowercase with hyphens)
-        if not re.match(r'^[a-z0-9-]+$', name):
-            return False, f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)"
-        if name.startswith('-') or name.endswith('-') or '--' in name:
-            return False, f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens"
-        # Check name length (max 64 characters per spec)
-        if len(name) > 64:
-            return False, f"Name is too long ({len(name)} characters). Maximum is 64 characters."
+        errors.extend(check_name(name))
 
     # Extract and validate description
     description = frontmatter.get('description', '')
     if not isinstance(description, str):
-        return False, f"Description must be a string, got {type(description).__name__}"
+        errors.append(f"Description must be a string, got {type(description).__name__}")
+        description = ''
     description = description.strip()
     if description:
         # Check for angle brackets
         if '<' in description or '>' in description:
-            return False, "Description cannot contain angle brackets (< or >)"
+            errors.append("Description cannot contain angle brackets (< or >)")
         # Check description length (max 1024 characters per spec)
         if len(description) > 1024:
-            return False, f"Description is too long ({len(description)} characters). Maximum is 1024 characters."
+            errors.append(f"Description is too long ({len(description)} characters). Maximum is 1024 characters.")
+
+    return errors
 
+
+def check_name(name):
+    """
+    Check a skill name against the naming rules.
+
+    Returns:
+        List of error messages, empty if the name is valid
+    """
+    errors = []
+    # Check naming convention (hyphen-case: lowercase with hyphens)
+    if not NAME_RE.match(name):
+        errors.append(f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)")
+    if name.startswith('-') or name.endswith('-') or '--' in name:
+        errors.append(f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens")
+    # Check name length (max 64 characters per spec)
+    if len(name) > 64:
+        errors.append(f"Name is too long ({len(name)} characters). Maximum is 64 characters.")
+    return errors
+
+
+def validate_skill(skill_path):
+    """Basic validation of a skill"""
+    errors = collect_errors(skill_path)
+    if errors:
+        return False, "\n".join(errors)
     return True, "Skill is valid!"
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
-    
-    valid, message = validate_skill(sys.argv[1])
+
+def find_skills(root):
+    """Return every directory under root that contains a SKILL.md, sorted."""
+    skills = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        if 'SKILL.md' in filenames:
+            skills.append(Path(dirpath))
+    return sorted(skills)
+
+
+def validate_all(root, jobs=None):
+    """
+    Validate every skill under root concurrently.
+
+    Args:
+        root: Directory to search for SKILL.md files
+        jobs: Number of worker threads (defaults to the executor's default)
+
+    Returns:
+        Report dict with per-skill results and totals
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    skills = find_skills(root)
+
+    def check(skill_path):
+        try:
+            errors = collect_errors(skill_path)
+        except (OSError, UnicodeDecodeError) as e:
+            errors = [f"Could not read SKILL.md: {e}"]
+        return {"path": str(skill_path), "valid": not errors, "errors": errors}
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(check, skills))
+
+    invalid = sum(1 for r in results if not r["valid"])
+    return {
+        "root": str(root),
+        "total": len(results),
+        "valid": len(results) - invalid,
+        "invalid": invalid,
+        "skills": results,
+    }
+
+
+def print_usage():
+    print("Usage: python quick_validate.py <skill_directory>")
+    print("       python quick_validate.py --all <skills_root> [--json] [--jobs N]")
+
+
+def main(argv):
+    as_json = '--json' in argv
+    argv = [arg for arg in argv if arg != '--json']
+
+    jobs = None
+    if '--jobs' in argv:
+        i = argv.index('--jobs')
+        try:
+            jobs = int(argv[i + 1])
+        except (IndexError, ValueError):
+            jobs = 0
+        if jobs < 1:
+            print_usage()
+            return 1
+        del argv[i:i + 2]
+
+    if len(argv) == 2 and argv[0] == '--all':
+        if not os.path.isdir(argv[1]):
+            print(f"❌ Skills root not found: {argv[1]}")
+            return 1
+        report = validate_all(argv[1], jobs)
+        if as_json:
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+        elif not report["total"]:
+            print(f"❌ No SKILL.md found under {argv[1]}")
+        else:
+            for result in report["skills"]:
+                if result["valid"]:
+                    print(f"✅ {result['path']}")
+                else:
+                    print(f"❌ {result['path']}")
+                    for error in result["errors"]:
+                        print(f"   - {error}")
+            print(f"\n{report['valid']}/{report['total']} skills valid")
+        return 0 if report["total"] and not report["invalid"] else 1
+
+    if len(argv) != 1 or argv[0].startswith('--'):
+        print_usage()
+        return 1
+
+    if as_json:
+        errors = collect_errors(argv[0])
+        print(json.dumps({"path": argv[0], "valid": not errors, "errors": errors}, indent=2, ensure_ascii=False))
+        return 0 if not errors else 1
+
+    valid, message = validate_skill(argv[0])
     print(message)
-    sys.exit(0 if valid else 1)
\ No newline at end of file
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
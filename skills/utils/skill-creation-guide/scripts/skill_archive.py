@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Skill Archive Reader - Inspects .skill files without extracting them
+
+Usage:
+    skill_archive.py info <file.skill> [--json]
+    skill_archive.py validate <file.skill>
+    skill_archive.py verify <file.skill>
+    skill_archive.py cat <file.skill> <member>
+    skill_archive.py extract <file.skill> <member> <destination>
+
+Examples:
+    skill_archive.py info dist/video-producer.skill
+    skill_archive.py cat dist/video-producer.skill rules/scene-patterns.md
+
+Only the central directory is read when the archive is opened. SKILL.md
+frontmatter is decompressed up to its closing '---', and references or
+assets are streamed on demand, so inspecting a large skill touches only
+the bytes actually needed.
+
+Library usage:
+    from skill_archive import SkillArchive
+
+    with SkillArchive("dist/my-skill.skill", use_mmap=True) as archive:
+        print(archive.frontmatter()["description"])
+        valid, message = archive.validate()
+        with archive.open("references/api.md") as f:
+            ...
+"""
+
+import hashlib
+import io
+import json
+import mmap
+import shutil
+import sys
+import zipfile
+from pathlib import Path
+
+from package_skill import HASH_CHUNK_SIZE, MANIFEST_NAME
+from quick_validate import (
+    FrontmatterError, check_frontmatter, parse_frontmatter, read_frontmatter_lines,
+)
+
+
+class _MappedFile:
+    """Minimal seekable file interface over an mmap, as zipfile expects."""
+
+    def __init__(self, mapped):
+        self._mapped = mapped
+
+    def read(self, size=-1):
+        return self._mapped.read(None if size is None or size < 0 else size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+
+    def tell(self):
+        return self._mapped.tell()
+
+    def seekable(self):
+        return True
+
+
+class SkillArchive:
+    """
+    Read-only view of a .skill file.
+
+    Member paths are given relative to the skill folder (e.g. "SKILL.md",
+    "references/types.md"); the top-level folder name is added internally.
+    """
+
+    def __init__(self, path, use_mmap=False):
+        """
+        Open a .skill file and read its central directory.
+
+        Args:
+            path: Path to the .skill file
+            use_mmap: Serve reads from a memory map of the archive instead of
+                file reads, letting the OS page in only the touched regions
+
+        Raises:
+            zipfile.BadZipFile: If the file is not a zip archive
+            ValueError: If the archive does not contain exactly one skill folder
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = None
+        try:
+            source = self._file
+            if use_mmap:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                source = _MappedFile(self._mmap)
+            self._zip = zipfile.ZipFile(source)
+        except Exception:
+            self.close()
+            raise
+
+        roots = {info.filename.split('/', 1)[0] for info in self._zip.infolist()}
+        if len(roots) != 1:
+            self.close()
+            raise ValueError(f"Expected a single skill folder in {self.path}, found {len(roots)}")
+        self.skill_name = roots.pop()
+        self._prefix = f"{self.skill_name}/"
+
+    def close(self):
+        if getattr(self, '_zip', None):
+            self._zip.close()
+        if self._mmap:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _info(self, member):
+        try:
+            return self._zip.getinfo(self._prefix + member)
+        except KeyError:
+            raise KeyError(f"No such member in {self.path.name}: {member}")
+
+    def members(self):
+        """Return (member path, uncompressed size) for every file, from the central directory."""
+        return [
+            (info.filename[len(self._prefix):], info.file_size)
+            for info in self._zip.infolist()
+            if not info.is_dir()
+        ]
+
+    def open(self, member):
+        """Open a member as a binary stream, decompressed as it is read."""
+        return self._zip.open(self._info(member))
+
+    def read(self, member):
+        """Read a whole member into memory."""
+        with self.open(member) as f:
+            return f.read()
+
+    def extract(self, member, destination):
+        """Stream one member to a file path, without touching the others."""
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with self.open(member) as src, open(destination, 'wb') as dst:
+            shutil.copyfileobj(src, dst, HASH_CHUNK_SIZE)
+        return destination
+
+    def read_frontmatter(self):
+        """Return the SKILL.md frontmatter text, decompressing only up to its end."""
+        with self.open('SKILL.md') as raw:
+            return read_frontmatter_lines(io.TextIOWrapper(raw, encoding='utf-8'))
+
+    def frontmatter(self):
+        """Return the parsed SKILL.md frontmatter."""
+        return parse_frontmatter(self.read_frontmatter())
+
+    def manifest(self):
+        """Return the manifest embedded by package_skill, or None if absent."""
+        try:
+            return json.loads(self.read(MANIFEST_NAME))
+        except (KeyError, ValueError):
+            return None
+
+    def collect_errors(self):
+        """Validate the packaged SKILL.md in place with quick_validate's rules."""
+        try:
+            self._info('SKILL.md')
+        except KeyError:
+            return ["SKILL.md not found"]
+        try:
+            frontmatter = self.frontmatter()
+        except (FrontmatterError, UnicodeDecodeError) as e:
+            return [str(e)]
+        return check_frontmatter(frontmatter)
+
+    def validate(self):
+        """Same contract as quick_validate.validate_skill: (valid, message)."""
+        errors = self.collect_errors()
+        if errors:
+            return False, "\n".join(errors)
+        return True, "Skill is valid!"
+
+    def verify(self):
+        """
+        Check every member against the embedded manifest by streaming its
+        contents through SHA-256.
+
+        Returns:
+            List of problems, empty if the archive matches its manifest
+        """
+        manifest = self.manifest()
+        if manifest is None:
+            return ["Archive has no manifest"]
+        expected = manifest.get("files", {})
+        actual = {member for member, _ in self.members()} - {MANIFEST_NAME}
+        problems = [f"Missing from archive: {m}" for m in sorted(set(expected) - actual)]
+        problems += [f"Not in manifest: {m}" for m in sorted(actual - set(expected))]
+        for member in sorted(actual & set(expected)):
+            digest = hashlib.sha256()
+            with self.open(member) as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            if digest.hexdigest() != expected[member]["sha256"]:
+                problems.append(f"Hash mismatch: {member}")
+        return problems
+
+
+def print_usage():
+    print("Usage: skill_archive.py info <file.skill> [--json]")
+    print("       skill_archive.py validate <file.skill>")
+    print("       skill_archive.py verify <file.skill>")
+    print("       skill_archive.py cat <file.skill> <member>")
+    print("       skill_archive.py extract <file.skill> <member> <destination>")
+
+
+def main(argv):
+    as_json = '--json' in argv
+    argv = [arg for arg in argv if arg != '--json']
+    arity = {'info': 2, 'validate': 2, 'verify': 2, 'cat': 3, 'extract': 4}
+    if not argv or arity.get(argv[0]) != len(argv):
+        print_usage()
+        return 1
+
+    command = argv[0]
+    try:
+        with SkillArchive(argv[1], use_mmap=True) as archive:
+            if command == 'info':
+                frontmatter = archive.frontmatter()
+                if not isinstance(frontmatter, dict):
+                    print("❌ Error: Frontmatter must be a YAML dictionary")
+                    return 1
+                members = archive.members()
+                if as_json:
+                    print(json.dumps({
+                        "skill": archive.skill_name,
+                        "frontmatter": frontmatter,
+                        "files": [{"path": m, "size": size} for m, size in members],
+                    }, indent=2, ensure_ascii=False))
+                else:
+                    print(f"Skill: {archive.skill_name}")
+                    print(f"Description: {frontmatter.get('description', '')}")
+                    print(f"Files: {len(members)} ({sum(size for _, size in members)} bytes)")
+                    for member, size in members:
+                        print(f"  {size:>10}  {member}")
+                return 0
+
+            if command == 'validate':
+                valid, message = archive.validate()
+                print(message)
+                return 0 if valid else 1
+
+            if command == 'verify':
+                problems = archive.verify()
+                for problem in problems:
+                    print(f"❌ {problem}")
+                if not problems:
+                    print("✅ Archive matches its manifest")
+                return 1 if problems else 0
+
+            if command == 'cat':
+                with archive.open(argv[2]) as f:
+                    shutil.copyfileobj(f, sys.stdout.buffer)
+                return 0
+
+            destination = archive.extract(argv[2], argv[3])
+            print(f"✅ Extracted {argv[2]} to: {destination}")
+            return 0
+
+    except FileNotFoundError:
+        print(f"❌ Error: File not found: {argv[1]}")
+    except (KeyError, ValueError, FrontmatterError, zipfile.BadZipFile) as e:
+        print(f"❌ Error: {e}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
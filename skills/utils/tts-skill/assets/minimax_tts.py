@@ -21,21 +21,69 @@ MiniMax TTS API Python Module
     MINIMAX_API_KEY: API 密钥 (必需)
     MINIMAX_API_HOST: API 地址 (可选，默认 https://api.minimax.io)
     MINIMAX_OUTPUT_DIR: 默认输出目录 (可选)
+    MINIMAX_RATE_RPS: 每秒请求数上限 (可选，默认 3，0 表示不限)
+    MINIMAX_RATE_CPM: 每分钟字符数上限 (可选，默认 60000，0 表示不限)
+    MINIMAX_RATE_STATE: 限流状态文件 (可选，默认 ~/.cache/minimax/ratelimit-<key hash>.json)
+
+输出目录结构 (未指定 output_path 时):
+    $MINIMAX_OUTPUT_DIR/tts/<key[:2]>/<key>.mp3             文本转语音
+    $MINIMAX_OUTPUT_DIR/voice_design/<key[:2]>/<key>.mp3    声音设计预览
+    $MINIMAX_OUTPUT_DIR/.minimax_manifest.sqlite3           请求参数 → 文件、时长、大小
+
+key 是请求参数的 SHA-256 (声音设计每次结果不同，key 另含预览音频的哈希)，
+文件先写临时文件再原子 rename，多个进程可以安全地共用同一个输出目录。
+
+requests、并发、播放等模块在用到时才导入：命令行帮助、quota、cleanup
+不联网，启动时不加载它们；未安装 requests 时第一次请求才报错。
 """
 
 import os
+import re
+import sys
 import json
+import time
 import base64
-import subprocess
-import platform
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterator
 from datetime import datetime
 
+
+def _requests():
+    """按需导入 requests"""
+    try:
+        import requests
+    except ImportError:
+        raise ImportError("请安装 requests: pip install requests")
+    return requests
+
+
+def _request_errors():
+    """requests 的异常基类；requests 尚未加载时不会有它的异常，返回空元组"""
+    requests = sys.modules.get("requests")
+    return requests.exceptions.RequestException if requests else ()
+
 try:
-    import requests
-except ImportError:
-    raise ImportError("请安装 requests: pip install requests")
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
 
 
 # ============================================================
@@ -55,10 +103,15 @@ def get_config() -> Dict[str, str]:
     return {
         "api_key": api_key,
         "api_host": os.environ.get("MINIMAX_API_HOST", "https://api.minimax.io"),
-        "output_dir": os.environ.get("MINIMAX_OUTPUT_DIR", os.getcwd())
+        "output_dir": get_output_dir()
     }
 
 
+def get_output_dir() -> str:
+    """默认输出目录 (MINIMAX_OUTPUT_DIR，支持 ~)"""
+    return os.path.expanduser(os.environ.get("MINIMAX_OUTPUT_DIR", os.getcwd()))
+
+
 def ensure_output_dir(path: str = None) -> str:
     """确保输出目录存在"""
     if path:
@@ -71,6 +124,359 @@ def ensure_output_dir(path: str = None) -> str:
     return str(dir_path)
 
 
+# ============================================================
+# 输出管理
+# ============================================================
+
+MANIFEST_NAME = ".minimax_manifest.sqlite3"
+# 超过这个时间的临时文件视为崩溃残留，清理时删除
+STALE_TEMP_SECONDS = 3600
+
+
+def request_key(kind: str, params: Dict[str, Any]) -> str:
+    """请求参数的内容哈希：参数相同 key 相同，参数不同不会撞名"""
+    canonical = json.dumps({"kind": kind, **params}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def output_path_for(key: str, kind: str, ext: str, output_dir: str = None) -> str:
+    """按 key 前两位分片的输出路径"""
+    return str(Path(output_dir or get_output_dir()) / kind / key[:2] / f"{key}.{ext}")
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """原子写入：先写同目录临时文件再 rename，读者不会看到半截文件"""
+    target = Path(path)
+    import tempfile
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _manifest(output_dir: str = None) -> sqlite3.Connection:
+    """打开输出目录的 manifest (WAL 模式，多进程并发安全)"""
+    root = Path(output_dir or get_output_dir())
+    root.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(root / MANIFEST_NAME), timeout=30, isolation_level=None)
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            pass  # 另一个进程正在创建/切换，它会完成切换
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS outputs ("
+        " key TEXT PRIMARY KEY, kind TEXT NOT NULL, path TEXT NOT NULL, params TEXT NOT NULL,"
+        " duration REAL, size INTEGER NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL, meta TEXT)"
+    )
+    # 早期版本的 manifest 没有 meta 列
+    if "meta" not in {row[1] for row in conn.execute("PRAGMA table_info(outputs)")}:
+        try:
+            conn.execute("ALTER TABLE outputs ADD COLUMN meta TEXT")
+        except sqlite3.OperationalError:
+            pass  # 另一个进程刚加上
+    return conn
+
+
+def record_output(key: str, kind: str, path: str, params: Dict[str, Any],
+                  duration: Optional[float] = None, output_dir: str = None,
+                  meta: Dict[str, Any] = None) -> None:
+    """把一次生成记入 manifest (路径相对输出目录保存，meta 为接口返回的附加信息)"""
+    root = Path(output_dir or get_output_dir())
+    now = time.time()
+    conn = _manifest(str(root))
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO outputs"
+            " (key, kind, path, params, duration, size, created, last_used, meta)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, kind, os.path.relpath(path, root), json.dumps(params, sort_keys=True, ensure_ascii=False),
+             duration, os.path.getsize(path), now, now,
+             json.dumps(meta, ensure_ascii=False) if meta is not None else None),
+        )
+    finally:
+        conn.close()
+
+
+def _lookup(where: str, args: tuple, output_dir: str = None) -> Optional[Dict[str, Any]]:
+    root = Path(output_dir or get_output_dir())
+    if not (root / MANIFEST_NAME).exists():
+        return None
+    conn = _manifest(str(root))
+    try:
+        row = conn.execute(
+            f"SELECT key, kind, path, duration, size, meta FROM outputs WHERE {where}"
+            " ORDER BY created DESC LIMIT 1", args
+        ).fetchone()
+        if row is None or not (root / row[2]).exists():
+            return None
+        conn.execute("UPDATE outputs SET last_used = ? WHERE key = ?", (time.time(), row[0]))
+    finally:
+        conn.close()
+    return {"key": row[0], "kind": row[1], "file_path": str(root / row[2]), "duration": row[3],
+            "size": row[4], "meta": json.loads(row[5]) if row[5] else {}}
+
+
+def lookup_output(key: str, output_dir: str = None) -> Optional[Dict[str, Any]]:
+    """按 key 查找已生成的文件；文件已被删除时返回 None"""
+    return _lookup("key = ?", (key,), output_dir)
+
+
+def lookup_latest(kind: str, params: Dict[str, Any], output_dir: str = None) -> Optional[Dict[str, Any]]:
+    """按请求参数查找最近一次生成的文件 (用于每次结果都不同的请求，如声音设计)"""
+    return _lookup("kind = ? AND params = ?",
+                   (kind, json.dumps(params, sort_keys=True, ensure_ascii=False)), output_dir)
+
+
+def cleanup_outputs(max_age_days: float = None, max_bytes: int = None,
+                    output_dir: str = None) -> Dict[str, Any]:
+    """
+    按保留策略清理输出目录
+
+    Args:
+        max_age_days: 删除超过这么多天未使用的文件
+        max_bytes: 总大小超过上限时，从最久未使用的文件开始删除
+        output_dir: 输出目录 (默认 MINIMAX_OUTPUT_DIR)
+
+    Returns:
+        dict: removed (删除文件数), freed (释放字节数), kept, total_size
+    """
+    root = Path(output_dir or get_output_dir())
+    conn = _manifest(str(root))
+    removed = freed = 0
+    try:
+        rows = conn.execute("SELECT key, path, size, last_used FROM outputs ORDER BY last_used").fetchall()
+        now = time.time()
+        total = sum(row[2] for row in rows)
+        doomed = []
+        for key, path, size, last_used in rows:
+            expired = max_age_days is not None and now - last_used > max_age_days * 86400
+            over_budget = max_bytes is not None and total > max_bytes
+            missing = not (root / path).exists()
+            if expired or over_budget or missing:
+                doomed.append(key)
+                total -= size
+                if not missing:
+                    (root / path).unlink(missing_ok=True)
+                    try:
+                        (root / path).parent.rmdir()  # 分片目录空了就删掉
+                    except OSError:
+                        pass
+                    removed += 1
+                    freed += size
+        conn.executemany("DELETE FROM outputs WHERE key = ?", [(key,) for key in doomed])
+        kept = len(rows) - len(doomed)
+    finally:
+        conn.close()
+
+    # 崩溃留下的临时文件
+    for kind in ("tts", "voice_design"):
+        for tmp_path in (root / kind).glob("*/.*.tmp"):
+            try:
+                if now - tmp_path.stat().st_mtime > STALE_TEMP_SECONDS:
+                    freed += tmp_path.stat().st_size
+                    tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+    return {"success": True, "removed": removed, "freed": freed, "kept": kept, "total_size": total}
+
+
+# ============================================================
+# 限流
+# ============================================================
+
+DEFAULT_RATE_RPS = 3.0
+DEFAULT_RATE_CPM = 60000
+# 服务端限流时 base_resp.status_code 的取值 (触发 RPM / TPM 限制)
+THROTTLE_CODES = {1002, 1039}
+MAX_THROTTLE_RETRIES = 3
+RECOVERY_STEP = 0.01
+USAGE_WINDOW = 60
+
+
+def default_rate_state_path() -> str:
+    """限流状态文件：按 API Key 区分，同一个 Key 的所有进程共用"""
+    if os.environ.get("MINIMAX_RATE_STATE"):
+        return os.path.expanduser(os.environ["MINIMAX_RATE_STATE"])
+    key_hash = hashlib.sha256(os.environ.get("MINIMAX_API_KEY", "").encode("utf-8")).hexdigest()[:12]
+    return str(Path.home() / ".cache" / "minimax" / f"ratelimit-{key_hash}.json")
+
+
+class SharedRateLimiter:
+    """
+    同一台机器上所有进程共享的令牌桶 (每秒请求数 + 每分钟字符数)
+
+    状态保存在加锁的 JSON 文件里。调用方先 reserve() 预占额度，再按返回的
+    秒数等待，并发的进程因此排队，而不是一起撞上服务端限流。服务端仍然限流时
+    速率减半，之后每次成功再慢慢恢复 (加性增、乘性减)，所有进程看到同一个速率。
+    """
+
+    def __init__(self, rps: float = None, cpm: float = None, state_path: str = None,
+                 min_scale: float = 0.05):
+        self.max_rps = float(os.environ.get("MINIMAX_RATE_RPS", DEFAULT_RATE_RPS) if rps is None else rps)
+        self.max_cpm = float(os.environ.get("MINIMAX_RATE_CPM", DEFAULT_RATE_CPM) if cpm is None else cpm)
+        self.state_path = Path(state_path or default_rate_state_path())
+        self.min_scale = min_scale
+        # 请求不攒突发 (服务端按滑动窗口计数)，字符按每分钟额度计
+        self.request_burst = 1.0
+        self.char_burst = self.max_cpm
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rps > 0 or self.max_cpm > 0
+
+    @contextmanager
+    def _state(self):
+        """加锁读写状态文件 (线程锁 + 文件锁)"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.state_path), os.O_RDWR | os.O_CREAT, 0o600)
+        with self._lock, os.fdopen(fd, "r+", encoding="utf-8") as f:
+            _lock_file(f)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                _unlock_file(f)
+
+    def _refill(self, state: Dict[str, Any], now: float) -> None:
+        scale = state.get("scale", 1.0)
+        elapsed = max(0.0, now - state.get("updated", now))
+        state["request_tokens"] = min(self.request_burst,
+                                      state.get("request_tokens", self.request_burst) + elapsed * self.max_rps * scale)
+        state["char_tokens"] = min(self.char_burst,
+                                   state.get("char_tokens", self.char_burst) + elapsed * self.max_cpm / 60 * scale)
+        state["updated"] = now
+        state["window"] = [w for w in state.get("window", []) if w[0] > now - USAGE_WINDOW]
+
+    def reserve(self, chars: int = 0) -> float:
+        """预占一次请求和 chars 个字符的额度，返回使用前需要等待的秒数"""
+        if not self.enabled:
+            return 0.0
+        with self._state() as state:
+            now = time.time()
+            self._refill(state, now)
+            scale = state.get("scale", 1.0)
+            wait = 0.0
+            if self.max_rps > 0:
+                state["request_tokens"] -= 1
+                wait = max(wait, -state["request_tokens"] / (self.max_rps * scale))
+            if self.max_cpm > 0 and chars:
+                state["char_tokens"] -= chars
+                wait = max(wait, -state["char_tokens"] / (self.max_cpm / 60 * scale))
+            state["window"].append([now + wait, 1, chars])
+            return wait
+
+    def throttled(self) -> None:
+        """服务端返回限流：速率减半，并收回已积攒的突发额度"""
+        if not self.enabled:
+            return
+        with self._state() as state:
+            self._refill(state, time.time())
+            state["scale"] = max(self.min_scale, state.get("scale", 1.0) / 2)
+            state["request_tokens"] = min(state["request_tokens"], 0.0)
+            state["throttles"] = state.get("throttles", 0) + 1
+
+    def accepted(self) -> None:
+        """请求成功：速率恢复一点 (所有进程的成功都会累计，所以步子要小)"""
+        if not self.enabled:
+            return
+        with self._state() as state:
+            if state.get("scale", 1.0) < 1.0:
+                state["scale"] = min(1.0, state["scale"] + RECOVERY_STEP)
+
+    def usage(self) -> Dict[str, Any]:
+        """
+        当前额度使用情况
+
+        Returns:
+            dict: 上限、当前有效速率、最近一分钟的请求数和字符数、可用额度、累计限流次数
+        """
+        with self._state() as state:
+            now = time.time()
+            self._refill(state, now)
+            scale = state.get("scale", 1.0)
+            recent = [w for w in state["window"] if w[0] <= now]
+            return {
+                "rps_limit": self.max_rps,
+                "cpm_limit": self.max_cpm,
+                "rps_effective": round(self.max_rps * scale, 3),
+                "cpm_effective": round(self.max_cpm * scale),
+                "requests_last_minute": sum(w[1] for w in recent),
+                "chars_last_minute": sum(w[2] for w in recent),
+                "queued": len(state["window"]) - len(recent),
+                "request_tokens": round(state["request_tokens"], 2),
+                "char_tokens": round(state["char_tokens"]),
+                "throttles": state.get("throttles", 0),
+                "state_path": str(self.state_path),
+            }
+
+
+_rate_limiter = None
+
+
+def get_rate_limiter() -> SharedRateLimiter:
+    """模块级共享的限流器 (所有 API 调用都经过它)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = SharedRateLimiter()
+    return _rate_limiter
+
+
+def quota_status() -> Dict[str, Any]:
+    """查看当前额度使用情况 (所有进程合计)"""
+    return get_rate_limiter().usage()
+
+
+def _is_throttled(response) -> bool:
+    if response.status_code == 429:
+        return True
+    try:
+        return response.json().get("base_resp", {}).get("status_code") in THROTTLE_CODES
+    except ValueError:
+        return False
+
+
+def _api_request(method: str, url: str, chars: int = 0, **kwargs):
+    """
+    经过共享限流器发送请求；服务端限流时降速后重试
+
+    Args:
+        chars: 本次请求消耗的字符数 (计入每分钟字符额度)
+    """
+    limiter = get_rate_limiter()
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        wait = limiter.reserve(chars)
+        if wait > 0:
+            time.sleep(wait)
+        # 重试时上传的文件要从头读
+        for upload in (kwargs.get("files") or {}).values():
+            upload[1].seek(0)
+        response = _requests().request(method, url, **kwargs)
+        if not _is_throttled(response):
+            limiter.accepted()
+            return response
+        limiter.throttled()
+    return response
+
+
 # ============================================================
 # 文本转语音
 # ============================================================
@@ -86,7 +492,8 @@ def text_to_audio(
     emotion: str = "happy",
     format: str = "mp3",
     sample_rate: int = 32000,
-    bitrate: int = 128000
+    bitrate: int = 128000,
+    reuse: bool = True
 ) -> Dict[str, Any]:
     """
     将文本转换为语音文件
@@ -103,21 +510,14 @@ def text_to_audio(
         format: 输出格式 (mp3, wav, pcm, flac)
         sample_rate: 采样率
         bitrate: 比特率
+        reuse: 未指定 output_path 时，相同参数直接复用已生成的文件
 
     Returns:
         dict: 包含 success, file_path, duration, trace_id 等信息
+              (未指定 output_path 时还有 key 和 cached)
     """
     config = get_config()
 
-    # 处理输出路径
-    if output_path is None:
-        ensure_output_dir()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = os.path.join(config["output_dir"], f"tts_{timestamp}.{format}")
-    else:
-        output_path = os.path.expanduser(output_path)
-        ensure_output_dir(output_path)
-
     # 构建请求
     url = f"{config['api_host']}/v1/t2a_v2"
 
@@ -144,8 +544,21 @@ def text_to_audio(
         }
     }
 
+    # 处理输出路径：未指定时按请求参数哈希存放
+    key = None
+    if output_path is None:
+        key = request_key("tts", payload)
+        if reuse:
+            existing = lookup_output(key, config["output_dir"])
+            if existing:
+                return {"success": True, "file_path": existing["file_path"],
+                        "duration": existing["duration"], "key": key, "cached": True}
+        output_path = output_path_for(key, "tts", format, config["output_dir"])
+    else:
+        output_path = os.path.expanduser(output_path)
+
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = _api_request("POST", url, chars=len(text), headers=headers, json=payload, timeout=60)
         response.raise_for_status()
 
         result = response.json()
@@ -153,16 +566,24 @@ def text_to_audio(
         if "data" in result and "audio" in result["data"]:
             # 解码并保存音频 (API 返回的是十六进制编码)
             audio_data = bytes.fromhex(result["data"]["audio"])
-            with open(output_path, "wb") as f:
-                f.write(audio_data)
+            write_atomic(output_path, audio_data)
 
-            return {
+            duration = result.get("data", {}).get("duration")
+            if duration is None and (result.get("extra_info") or {}).get("audio_length"):
+                duration = result["extra_info"]["audio_length"] / 1000
+            if key:
+                record_output(key, "tts", output_path, payload, duration, config["output_dir"])
+
+            response_info = {
                 "success": True,
                 "file_path": output_path,
-                "duration": result.get("data", {}).get("duration"),
+                "duration": duration,
                 "trace_id": result.get("trace_id"),
                 "extra_info": result.get("extra_info")
             }
+            if key:
+                response_info.update(key=key, cached=False)
+            return response_info
         else:
             return {
                 "success": False,
@@ -170,7 +591,7 @@ def text_to_audio(
                 "error_code": result.get("base_resp", {}).get("status_code")
             }
 
-    except requests.exceptions.RequestException as e:
+    except _request_errors() as e:
         return {
             "success": False,
             "error": str(e)
@@ -201,7 +622,7 @@ def list_voices(voice_type: str = "all") -> List[Dict[str, Any]]:
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = _api_request("GET", url, headers=headers, timeout=30)
         response.raise_for_status()
 
         result = response.json()
@@ -223,7 +644,7 @@ def list_voices(voice_type: str = "all") -> List[Dict[str, Any]]:
         else:
             return voices
 
-    except requests.exceptions.RequestException:
+    except _request_errors():
         # 如果 API 调用失败，返回默认声音列表
         return get_default_system_voices() if voice_type in ["all", "system"] else []
 
@@ -301,8 +722,10 @@ def voice_clone(
             data["demo_text"] = demo_text
 
         try:
-            response = requests.post(
+            response = _api_request(
+                "POST",
                 url,
+                chars=len(demo_text or ""),
                 headers=headers,
                 files=files,
                 data=data,
@@ -327,7 +750,7 @@ def voice_clone(
                     "error_code": result.get("base_resp", {}).get("status_code")
                 }
 
-        except requests.exceptions.RequestException as e:
+        except _request_errors() as e:
             return {
                 "success": False,
                 "error": str(e)
@@ -342,7 +765,8 @@ def voice_design(
     prompt: str,
     preview_text: str,
     voice_id: str = None,
-    voice_name: str = None
+    voice_name: str = None,
+    reuse: bool = False
 ) -> Dict[str, Any]:
     """
     根据描述设计声音
@@ -352,9 +776,10 @@ def voice_design(
         preview_text: 试听预览文本
         voice_id: 保存时的声音 ID（可选）
         voice_name: 声音名称（可选）
+        reuse: 相同参数已有预览时直接返回，不再请求 (默认每次重新设计)
 
     Returns:
-        dict: 包含 success, preview_audio, voice_id 等信息
+        dict: 包含 success, preview_audio, voice_id, cached 等信息
     """
     config = get_config()
 
@@ -375,8 +800,22 @@ def voice_design(
     if voice_name:
         payload["voice_name"] = voice_name
 
+    # 同一描述每次都会设计出不同的声音，所以预览不能只按请求参数命名：
+    # 文件 key 还包含返回音频的哈希，重复设计不会覆盖之前的预览
+    if reuse:
+        existing = (lookup_latest("voice_design", payload, config["output_dir"])
+                    or lookup_output(request_key("voice_design", payload), config["output_dir"]))
+        if existing:
+            return {
+                "success": True,
+                "voice_id": existing["meta"].get("voice_id", voice_id),
+                "preview_audio": existing["file_path"],
+                "voice_features": existing["meta"].get("voice_features", {}),
+                "cached": True
+            }
+
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = _api_request("POST", url, chars=len(preview_text), headers=headers, json=payload, timeout=60)
         response.raise_for_status()
 
         result = response.json()
@@ -384,24 +823,23 @@ def voice_design(
         if "data" in result:
             # 保存预览音频
             preview_audio = None
+            voice_features = result.get("data", {}).get("voice_features", {})
             if "audio" in result["data"]:
-                ensure_output_dir()
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                preview_path = os.path.join(
-                    config["output_dir"],
-                    f"voice_design_preview_{timestamp}.mp3"
-                )
-
                 audio_data = bytes.fromhex(result["data"]["audio"])
-                with open(preview_path, "wb") as f:
-                    f.write(audio_data)
+                key = request_key("voice_design", {**payload, "audio": hashlib.sha256(audio_data).hexdigest()})
+                preview_path = output_path_for(key, "voice_design", "mp3", config["output_dir"])
+
+                write_atomic(preview_path, audio_data)
+                record_output(key, "voice_design", preview_path, payload, output_dir=config["output_dir"],
+                              meta={"voice_id": voice_id, "voice_features": voice_features})
                 preview_audio = preview_path
 
             return {
                 "success": True,
                 "voice_id": voice_id,
                 "preview_audio": preview_audio,
-                "voice_features": result.get("data", {}).get("voice_features", {})
+                "voice_features": voice_features,
+                "cached": False
             }
         else:
             return {
@@ -410,13 +848,56 @@ def voice_design(
                 "suggestion": "请提供更详细的声音特征描述"
             }
 
-    except requests.exceptions.RequestException as e:
+    except _request_errors() as e:
         return {
             "success": False,
             "error": str(e)
         }
 
 
+def voice_design_variants(
+    prompts: List[str],
+    preview_text: str,
+    max_workers: int = 4,
+    reuse: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """
+    同时试听多个声音描述，按完成顺序逐个返回
+
+    所有描述并发提交，先完成的先返回，可以边听边等其余结果。预览按
+    (prompt, preview_text) 缓存，调整描述时没改过的变体不会重复请求。
+    提前停止迭代时，排队中的请求会取消，已发出的请求仍会完成并写入缓存。
+
+    Args:
+        prompts: 候选声音描述列表
+        preview_text: 所有变体共用的试听文本
+        max_workers: 并发请求数 (总速率仍受共享限流器约束)
+        reuse: 使用已缓存的预览
+
+    Yields:
+        dict: voice_design 的返回值，另含 prompt 和 index (在 prompts 中的位置)
+
+    Example:
+        for variant in voice_design_variants(["温柔的年轻女声", "沉稳的中年男声"], "你好"):
+            if variant["success"]:
+                play_audio(variant["preview_audio"])
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    unique = list(dict.fromkeys(prompts))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {
+        executor.submit(voice_design, prompt, preview_text, reuse=reuse): prompt
+        for prompt in unique
+    }
+    try:
+        for future in as_completed(futures):
+            prompt = futures[future]
+            yield {**future.result(), "prompt": prompt, "index": prompts.index(prompt)}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 # ============================================================
 # 播放音频
 # ============================================================
@@ -431,6 +912,9 @@ def play_audio(file_path: str) -> Dict[str, Any]:
     Returns:
         dict: 包含 success 和可能的 error 信息
     """
+    import platform
+    import subprocess
+
     file_path = os.path.expanduser(file_path)
 
     if not os.path.exists(file_path):
@@ -509,13 +993,267 @@ def speak(text: str, voice: str = "female-shaonv") -> None:
     play_audio(file_path)
 
 
+# ============================================================
+# 批量合成
+# ============================================================
+
+# 脚本条目中会传给 text_to_audio 的字段，其余字段 (备注等) 忽略
+BATCH_FIELDS = {"text", "voice_id", "model", "speed", "vol", "pitch", "emotion", "format", "sample_rate", "bitrate"}
+CSV_NUMERIC_FIELDS = {"speed": float, "vol": float, "pitch": int, "sample_rate": int, "bitrate": int}
+CHECKPOINT_NAME = ".batch-checkpoint.ndjson"
+RESULTS_NAME = "results.json"
+PROGRESS_INTERVAL = 1.0
+
+
+def iter_script(path: str):
+    """
+    逐条读取 NDJSON / CSV 脚本 (流式，不把整个文件读进内存)
+
+    NDJSON 每行一个对象，CSV 第一行为表头；都至少要有 text，id 可选。
+
+    Yields:
+        (序号, 条目 dict 或 None, 错误信息或 None)
+    """
+    import csv
+
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for index, row in enumerate(csv.DictReader(f), 1):
+                item = {}
+                try:
+                    for name, value in row.items():
+                        if name and value not in (None, ""):
+                            item[name] = CSV_NUMERIC_FIELDS.get(name, str)(value)
+                except ValueError as e:
+                    yield index, {"id": row["id"]} if row.get("id") else None, f"第 {index} 行字段格式错误: {e}"
+                    continue
+                yield index, item, None
+            return
+
+        index = 0
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            index += 1
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                yield index, None, f"第 {line_number} 行不是合法 JSON: {e}"
+                continue
+            if not isinstance(item, dict):
+                yield index, None, f"第 {line_number} 行不是 JSON 对象"
+                continue
+            yield index, item, None
+
+
+def count_script_items(path: str) -> int:
+    """估算脚本条目数 (只数行，不解析)，用于 ETA"""
+    count = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            count += block.count(b"\n")
+    if Path(path).suffix.lower() == ".csv":
+        count -= 1  # 表头
+    return max(count, 0)
+
+
+def load_checkpoint(path: Path) -> Dict[str, Dict[str, Any]]:
+    """读取已完成条目 {id: 记录}；崩溃时写了一半的最后一行会被忽略"""
+    done = {}
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                done[record["id"]] = record
+    return done
+
+
+def _end_last_line(path: Path):
+    """崩溃时最后一行可能只写了一半：补上换行，续跑追加的记录才不会接在它后面"""
+    try:
+        with open(path, "rb+") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    except FileNotFoundError:
+        pass
+
+
+def _safe_name(item_id: str) -> str:
+    return re.sub(r"[^\w.-]", "_", item_id).strip(".") or "item"
+
+
+def _synthesize_item(index: int, item_id: str, key: str, params: Dict[str, Any], out_dir: Path) -> Dict[str, Any]:
+    output_path = out_dir / f"{_safe_name(item_id)}.{params.get('format', 'mp3')}"
+    try:
+        result = text_to_audio(output_path=str(output_path), **params)
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+    record = {"index": index, "id": item_id, "chars": len(params["text"])}
+    if result["success"]:
+        record.update(key=key, file=str(output_path), duration=result.get("duration"))
+    else:
+        record["error"] = result.get("error", "未知错误")
+    return record
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s" if seconds >= 60 else f"{seconds}s"
+
+
+def batch_synthesize(script: str, out_dir: str, concurrency: int = 4,
+                     defaults: Dict[str, Any] = None, progress: bool = True) -> Dict[str, Any]:
+    """
+    按脚本文件批量合成，可中断、可续跑
+
+    每完成一条就追加到 out_dir 下的检查点文件；重新运行时，id 和参数都没变
+    且文件还在的条目直接跳过，失败的条目会重试。
+
+    Args:
+        script: NDJSON 或 CSV 脚本路径
+        out_dir: 输出目录，音频命名为 <id>.<format>
+        concurrency: 并发请求数 (总速率仍受共享限流器约束)
+        defaults: 条目未指定时使用的参数，如 {"voice_id": "audiobook_male_1"}
+        progress: 在 stderr 显示进度、吞吐量和 ETA
+
+    Returns:
+        dict: total, succeeded, failed, skipped, elapsed, results_path
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    out = Path(os.path.expanduser(out_dir))
+    out.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = out / CHECKPOINT_NAME
+    done = load_checkpoint(checkpoint_path)
+    _end_last_line(checkpoint_path)
+    expected = count_script_items(script)
+    defaults = {k: v for k, v in (defaults or {}).items() if k in BATCH_FIELDS}
+
+    results = {}
+    seen = set()
+    names = {}  # 输出文件名 (不分大小写) → 占用它的 id
+    stats = {"succeeded": 0, "failed": 0, "skipped": 0, "chars": 0}
+    start = last_report = time.time()
+
+    def report(final=False):
+        nonlocal last_report
+        now = time.time()
+        if not progress or (not final and now - last_report < PROGRESS_INTERVAL):
+            return
+        last_report = now
+        finished = stats["succeeded"] + stats["failed"]
+        elapsed = max(now - start, 1e-6)
+        rate = finished / elapsed
+        remaining = max(expected - finished - stats["skipped"], 0)
+        eta = _format_seconds(remaining / rate) if rate and remaining else "-"
+        line = (f"[{finished + stats['skipped']}/{expected}] {rate:.2f} 条/秒, "
+                f"{stats['chars'] / elapsed:.0f} 字/秒, ETA {eta}, 失败 {stats['failed']}, 跳过 {stats['skipped']}")
+        end = "\n" if final or not sys.stderr.isatty() else ""
+        print(f"\r{line}", end=end, file=sys.stderr, flush=True)
+
+    def collect(futures, checkpoint):
+        for future in futures:
+            record = future.result()
+            results[record["index"]] = record
+            if "error" in record:
+                stats["failed"] += 1
+            else:
+                stats["succeeded"] += 1
+                stats["chars"] += record["chars"]
+                checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+        report()
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            pending = set()
+            for index, item, error in iter_script(script):
+                item_id = str(item.get("id", f"line-{index:06d}")) if item else f"line-{index:06d}"
+                if not error and not item.get("text"):
+                    error = "缺少 text"
+                if not error and not isinstance(item["text"], str):
+                    error = f"text 必须是字符串，得到 {type(item['text']).__name__}"
+                if not error and item_id in seen:
+                    error = f"重复的 id: {item_id}"
+                name = _safe_name(item_id).lower()
+                if not error and names.get(name, item_id) != item_id:
+                    error = f"输出文件名与 id {names[name]} 冲突: {item_id}"
+                if error:
+                    results[index] = {"index": index, "id": item_id, "error": error}
+                    stats["failed"] += 1
+                    continue
+                seen.add(item_id)
+                names[name] = item_id
+
+                params = {**defaults, **{k: v for k, v in item.items() if k in BATCH_FIELDS}}
+                key = request_key("batch", {"id": item_id, **params})
+                previous = done.get(item_id)
+                if previous and previous.get("key") == key and Path(previous["file"]).exists():
+                    results[index] = {**previous, "index": index, "skipped": True}
+                    stats["skipped"] += 1
+                    continue
+
+                pending.add(executor.submit(_synthesize_item, index, item_id, key, params, out))
+                # 只让有限的条目在途，输入文件边读边提交
+                if len(pending) >= concurrency * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished, checkpoint)
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished, checkpoint)
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if progress:
+            print(f"\n已中断，进度已保存到 {checkpoint_path}，重新运行同一命令即可续跑", file=sys.stderr)
+        raise
+    executor.shutdown()
+    report(final=True)
+
+    elapsed = time.time() - start
+    summary = {
+        "script": str(script),
+        "out_dir": str(out),
+        "total": len(results),
+        "succeeded": stats["succeeded"],
+        "failed": stats["failed"],
+        "skipped": stats["skipped"],
+        "elapsed": round(elapsed, 2),
+        "items": [results[i] for i in sorted(results)],
+    }
+    results_path = out / RESULTS_NAME
+    write_atomic(str(results_path), json.dumps(summary, ensure_ascii=False, indent=2).encode("utf-8"))
+    summary = {k: v for k, v in summary.items() if k != "items"}
+    summary["results_path"] = str(results_path)
+    return summary
+
+
 # ============================================================
 # 主函数（用于测试）
 # ============================================================
 
-if __name__ == "__main__":
-    import sys
+def _parse_options(args: List[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """解析 --flag value 形式的参数，缺值时退出"""
+    for flag in options:
+        if flag in args:
+            i = args.index(flag)
+            if i + 1 >= len(args):
+                print(f"✗ {flag} 需要一个值")
+                sys.exit(1)
+            options[flag] = args[i + 1]
+    return options
+
 
+if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("MiniMax TTS 模块")
         print("\n可用函数:")
@@ -523,10 +1261,71 @@ if __name__ == "__main__":
         print("  - list_voices(voice_type)")
         print("  - voice_clone(voice_id, audio_file, ...)")
         print("  - voice_design(prompt, preview_text, ...)")
+        print("  - voice_design_variants(prompts, preview_text)")
         print("  - play_audio(file_path)")
         print("  - quick_tts(text, voice)")
         print("  - speak(text, voice)")
+        print("  - cleanup_outputs(max_age_days, max_bytes)")
+        print("  - quota_status()")
+        print("  - batch_synthesize(script, out_dir, concurrency)")
         print("\n测试: python minimax_tts.py test")
+        print("额度: python minimax_tts.py quota")
+        print("批量: python minimax_tts.py batch script.ndjson --out DIR [--concurrency 4] [--voice ID] [--model M] [--format mp3]")
+        print("清理: python minimax_tts.py cleanup [--days N] [--max-size 2G] [--dir DIR]")
+        sys.exit(0)
+
+    if sys.argv[1] == "quota":
+        usage = quota_status()
+        print(f"限流状态: {usage['state_path']}")
+        print(f"  请求: 上限 {usage['rps_limit']:g}/秒，当前 {usage['rps_effective']:g}/秒，"
+              f"最近一分钟 {usage['requests_last_minute']} 次，排队 {usage['queued']}")
+        print(f"  字符: 上限 {usage['cpm_limit']:g}/分钟，当前 {usage['cpm_effective']}/分钟，"
+              f"最近一分钟 {usage['chars_last_minute']} 字")
+        print(f"  服务端限流次数: {usage['throttles']}")
+        sys.exit(0)
+
+    if sys.argv[1] == "batch":
+        args = sys.argv[2:]
+        options = _parse_options(args, {"--out": None, "--concurrency": "4", "--voice": None,
+                                        "--model": None, "--format": None})
+        if not args or args[0].startswith("--") or not options["--out"]:
+            print("用法: python minimax_tts.py batch script.ndjson --out DIR [--concurrency 4]")
+            sys.exit(1)
+        defaults = {"voice_id": options["--voice"], "model": options["--model"], "format": options["--format"]}
+        try:
+            summary = batch_synthesize(args[0], options["--out"], int(options["--concurrency"]),
+                                       {k: v for k, v in defaults.items() if v})
+        except FileNotFoundError as e:
+            print(f"✗ 文件不存在: {e.filename}")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            sys.exit(130)
+        print(f"✓ 完成 {summary['succeeded']} 条，跳过 {summary['skipped']} 条，失败 {summary['failed']} 条，"
+              f"用时 {_format_seconds(summary['elapsed'])}")
+        print(f"  结果清单: {summary['results_path']}")
+        sys.exit(1 if summary["failed"] else 0)
+
+    if sys.argv[1] == "cleanup":
+        options = _parse_options(sys.argv[2:], {"--days": None, "--max-size": None, "--dir": None})
+        units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+        try:
+            max_bytes = None
+            if options["--max-size"]:
+                size = options["--max-size"].upper().rstrip("B")
+                max_bytes = int(float(size[:-1]) * units[size[-1]]) if size[-1] in units else int(size)
+            days = float(options["--days"]) if options["--days"] else None
+        except (ValueError, IndexError):
+            print("✗ 参数格式错误: --days 为天数，--max-size 形如 500M、2G")
+            sys.exit(1)
+        if days is None and max_bytes is None:
+            print("✗ 请至少指定 --days 或 --max-size")
+            sys.exit(1)
+        result = cleanup_outputs(days, max_bytes, options["--dir"])
+        print(f"✓ 删除 {result['removed']} 个文件，释放 {result['freed'] / 1024 / 1024:.1f} MB")
+        print(f"  保留 {result['kept']} 个文件，共 {result['total_size'] / 1024 / 1024:.1f} MB")
         sys.exit(0)
 
     if sys.argv[1] == "test":
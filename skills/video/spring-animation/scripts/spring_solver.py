@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Spring solver - Remotion spring() physics, evaluated offline with NumPy
+
+Reproduces Remotion's spring() and measureSpring() outside a render, for
+many configs at once: positions are computed in closed form as one
+(config x frame) array, so settling frames and easing curves for hundreds
+of elements cost a single batched computation instead of trial renders.
+
+Usage:
+    spring_solver.py measure [--preset all|NAME,...] [--config FILE] [--fps 30[,60]]
+                             [--threshold 0.005] [--json]
+    spring_solver.py table   [--preset all|NAME,...] [--config FILE] [--fps 30]
+                             [--threshold 0.005] [--frames N] [--out FILE]
+
+Examples:
+    spring_solver.py measure                          # every preset at 30fps
+    spring_solver.py measure --preset bouncy,pop --fps 24,30,60
+    spring_solver.py table --preset smooth,snappy --out easing.json
+    spring_solver.py measure --config elements.json --json
+
+Presets are read from rules/spring-presets.md: SPRING entries by name
+(bouncy) and the style/role sets as SET.name (TECH.primary, ROLES.hero).
+--config takes a JSON object of {name: {damping, stiffness, mass,
+overshootClamping}} or a list of such configs.
+
+Library usage:
+    from spring_solver import settle_frames, spring_curves, load_presets
+
+    presets = load_presets()
+    frames = settle_frames([presets["bouncy"], {"damping": 12}], fps=30)
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("Please install numpy: pip install numpy")
+
+
+PRESETS_DOC = Path(__file__).resolve().parent.parent / "rules" / "spring-presets.md"
+
+# Remotion's defaultSpringConfig
+DEFAULT_CONFIG = {"damping": 10.0, "mass": 1.0, "stiffness": 100.0, "overshootClamping": False}
+DEFAULT_THRESHOLD = 0.005
+
+# measureSpring() requires the spring to stay within the threshold this long
+SETTLE_WINDOW = 20
+# Remotion caps each simulation step at 64ms
+MAX_STEP_MS = 64
+
+PRESET_BLOCK_RE = re.compile(r"const (\w+) = \{(.*?)\n\}", re.DOTALL)
+PRESET_ENTRY_RE = re.compile(r"^\s*(\w+):\s*\{([^}]*)\}", re.MULTILINE)
+PRESET_FIELD_RE = re.compile(r"(\w+):\s*([\d.]+|true|false)")
+
+
+def load_presets(path=PRESETS_DOC):
+    """Parse the preset tables of spring-presets.md into {name: config}."""
+    text = Path(path).read_text(encoding="utf-8")
+    presets = {}
+    for group, body in PRESET_BLOCK_RE.findall(text):
+        for name, fields in PRESET_ENTRY_RE.findall(body):
+            config = {}
+            for key, value in PRESET_FIELD_RE.findall(fields):
+                config[key] = value == "true" if value in ("true", "false") else float(value)
+            presets[name if group == "SPRING" else f"{group}.{name}"] = config
+    return presets
+
+
+def normalize_config(config):
+    """Fill in Remotion's defaults; reject configs spring() cannot run."""
+    merged = {**DEFAULT_CONFIG, **config}
+    for key in ("damping", "mass", "stiffness"):
+        if not merged[key] > 0:
+            raise ValueError(f"{key} must be positive, got {merged[key]}")
+    return merged
+
+
+def _parameters(configs):
+    configs = [normalize_config(c) for c in configs]
+    damping = np.array([c["damping"] for c in configs], dtype=float)
+    mass = np.array([c["mass"] for c in configs], dtype=float)
+    stiffness = np.array([c["stiffness"] for c in configs], dtype=float)
+    clamp = np.array([bool(c["overshootClamping"]) for c in configs])
+    zeta = damping / (2 * np.sqrt(stiffness * mass))
+    omega0 = np.sqrt(stiffness / mass)
+    return zeta, omega0, clamp
+
+
+def frame_seconds(fps):
+    """Simulated seconds per frame (Remotion caps steps at 64ms)."""
+    return min(1000.0 / fps, MAX_STEP_MS) / 1000.0
+
+
+def spring_curves(configs, fps, frames, clamp=True):
+    """
+    Spring positions (0 -> 1) for every config at every frame.
+
+    Args:
+        configs: List of spring config dicts (Remotion field names)
+        fps: Frames per second
+        frames: Frame numbers (int, fractional or an array)
+        clamp: Apply overshootClamping where configs ask for it
+
+    Returns:
+        Array of shape (len(configs), len(frames))
+    """
+    zeta, omega0, clamped = _parameters(configs)
+    t = np.asarray(frames, dtype=float)[None, :] * frame_seconds(fps)
+    zeta, omega0 = zeta[:, None], omega0[:, None]
+
+    # Remotion's advance(): under-damped configs oscillate; everything with
+    # zeta >= 1 uses the critically damped solution
+    under = zeta < 1
+    omega1 = omega0 * np.sqrt(np.where(under, 1 - zeta ** 2, 1.0))
+    with np.errstate(over="ignore", invalid="ignore"):
+        oscillating = 1 - np.exp(-zeta * omega0 * t) * (
+            np.sin(omega1 * t) * (zeta * omega0 / omega1) + np.cos(omega1 * t)
+        )
+        critical = 1 - np.exp(-omega0 * t) * (1 + omega0 * t)
+    positions = np.where(under, oscillating, critical)
+
+    if clamp and clamped.any():
+        positions[clamped] = np.minimum(positions[clamped], 1.0)
+    return positions
+
+
+def _estimate_frames(configs, fps, threshold):
+    """Frames to evaluate so most configs settle inside the first grid."""
+    zeta, omega0, _ = _parameters(configs)
+    decay = np.where(zeta < 1, zeta * omega0, omega0 / 2)
+    seconds = math.log(1 / threshold) / decay.min()
+    return int(seconds / frame_seconds(fps) * 1.25) + 2 * SETTLE_WINDOW
+
+
+def _settle_frame(over, start):
+    """
+    measureSpring()'s answer from one row of |x - 1| >= threshold flags,
+    or None if the row ends before the spring is known to be settled.
+    """
+    under = np.flatnonzero(~over[start:])
+    if not len(under):
+        return None
+    finished = prev = start + int(under[0])
+    window = SETTLE_WINDOW
+    for frame in np.flatnonzero(over[prev + 1:]) + prev + 1:
+        if frame - prev > window:
+            break
+        finished, prev, window = int(frame) + 1, int(frame), SETTLE_WINDOW - 1
+    if prev + window >= len(over):
+        return None
+    return finished
+
+
+def settle_frames(configs, fps=30, threshold=DEFAULT_THRESHOLD):
+    """
+    Exact measureSpring() result for each config.
+
+    Returns:
+        Integer array, one settle frame per config
+    """
+    if threshold <= 0:
+        raise ValueError("threshold must be positive")
+    configs = list(configs)
+    result = np.zeros(len(configs), dtype=int)
+    pending = np.arange(len(configs))
+    length = _estimate_frames(configs, fps, threshold)
+
+    # Evaluate the whole batch at once; the rare config still moving at the
+    # end of the grid is retried on a longer one
+    while len(pending):
+        subset = [configs[i] for i in pending]
+        positions = spring_curves(subset, fps, np.arange(length), clamp=False)
+        over = np.abs(positions - 1) >= threshold
+        unresolved = []
+        for row, index in enumerate(pending):
+            frame = _settle_frame(over[row], 0)
+            if frame is None:
+                unresolved.append(index)
+            else:
+                result[index] = frame
+        pending = np.array(unresolved, dtype=int)
+        length *= 2
+    return result
+
+
+def easing_tables(named_configs, fps=30, threshold=DEFAULT_THRESHOLD, frames=None):
+    """
+    Per-config lookup tables for the video blueprints.
+
+    Args:
+        named_configs: {name: config}
+        frames: Stretch every curve to this many frames, like spring()'s
+            durationInFrames; default is each config's natural settle frame
+
+    Returns:
+        JSON-ready dict with the settle frame, overshoot and per-frame
+        values (rounded to 5 decimals) of each config
+    """
+    names = list(named_configs)
+    configs = [named_configs[n] for n in names]
+    natural = settle_frames(configs, fps, threshold)
+    tables = {}
+    for name, config, settle in zip(names, configs, natural):
+        length = frames or int(settle)
+        # durationInFrames rescales time so the natural settle lands on length;
+        # a spring that settles on frame 0 is a single-frame table
+        scale = settle / length if length else 0.0
+        positions = spring_curves([config], fps, np.arange(length + 1) * scale)[0]
+        peak = int(np.argmax(positions))
+        tables[name] = {
+            "config": normalize_config(config),
+            "settle_frame": int(settle),
+            "settle_seconds": round(settle / fps, 3),
+            "frames": length,
+            "peak": round(float(positions[peak]), 5),
+            "peak_frame": peak,
+            "values": [round(float(v), 5) for v in positions],
+        }
+    return {"fps": fps, "threshold": threshold, "springs": tables}
+
+
+def resolve_configs(preset, config_file):
+    """Named configs from --preset and --config."""
+    named = {}
+    if preset:
+        presets = load_presets()
+        names = list(presets) if preset == "all" else [p.strip() for p in preset.split(",") if p.strip()]
+        for name in names:
+            if name not in presets:
+                raise ValueError(f"Unknown preset '{name}'. Available: {', '.join(presets)}")
+            named[name] = presets[name]
+    if config_file:
+        data = json.loads(Path(config_file).read_text(encoding="utf-8"))
+        if isinstance(data, list):
+            data = {str(i): c for i, c in enumerate(data)}
+        named.update(data)
+    if not named:
+        named = {n: c for n, c in load_presets().items() if "." not in n}
+    return named
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Remotion spring solver")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in (("measure", "Exact settle frames (measureSpring)"),
+                               ("table", "Easing lookup tables as JSON")):
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument("--preset", help="Comma-separated preset names, or 'all' (default: SPRING presets)")
+        sub.add_argument("--config", help="JSON file of extra configs")
+        sub.add_argument("--fps", default="30", help="Frames per second (comma-separated for measure)")
+        sub.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Rest threshold")
+        if command == "measure":
+            sub.add_argument("--json", action="store_true", help="Output as JSON")
+        else:
+            sub.add_argument("--frames", type=int, help="Stretch curves to N frames (durationInFrames)")
+            sub.add_argument("--out", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    try:
+        named = resolve_configs(args.preset, args.config)
+        fps_values = [float(f) for f in args.fps.split(",")]
+        fps_values = [int(f) if f.is_integer() else f for f in fps_values]
+
+        if args.command == "table":
+            content = json.dumps(easing_tables(named, fps_values[0], args.threshold, args.frames),
+                                 separators=(",", ":"))
+            if args.out:
+                Path(args.out).write_text(content + "\n", encoding="utf-8")
+                print(f"✅ Wrote {len(named)} easing tables to: {args.out}")
+            else:
+                print(content)
+            return
+
+        configs = list(named.values())
+        results = {fps: settle_frames(configs, fps, args.threshold) for fps in fps_values}
+    except (ValueError, OSError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps({
+            "threshold": args.threshold,
+            "springs": {
+                name: {str(fps): int(results[fps][i]) for fps in fps_values}
+                for i, name in enumerate(named)
+            },
+        }, indent=2))
+        return
+
+    width = max(len(name) for name in named)
+    header = "".join(f"{f'{fps}fps':>14}" for fps in fps_values)
+    print(f"{'Spring':<{width}}{header}")
+    for i, name in enumerate(named):
+        cells = "".join(f"{int(results[fps][i]):>6} ({results[fps][i] / fps:5.2f}s)" for fps in fps_values)
+        print(f"{name:<{width}}{cells}")
+
+
+if __name__ == "__main__":
+    main()
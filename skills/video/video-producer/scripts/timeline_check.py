@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Timeline checker - finds scene timing bugs in a video plan before rendering
+
+Takes a scene spec (scene durations, spring entrances, GSAP tweens and
+narration clip lengths), resolves every element to a frame interval and
+reports, per scene:
+
+    overrun      an element or narration clip ends after the scene (error)
+    voice clash  two narration clips overlap (error)
+    conflict     two tweens on the same target overlap (warning)
+    dead air     nothing moves or speaks for longer than --max-gap (warning)
+    no hold      the last entrance settles within --min-hold of the end (warning)
+
+Results are cached per scene by content hash (including the settle frames
+of the spring presets it uses), so after an edit only the changed scenes
+are evaluated again.
+
+Usage:
+    timeline_check.py <spec.json|spec.yaml> [--max-gap 1.0] [--min-hold 10]
+                      [--cache FILE] [--no-cache] [--json]
+
+Spec:
+    {
+      "fps": 30,
+      "transition": 15,
+      "scenes": [
+        {
+          "id": "intro",
+          "duration": 3,
+          "narration": [{"id": "vo-1", "start": 0.3, "length": 2.2}],
+          "elements": [
+            {"id": "title", "spring": "pop"},
+            {"id": "words", "spring": "gentle", "delay": 12, "stagger": 4, "count": 5},
+            {"id": "logo", "target": "#logo", "tween": {"duration": 1.2, "position": "+=0.2"}},
+            {"id": "fade", "start": 75, "end": 90, "exit": true}
+          ]
+        }
+      ]
+    }
+
+Scene durations and tween/narration times are in seconds ("frames" may be
+given instead of "duration"); spring delays, staggers and explicit
+start/end are in frames, as in Remotion. Springs take a preset name from
+the spring-animation skill or a config object; their length is the exact
+measureSpring() settle frame. Tween positions follow GSAP's position
+parameter ("+=0.5", "<", ">-0.2", "<0.3", labels set with "label").
+"""
+
+import hashlib
+import json
+import math
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+SPRING_SOLVER_DIR = Path(__file__).resolve().parents[2] / "spring-animation" / "scripts"
+
+CACHE_VERSION = 1
+DEFAULT_FPS = 30
+DEFAULT_MAX_GAP = 1.0  # seconds
+DEFAULT_MIN_HOLD = 10  # frames, as in rules/scene-evaluator.md
+
+POSITION_RE = re.compile(r"^([<>]|[A-Za-z_][\w-]*)?\s*([+-]=?)?\s*([\d.]+)?$")
+
+
+class SpecError(Exception):
+    """Raised for malformed scene specs."""
+
+
+# ============================================================
+# Spec loading
+# ============================================================
+
+def load_spec(path):
+    """Load a scene spec from JSON, or YAML when PyYAML is available."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SpecError("YAML specs need PyYAML: pip install pyyaml (or use JSON)")
+        spec = yaml.safe_load(text)
+    else:
+        try:
+            spec = json.loads(text)
+        except ValueError as e:
+            raise SpecError(f"Invalid JSON in {path}: {e}")
+    if not isinstance(spec, dict) or not isinstance(spec.get("scenes"), list):
+        raise SpecError("Spec must be an object with a 'scenes' list")
+    return spec
+
+
+@lru_cache(maxsize=None)
+def _spring_solver():
+    if str(SPRING_SOLVER_DIR) not in sys.path:
+        sys.path.insert(0, str(SPRING_SOLVER_DIR))
+    try:
+        import spring_solver
+    except ImportError as e:
+        raise SpecError(f"Spring elements need spring-animation/scripts/spring_solver.py and numpy ({e}); "
+                        f"or give springs an explicit durationInFrames")
+    return spring_solver
+
+
+@lru_cache(maxsize=None)
+def spring_frames(config_key, fps):
+    """Settle frame of a spring (preset name or frozen config), memoized."""
+    solver = _spring_solver()
+    if isinstance(config_key, str):
+        presets = solver.load_presets()
+        if config_key not in presets:
+            raise SpecError(f"Unknown spring preset '{config_key}'")
+        config = presets[config_key]
+    else:
+        config = dict(config_key)
+    return int(solver.settle_frames([config], fps)[0])
+
+
+# ============================================================
+# Element resolution
+# ============================================================
+
+def _resolve_position(position, cursor, previous, labels):
+    """GSAP position parameter -> start time in seconds."""
+    if position is None:
+        return cursor
+    if isinstance(position, (int, float)):
+        return float(position)
+    match = POSITION_RE.match(str(position).strip())
+    if not match:
+        raise SpecError(f"Unsupported position parameter: {position!r}")
+    anchor, operator, amount = match.groups()
+    amount = float(amount) if amount else 0.0
+    if anchor == "<":
+        base = previous[0]
+    elif anchor == ">":
+        base = previous[1]
+    elif anchor:
+        if anchor not in labels:
+            raise SpecError(f"Unknown label: {anchor}")
+        base = labels[anchor]
+    else:
+        if operator is None:
+            return amount
+        base = cursor
+    if operator in ("-=", "-"):
+        return base - amount
+    return base + amount
+
+
+def resolve_elements(scene, fps):
+    """
+    Resolve a scene's elements and narration to frame intervals.
+
+    Returns:
+        List of dicts with id, kind, start, end (frames), target and exit
+    """
+    intervals = []
+    cursor = 0.0  # end of the GSAP timeline so far, seconds
+    previous = (0.0, 0.0)
+    labels = {}
+
+    for i, element in enumerate(scene.get("elements", [])):
+        name = element.get("id", f"element-{i + 1}")
+        count = int(element.get("count", 1))
+        stagger = element.get("stagger", 0)
+
+        if "tween" in element:
+            tween = element["tween"]
+            start = _resolve_position(tween.get("position"), cursor, previous, labels)
+            length = tween.get("duration", 0.5) + tween.get("stagger", 0) * (tween.get("count", count) - 1)
+            end = start + length * (1 + tween.get("repeat", 0))
+            previous = (start, end)
+            cursor = max(cursor, end)
+            if element.get("label"):
+                labels[element["label"]] = start
+            interval = (start * fps, end * fps, "tween")
+        elif "spring" in element:
+            spring = element["spring"]
+            key = spring if isinstance(spring, str) else tuple(sorted(spring.items()))
+            settle = element.get("durationInFrames") or spring_frames(key, fps)
+            start = element.get("delay", 0)
+            interval = (start, start + stagger * (count - 1) + settle, "spring")
+        elif "start" in element and "end" in element:
+            interval = (element["start"], element["end"], "interpolate")
+        else:
+            raise SpecError(f"Element '{name}' needs a spring, a tween, or start/end frames")
+
+        intervals.append({
+            "id": name,
+            "kind": interval[2],
+            "start": round(interval[0], 2),
+            "end": round(interval[1], 2),
+            "target": element.get("target"),
+            "exit": bool(element.get("exit")),
+        })
+
+    for i, clip in enumerate(scene.get("narration", [])):
+        start = clip.get("start", 0) * fps
+        intervals.append({
+            "id": clip.get("id", f"narration-{i + 1}"),
+            "kind": "narration",
+            "start": round(start, 2),
+            "end": round(start + clip["length"] * fps, 2),
+            "target": None,
+            "exit": False,
+        })
+    return intervals
+
+
+def scene_frames(scene, fps):
+    if "frames" in scene:
+        return int(scene["frames"])
+    if "duration" not in scene:
+        raise SpecError(f"Scene '{scene.get('id')}' needs a duration (seconds) or frames")
+    return math.ceil(scene["duration"] * fps)
+
+
+# ============================================================
+# Evaluation
+# ============================================================
+
+def sweep(intervals, total):
+    """
+    One pass over sorted interval endpoints.
+
+    Returns:
+        (gaps, overlaps): uncovered (start, end) ranges within [0, total],
+        and pairs of intervals that overlap, found while they are active
+    """
+    events = []
+    for index, interval in enumerate(intervals):
+        if interval["end"] > interval["start"]:
+            events.append((interval["start"], 1, index))
+            events.append((interval["end"], 0, index))
+    # Ends sort before starts at the same frame: touching is not overlapping
+    events.sort()
+
+    gaps, overlaps = [], []
+    active = set()
+    covered_until = 0.0
+    for frame, is_start, index in events:
+        if is_start:
+            if not active and frame > covered_until:
+                gaps.append((covered_until, min(frame, total)))
+            overlaps.extend((other, index) for other in active)
+            active.add(index)
+        else:
+            active.discard(index)
+            if not active:
+                covered_until = max(covered_until, frame)
+    if covered_until < total and not active:
+        gaps.append((covered_until, total))
+    return [g for g in gaps if g[1] > g[0]], overlaps
+
+
+def evaluate_scene(scene, fps, max_gap=DEFAULT_MAX_GAP, min_hold=DEFAULT_MIN_HOLD):
+    """Check one scene; returns {"id", "frames", "intervals", "issues"}."""
+    total = scene_frames(scene, fps)
+    intervals = resolve_elements(scene, fps)
+    issues = []
+
+    def issue(severity, kind, message, **details):
+        issues.append({"severity": severity, "kind": kind, "message": message, **details})
+
+    for interval in intervals:
+        if interval["end"] > total:
+            issue("error", "overrun",
+                  f"{interval['id']} ends at frame {interval['end']:g}, scene ends at {total}",
+                  element=interval["id"], over=round(interval["end"] - total, 2))
+        if interval["start"] < 0:
+            issue("error", "overrun", f"{interval['id']} starts before the scene (frame {interval['start']:g})",
+                  element=interval["id"])
+
+    gaps, overlaps = sweep(intervals, total)
+    for first, second in overlaps:
+        a, b = intervals[first], intervals[second]
+        if a["kind"] == b["kind"] == "narration":
+            issue("error", "voice clash", f"Narration {a['id']} and {b['id']} overlap",
+                  elements=[a["id"], b["id"]])
+        elif a["target"] and a["target"] == b["target"] and not (a["exit"] or b["exit"]):
+            issue("warning", "conflict", f"{a['id']} and {b['id']} animate {a['target']} at the same time",
+                  elements=[a["id"], b["id"]])
+
+    for start, end in gaps:
+        if end - start > max_gap * fps:
+            issue("warning", "dead air",
+                  f"Nothing moves or speaks in frames {start:g}-{end:g} ({(end - start) / fps:.2f}s)",
+                  start=start, end=end)
+
+    entrances = [i["end"] for i in intervals if not i["exit"] and i["kind"] != "narration"]
+    # Overruns are reported above; this catches entrances that end in time but leave no hold
+    if entrances and 0 <= total - max(entrances) < min_hold:
+        issue("warning", "no hold",
+              f"Last entrance settles at frame {max(entrances):g}, {total - max(entrances):g} frames before the end",
+              hold=round(total - max(entrances), 2))
+
+    return {"id": scene.get("id"), "frames": total, "intervals": intervals, "issues": issues}
+
+
+def _preset_frames(scene, fps):
+    """Settle frames of the spring presets a scene uses, by preset name."""
+    frames = {}
+    for element in scene.get("elements", []):
+        if (isinstance(element, dict) and "tween" not in element and not element.get("durationInFrames")
+                and isinstance(element.get("spring"), str)):
+            frames[element["spring"]] = spring_frames(element["spring"], fps)
+    return frames
+
+
+def scene_key(scene, fps, max_gap, min_hold):
+    # Presets live in spring-presets.md, outside the spec: key on what they
+    # resolve to so editing a preset invalidates the scenes that use it
+    presets = _preset_frames(scene, fps)
+    payload = json.dumps([CACHE_VERSION, scene, presets, fps, max_gap, min_hold],
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cache(path):
+    try:
+        cache = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def check_timeline(spec, max_gap=DEFAULT_MAX_GAP, min_hold=DEFAULT_MIN_HOLD, cache=None):
+    """
+    Evaluate every scene of a spec, reusing cached results of unchanged scenes.
+
+    Args:
+        cache: Dict of previous results by scene key; updated in place
+
+    Returns:
+        Report dict with per-scene results and totals
+    """
+    fps = spec.get("fps", DEFAULT_FPS)
+    transition = spec.get("transition", 0)
+    cache = {} if cache is None else cache
+    fresh = {}
+    scenes = []
+    evaluated = 0
+    offset = 0
+    for index, scene in enumerate(spec["scenes"]):
+        scene = {"id": f"scene-{index + 1}", **scene}
+        key = scene_key(scene, fps, max_gap, min_hold)
+        result = cache.get(key)
+        if result is None:
+            result = evaluate_scene(scene, fps, max_gap, min_hold)
+            evaluated += 1
+        fresh[key] = result
+        scenes.append({**result, "offset": offset})
+        offset += result["frames"] - transition
+
+    cache.clear()
+    cache.update(fresh)
+    total = offset + transition if scenes else 0
+    return {
+        "fps": fps,
+        "frames": total,
+        "seconds": round(total / fps, 2),
+        "scenes": scenes,
+        "errors": sum(1 for s in scenes for i in s["issues"] if i["severity"] == "error"),
+        "warnings": sum(1 for s in scenes for i in s["issues"] if i["severity"] == "warning"),
+        "evaluated": evaluated,
+    }
+
+
+def print_usage():
+    print("Usage: timeline_check.py <spec.json|spec.yaml> [--max-gap SECONDS] [--min-hold FRAMES]")
+    print("                         [--cache FILE] [--no-cache] [--json]")
+
+
+def main(argv):
+    as_json = '--json' in argv
+    use_cache = '--no-cache' not in argv
+    argv = [arg for arg in argv if arg not in ('--json', '--no-cache')]
+
+    options = {'--max-gap': None, '--min-hold': None, '--cache': None}
+    for flag in options:
+        if flag in argv:
+            i = argv.index(flag)
+            if i + 1 >= len(argv):
+                print_usage()
+                return 1
+            options[flag] = argv[i + 1]
+            del argv[i:i + 2]
+    if len(argv) != 1 or argv[0].startswith('--'):
+        print_usage()
+        return 1
+
+    spec_path = Path(argv[0])
+    cache_path = Path(options['--cache'] or spec_path.with_name(f".{spec_path.stem}.timeline-cache.json"))
+    try:
+        max_gap = float(options['--max-gap'] or DEFAULT_MAX_GAP)
+        min_hold = float(options['--min-hold'] or DEFAULT_MIN_HOLD)
+        spec = load_spec(spec_path)
+        cache = load_cache(cache_path) if use_cache else {}
+        report = check_timeline(spec, max_gap, min_hold, cache)
+    except FileNotFoundError:
+        print(f"❌ Error: File not found: {spec_path}")
+        return 1
+    except (SpecError, ValueError, KeyError, TypeError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    if use_cache:
+        cache_path.write_text(json.dumps(cache, separators=(",", ":")), encoding="utf-8")
+
+    if as_json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 1 if report["errors"] else 0
+
+    fps = report["fps"]
+    for scene in report["scenes"]:
+        icon = "❌" if any(i["severity"] == "error" for i in scene["issues"]) else "⚠️ " if scene["issues"] else "✅"
+        print(f"{icon} {scene['id']}  ({scene['frames']} frames, {scene['frames'] / fps:.2f}s, "
+              f"starts at frame {scene['offset']})")
+        for item in scene["issues"]:
+            mark = "❌" if item["severity"] == "error" else "⚠️ "
+            print(f"   {mark} {item['kind']}: {item['message']}")
+    print(f"\n{len(report['scenes'])} scenes, {report['frames']} frames ({report['seconds']}s) at {fps}fps: "
+          f"{report['errors']} error(s), {report['warnings']} warning(s); "
+          f"evaluated {report['evaluated']}, {len(report['scenes']) - report['evaluated']} cached")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))